@@ -0,0 +1,79 @@
+import time
+import threading
+from typing import Dict, Any
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+
+class PoolStats:
+    """Checkout counters and wait times for one connection pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        self.wait_time_last = 0.0
+
+    def record_wait(self, seconds: float):
+        """Record time spent waiting for a connection."""
+        with self._lock:
+            self.checkouts += 1
+            self.wait_time_total += seconds
+            self.wait_time_last = seconds
+            self.wait_time_max = max(self.wait_time_max, seconds)
+
+    def record_timeout(self):
+        """Record a checkout that gave up after pool_timeout."""
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self, pool: QueuePool) -> Dict[str, Any]:
+        """Get pool occupancy together with the collected counters."""
+        with self._lock:
+            avg_wait = self.wait_time_total / self.checkouts if self.checkouts else 0.0
+            return {
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "idle": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+                "max_overflow": pool._max_overflow,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_time_avg_ms": round(avg_wait * 1000, 3),
+                "wait_time_max_ms": round(self.wait_time_max * 1000, 3),
+                "wait_time_last_ms": round(self.wait_time_last * 1000, 3)
+            }
+
+class TimedPoolMixin:
+    """Measure how long every checkout waits for a free connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.record_timeout()
+            raise
+        self.stats.record_wait(time.perf_counter() - start)
+        return connection
+
+    def recreate(self):
+        # Keep counters across engine.dispose()
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+    def metrics(self) -> Dict[str, Any]:
+        """Get pool metrics."""
+        return self.stats.snapshot(self)
+
+class TimedQueuePool(TimedPoolMixin, QueuePool):
+    pass
+
+class TimedAsyncAdaptedQueuePool(TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
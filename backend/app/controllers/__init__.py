@@ -1,11 +1,23 @@
-from .telegram_controller import TelegramController, start_bot, stop_bot
+from .telegram_controller import (
+    TelegramController, start_bot, stop_bot, start_http_client, stop_http_client, get_vps_circuit_metrics,
+    drain_webhook_updates
+)
 from .scheduler_controller import SchedulerController, start_scheduler, stop_scheduler
+from .outbox_controller import OutboxController, start_outbox_dispatcher, stop_outbox_dispatcher, get_outbox_metrics
 
 __all__ = [
     "TelegramController",
     "SchedulerController",
+    "OutboxController",
     "start_bot",
     "stop_bot",
+    "start_http_client",
+    "stop_http_client",
     "start_scheduler",
-    "stop_scheduler"
+    "stop_scheduler",
+    "start_outbox_dispatcher",
+    "stop_outbox_dispatcher",
+    "get_outbox_metrics",
+    "get_vps_circuit_metrics",
+    "drain_webhook_updates"
 ] 
\ No newline at end of file
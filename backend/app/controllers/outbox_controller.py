@@ -0,0 +1,227 @@
+import os
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from dotenv import load_dotenv
+
+from .telegram_controller import TelegramController, bot
+from ..config.database import AsyncSessionLocal
+from ..repositories import AsyncOutboxRepository
+from ..repositories.outbox_repository import OUTBOX_LEASE_SECONDS
+
+# Load environment variables
+load_dotenv()
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+BASE_URL = os.getenv("BASE_URL", "https://unl-events.duckdns.org")
+
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "20"))
+OUTBOX_POLL_SECONDS = float(os.getenv("OUTBOX_POLL_SECONDS", "2"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "5"))
+OUTBOX_BACKOFF_SECONDS = float(os.getenv("OUTBOX_BACKOFF_SECONDS", "30"))
+OUTBOX_MAX_BACKOFF_SECONDS = float(os.getenv("OUTBOX_MAX_BACKOFF_SECONDS", "3600"))
+
+# Leases of messages being delivered are renewed this often, well within the lease
+OUTBOX_RENEW_SECONDS = float(os.getenv("OUTBOX_RENEW_SECONDS", str(OUTBOX_LEASE_SECONDS / 3)))
+
+# Update notifications due within this time are sent together with a due one,
+# so that followers get one digest instead of a message per event
+OUTBOX_DIGEST_SECONDS = float(os.getenv("OUTBOX_DIGEST_SECONDS", "120"))
+
+# Update notifications go out as digests, see _process_updates()
+EVENT_UPDATED = "event_updated"
+
+class OutboxController:
+    """Drains the notification outbox: claims due messages in batches and delivers them."""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+        self.delivered = 0
+        self.retried = 0
+        self.dead = 0
+        self.coalesced = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.last_latency: Optional[float] = None
+        self.handlers = {
+            "event_created": self._event_created,
+            "invitation": self._invitation,
+            "reminder": self._reminder,
+        }
+
+    async def _event_created(self, payload: Dict[str, Any]) -> bool:
+        return await TelegramController.notify_event_created(payload["event_id"], BASE_URL)
+
+    async def _invitation(self, payload: Dict[str, Any]) -> bool:
+        return await TelegramController.send_event_invitation(payload["user_id"], payload["event_id"], BASE_URL)
+
+    async def _reminder(self, payload: Dict[str, Any]) -> bool:
+        return await TelegramController.send_event_reminder(payload["event_id"], BASE_URL, payload["hours_before"])
+
+    def _backoff(self, attempts: int) -> float:
+        return min(OUTBOX_BACKOFF_SECONDS * 2 ** (attempts - 1), OUTBOX_MAX_BACKOFF_SECONDS)
+
+    async def _deliver(self, delivery) -> Optional[str]:
+        """Await a handler call. Returns the error, or None if delivered."""
+        try:
+            if not await delivery:
+                return "Delivery failed"
+        except Exception as e:
+            return str(e)
+        return None
+
+    async def _renew(self, messages: List[Dict[str, Any]]):
+        """Renew the leases of messages until cancelled."""
+        claims = [(message["id"], message["attempts"]) for message in messages]
+        while True:
+            await asyncio.sleep(OUTBOX_RENEW_SECONDS)
+            try:
+                async with AsyncSessionLocal() as db:
+                    renewed = await AsyncOutboxRepository.renew_leases(db, claims)
+            except Exception as e:
+                logger.error(f"Outbox lease renewal error: {e}")
+                continue
+            if renewed < len(claims):
+                logger.warning(f"Outbox lost the lease of {len(claims) - renewed} of {len(claims)} messages")
+
+    @asynccontextmanager
+    async def _leased(self, messages: List[Dict[str, Any]]):
+        """Keep the messages leased to this dispatcher while delivering them."""
+        renewal = asyncio.create_task(self._renew(messages))
+        try:
+            yield
+        finally:
+            renewal.cancel()
+            await asyncio.gather(renewal, return_exceptions=True)
+
+    async def _process(self, message: Dict[str, Any]):
+        """Deliver one claimed message and settle it."""
+        handler = self.handlers.get(message["kind"])
+        if handler is None:
+            await self._settle(message, f"Unknown message kind {message['kind']}", final=True)
+            return
+        async with self._leased([message]):
+            error = await self._deliver(handler(message["payload"]))
+        await self._settle(message, error)
+
+    async def _process_updates(self, messages: List[Dict[str, Any]]):
+        """Deliver update notifications of several events at once and settle them."""
+        # Pending updates due soon join this round, the same follower gets them in one digest
+        async with AsyncSessionLocal() as db:
+            early = await AsyncOutboxRepository.claim_batch(
+                db, OUTBOX_BATCH_SIZE, kind=EVENT_UPDATED, ahead_seconds=OUTBOX_DIGEST_SECONDS
+            )
+        messages = messages + early
+        self.coalesced += len(messages) - 1
+        
+        event_ids = sorted({message["payload"]["event_id"] for message in messages})
+        async with self._leased(messages):
+            error = await self._deliver(TelegramController.notify_event_updates(event_ids, BASE_URL))
+        await asyncio.gather(*(self._settle(message, error) for message in messages))
+
+    async def _settle(self, message: Dict[str, Any], error: Optional[str], final: bool = False):
+        """Mark a message as sent, or schedule its retry, or dead-letter it."""
+        async with AsyncSessionLocal() as db:
+            if error is None:
+                await AsyncOutboxRepository.mark_sent(db, message["id"])
+                latency = (datetime.now(timezone.utc) - message["created_at"]).total_seconds()
+                self.delivered += 1
+                self.latency_total += latency
+                self.latency_max = max(self.latency_max, latency)
+                self.last_latency = latency
+            elif final or message["attempts"] >= OUTBOX_MAX_ATTEMPTS:
+                await AsyncOutboxRepository.mark_failed(db, message["id"], error, None)
+                self.dead += 1
+                logger.error(f"Outbox message {message['idempotency_key']} dead-lettered: {error}")
+            else:
+                retry_in = self._backoff(message["attempts"])
+                await AsyncOutboxRepository.mark_failed(db, message["id"], error, retry_in)
+                self.retried += 1
+                logger.warning(f"Outbox message {message['idempotency_key']} failed ({error}), retry in {retry_in} s")
+
+    async def dispatch_once(self) -> int:
+        """Claim and deliver one batch. Returns the number of messages claimed."""
+        async with AsyncSessionLocal() as db:
+            messages = await AsyncOutboxRepository.claim_batch(db, OUTBOX_BATCH_SIZE)
+        if messages:
+            updates = [message for message in messages if message["kind"] == EVENT_UPDATED]
+            deliveries = [self._process(message) for message in messages if message["kind"] != EVENT_UPDATED]
+            if updates:
+                deliveries.append(self._process_updates(updates))
+            # Broadcasts share the delivery engine's rate limits
+            await asyncio.gather(*deliveries)
+        return len(messages)
+
+    async def run(self):
+        """Drain the outbox until stopped."""
+        logger.info("Outbox dispatcher started")
+        while not self._stopping.is_set():
+            try:
+                claimed = await self.dispatch_once()
+            except Exception as e:
+                logger.error(f"Outbox dispatch error: {e}")
+                claimed = 0
+            # A full batch means there is more to do right away
+            if claimed < OUTBOX_BATCH_SIZE:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), OUTBOX_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+        logger.info("Outbox dispatcher stopped")
+
+    def start(self):
+        """Start the dispatcher task."""
+        if self._task is None or self._task.done():
+            self._stopping = asyncio.Event()
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        """Stop the dispatcher after the current batch."""
+        if self._task is not None:
+            self._stopping.set()
+            await self._task
+            self._task = None
+
+    def metrics(self) -> Dict[str, Any]:
+        """Get dispatcher counters and delivery latency of this process."""
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "delivered": self.delivered,
+            "retried": self.retried,
+            "dead": self.dead,
+            "coalesced": self.coalesced,
+            "latency_seconds": {
+                "last": round(self.last_latency, 3) if self.last_latency is not None else None,
+                "avg": round(self.latency_total / self.delivered, 3) if self.delivered else None,
+                "max": round(self.latency_max, 3)
+            }
+        }
+
+# Singleton instance
+outbox_instance = OutboxController()
+
+# Function to start the outbox dispatcher
+def start_outbox_dispatcher():
+    """Start the outbox dispatcher."""
+    if not bot:
+        # Messages stay pending until a process with a bot drains them
+        logger.warning("Telegram bot not initialized. Skipping outbox dispatcher start.")
+        return
+    outbox_instance.start()
+
+# Function to stop the outbox dispatcher
+async def stop_outbox_dispatcher():
+    """Stop the outbox dispatcher."""
+    await outbox_instance.stop()
+
+async def get_outbox_metrics(db) -> Dict[str, Any]:
+    """Get outbox backlog from the database and dispatcher counters."""
+    return {
+        "backlog": await AsyncOutboxRepository.get_stats(db),
+        "dispatcher": outbox_instance.metrics()
+    }
@@ -1,10 +1,12 @@
 import os
 import logging
 import asyncio
+from datetime import datetime, timedelta
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from dotenv import load_dotenv
 
-from .telegram_controller import TelegramController
+from ..config.database import AsyncSessionLocal
+from ..repositories import AsyncUserRepository, AsyncEventRepository, AsyncOutboxRepository, AsyncReminderRepository
 
 # Load environment variables
 load_dotenv()
@@ -13,8 +15,15 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Get base URL from environment variables or use default
-BASE_URL = os.getenv("BASE_URL", "https://unl-events.duckdns.org")
+# Delivered outbox messages are kept this long for inspection
+OUTBOX_RETENTION_DAYS = int(os.getenv("OUTBOX_RETENTION_DAYS", "7"))
+
+# Due reminders handed to the outbox per transaction
+REMINDER_BATCH_SIZE = int(os.getenv("REMINDER_BATCH_SIZE", "100"))
+
+# Longest sleep between reminder checks, bounds the delay for reminders
+# written by other processes while the scheduler sleeps
+REMINDER_RESYNC_SECONDS = int(os.getenv("REMINDER_RESYNC_SECONDS", "300"))
 
 class SchedulerController:
     def __init__(self):
@@ -24,22 +33,13 @@ class SchedulerController:
     
     def _configure_jobs(self):
         """Configure scheduled jobs."""
-        # Daily job at 10:00 AM to send reminders for events happening in the next 24 hours
+        # Reminders job runs right away and then reschedules itself for the next due reminder
         self.scheduler.add_job(
-            self._send_daily_reminders,
-            'cron',
-            hour=10,
-            minute=0,
-            name='daily_reminders'
-        )
-        
-        # Job to send reminders 1 hour before events
-        self.scheduler.add_job(
-            self._send_hourly_reminders,
-            'cron',
-            hour='*',
-            minute=0,
-            name='hourly_reminders'
+            self._dispatch_reminders,
+            'date',
+            id='reminders',
+            name='reminders',
+            misfire_grace_time=None
         )
         
         # Job to clean up old data (e.g., invitations for past events) weekly
@@ -51,22 +51,75 @@ class SchedulerController:
             minute=0,
             name='weekly_cleanup'
         )
+        
+        # Nightly job to repair drift of denormalized counters
+        self.scheduler.add_job(
+            self._reconcile_counters,
+            'cron',
+            hour=3,
+            minute=30,
+            name='reconcile_counters'
+        )
     
-    async def _send_daily_reminders(self):
-        """Send reminders for events happening in the next 24 hours."""
-        logger.info("Running daily reminders job")
-        await TelegramController.send_upcoming_event_reminders(BASE_URL, 24)
-    
-    async def _send_hourly_reminders(self):
-        """Send reminders for events happening in the next hour."""
-        logger.info("Running hourly reminders job")
-        await TelegramController.send_upcoming_event_reminders(BASE_URL, 1)
+    async def _dispatch_reminders(self):
+        """Hand due reminders to the outbox and sleep until the next one is due."""
+        next_due = None
+        try:
+            async with AsyncSessionLocal() as db:
+                dispatched = 0
+                while True:
+                    taken = await AsyncReminderRepository.dispatch_due(db, REMINDER_BATCH_SIZE)
+                    dispatched += taken
+                    if taken < REMINDER_BATCH_SIZE:
+                        break
+                next_due = await AsyncReminderRepository.next_due_at(db)
+            if dispatched:
+                logger.info(f"Dispatched {dispatched} reminders")
+        except Exception as e:
+            logger.error(f"Error dispatching reminders: {e}")
+        
+        now = datetime.now()
+        run_date = now + timedelta(seconds=REMINDER_RESYNC_SECONDS)
+        if next_due is not None:
+            run_date = max(min(run_date, next_due), now)
+        self.scheduler.add_job(
+            self._dispatch_reminders,
+            'date',
+            run_date=run_date,
+            id='reminders',
+            name='reminders',
+            misfire_grace_time=None,
+            replace_existing=True
+        )
     
     async def _cleanup_old_data(self):
         """Clean up old data."""
         logger.info("Running weekly cleanup job")
         # This would clean up old invitations, etc.
         # Implementation depends on specific requirements
+        try:
+            async with AsyncSessionLocal() as db:
+                purged = await AsyncOutboxRepository.purge_sent(db, OUTBOX_RETENTION_DAYS)
+            logger.info(f"Purged {purged} delivered outbox messages")
+        except Exception as e:
+            logger.error(f"Error purging outbox: {e}")
+        try:
+            async with AsyncSessionLocal() as db:
+                purged = await AsyncReminderRepository.purge_sent(db, OUTBOX_RETENTION_DAYS)
+            logger.info(f"Purged {purged} sent reminders")
+        except Exception as e:
+            logger.error(f"Error purging reminders: {e}")
+    
+    async def _reconcile_counters(self):
+        """Recompute counter columns from the source tables where they drifted."""
+        logger.info("Running counters reconciliation job")
+        try:
+            async with AsyncSessionLocal() as db:
+                fixed_users = await AsyncUserRepository.reconcile_counters(db)
+                fixed_events = await AsyncEventRepository.reconcile_counters(db)
+            logger.info(f"Counters reconciled: {fixed_users} users, {fixed_events} events fixed")
+        except Exception as e:
+            logger.error(f"Error reconciling counters: {e}")
     
     def start(self):
         """Start the scheduler."""
@@ -79,6 +132,10 @@ class SchedulerController:
         if self.scheduler.running:
             self.scheduler.shutdown()
             logger.info("Scheduler stopped")
+            # A shut down scheduler cannot be restarted, prepare a fresh one for
+            # a worker that becomes leader again
+            self.scheduler = AsyncIOScheduler()
+            self._configure_jobs()
     
     def get_jobs(self):
         """Get all scheduled jobs."""
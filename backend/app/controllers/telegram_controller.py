@@ -1,20 +1,33 @@
 import os
+import hmac
+import time
 import asyncio
 import logging
 import json
-import requests
-from datetime import datetime, timedelta
+import httpx
+import importlib.util
+from functools import partial
+from itertools import groupby
+from typing import Any, Dict, List, Optional
 from aiogram import Bot, Dispatcher, Router, F
-from aiogram.types import Message, InlineKeyboardMarkup, InlineKeyboardButton
+from aiogram.exceptions import TelegramRetryAfter, TelegramAPIError
+from aiogram.types import Message, Update
 from aiogram.filters import Command
 from aiogram.fsm.storage.memory import MemoryStorage
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
 from dotenv import load_dotenv
 
-from ..models import User, Event, EventParticipant, Invitation, Subscription
-from ..config.database import SessionLocal
-from ..repositories import EventRepository, ParticipationRepository
+from ..models import User, Event
+from ..config.database import SessionLocal, AsyncSessionLocal
+from ..repositories import (
+    EventRepository, InvitationRepository, SubscriptionRepository, UserRepository,
+    AsyncUserRepository, AsyncEventRepository, AsyncParticipationRepository
+)
 from ..services.telegram_deeplink_service import TelegramLinkService
+from ..utils.delivery import delivery_engine, DeliveryJob, RetryAfter, classify_failure
+from ..utils.circuit_breaker import CircuitBreaker
+from ..utils.messages import RenderedMessage, render_event_message, render_updates_digest
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -27,8 +40,40 @@ BASE_URL = os.getenv("BASE_URL", "https://unl-events.duckdns.org")
 VPS_API_URL = os.getenv("VPS_API_URL", "http://unl-events.duckdns.org:5000")
 VPS_API_KEY = os.getenv("VPS_API_KEY", "your-secret-api-key")
 
-# Check if we're in local development mode
-IS_LOCAL_DEV = "localhost" in BASE_URL or "127.0.0.1" in BASE_URL
+# Pooled HTTP client settings for the VPS API
+VPS_HTTP_TIMEOUT = float(os.getenv("VPS_HTTP_TIMEOUT", "10"))
+VPS_HTTP_CONNECT_TIMEOUT = float(os.getenv("VPS_HTTP_CONNECT_TIMEOUT", "3"))
+VPS_HTTP_MAX_CONNECTIONS = int(os.getenv("VPS_HTTP_MAX_CONNECTIONS", "50"))
+VPS_HTTP_MAX_KEEPALIVE = int(os.getenv("VPS_HTTP_MAX_KEEPALIVE", "20"))
+VPS_HTTP_KEEPALIVE_EXPIRY = float(os.getenv("VPS_HTTP_KEEPALIVE_EXPIRY", "30"))
+
+# Bulk paths send this many messages per /send_batch call, the forwarder
+# paces them at Telegram's rate so a batch needs a longer timeout
+VPS_BATCH_SIZE = int(os.getenv("VPS_BATCH_SIZE", "200"))
+VPS_BATCH_TIMEOUT = float(os.getenv("VPS_BATCH_TIMEOUT", "120"))
+
+# Batches in flight per process. Queued batches wait here rather than in the
+# forwarder's rate limiter, where they would run into VPS_BATCH_TIMEOUT.
+VPS_BATCH_CONCURRENCY = int(os.getenv("VPS_BATCH_CONCURRENCY", "2"))
+
+# Webhook mode: Telegram posts updates to the API at this public URL of
+# /api/telegram/webhook instead of the leader worker long-polling
+TELEGRAM_WEBHOOK_URL = os.getenv("TELEGRAM_WEBHOOK_URL")
+TELEGRAM_WEBHOOK_SECRET = os.getenv("TELEGRAM_WEBHOOK_SECRET", "")
+
+# Updates handled at the same time per API process
+TELEGRAM_WEBHOOK_CONCURRENCY = int(os.getenv("TELEGRAM_WEBHOOK_CONCURRENCY", "20"))
+
+# Statuses meaning the forwarder itself is down, others come from Telegram
+VPS_UNAVAILABLE_STATUSES = {502, 503, 504}
+
+# Raised before the forwarder got the whole request, nothing of it was sent
+VPS_NOT_SENT_ERRORS = (
+    httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout, httpx.WriteError, httpx.WriteTimeout
+)
+
+class BatchOutcomeUnknown(Exception):
+    """A /send_batch call failed after the forwarder may have sent some of its messages."""
 
 # We'll keep these for local development, but primarily use the VPS forwarding
 bot = None
@@ -48,103 +93,293 @@ if TELEGRAM_BOT_TOKEN:
 else:
     logger.warning("TELEGRAM_BOT_TOKEN not set. Telegram functionality will be disabled.")
 
+# Anyone could post fake updates to an unprotected webhook
+WEBHOOK_MODE = bool(TELEGRAM_WEBHOOK_URL and TELEGRAM_WEBHOOK_SECRET)
+if TELEGRAM_WEBHOOK_URL and not TELEGRAM_WEBHOOK_SECRET:
+    logger.error("TELEGRAM_WEBHOOK_SECRET not set. Webhook mode disabled, falling back to polling.")
+
+# Limits updates in flight, see feed_webhook_update()
+webhook_slots = asyncio.Semaphore(TELEGRAM_WEBHOOK_CONCURRENCY)
+webhook_tasks = set()
+
+# Limits /send_batch calls in flight, see _send_batch_via_vps()
+batch_slots = asyncio.Semaphore(VPS_BATCH_CONCURRENCY)
+
+# Shared keep-alive client for the VPS API, created in start_http_client()
+http_client = None
+
+def _create_http_client() -> httpx.AsyncClient:
+    # HTTP/2 needs the optional h2 package
+    http2 = importlib.util.find_spec("h2") is not None
+    logger.info(f"Creating VPS API client (HTTP/2: {http2})")
+    return httpx.AsyncClient(
+        base_url=VPS_API_URL,
+        headers={"Authorization": f"Bearer {VPS_API_KEY}"},
+        timeout=httpx.Timeout(VPS_HTTP_TIMEOUT, connect=VPS_HTTP_CONNECT_TIMEOUT),
+        limits=httpx.Limits(
+            max_connections=VPS_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=VPS_HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=VPS_HTTP_KEEPALIVE_EXPIRY
+        ),
+        http2=http2
+    )
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared VPS API client, creating it on first use."""
+    global http_client
+    if http_client is None or http_client.is_closed:
+        http_client = _create_http_client()
+    return http_client
+
+async def _probe_vps() -> bool:
+    """Check the forwarder's health endpoint."""
+    response = await get_http_client().get("/health", timeout=VPS_HTTP_CONNECT_TIMEOUT)
+    return response.status_code == 200
+
+# While open, messages go straight to the bot instead of waiting for VPS timeouts
+vps_breaker = CircuitBreaker("vps", _probe_vps)
+
+def _record_vps_response(status_code: int):
+    if status_code in VPS_UNAVAILABLE_STATUSES:
+        vps_breaker.record_failure(f"HTTP {status_code}")
+    else:
+        vps_breaker.record_success()
+
 class TelegramController:
     @staticmethod
-    async def _send_via_vps(chat_id, text, inline_keyboard=None, parse_mode=None):
+    async def _send_via_vps(chat_id, message: RenderedMessage):
         """
         Send a message through the VPS API
         """
-        # Prepare payload for VPS API
-        payload = {
-            "chat_id": chat_id,
-            "text": text,
-        }
-        
-        if parse_mode:
-            payload["parse_mode"] = parse_mode
-            
-        if inline_keyboard:
-            payload["inline_keyboard"] = inline_keyboard
-            
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {VPS_API_KEY}"
-        }
+        # Skip the VPS while it is known to be down
+        if not await vps_breaker.allow():
+            return False
         
         # Send request to VPS API
         try:
             logger.info(f"Sending message to chat_id {chat_id} via VPS API")
-            response = requests.post(
-                f"{VPS_API_URL}/send_message",
-                json=payload,
-                headers=headers,
-                timeout=10 # 10 seconds timeout
-            )
+            response = await get_http_client().post("/send_message", json=message.payload(chat_id))
+            _record_vps_response(response.status_code)
             
             # Check response
             if response.status_code == 200:
                 result = response.json()
                 logger.info(f"Message successfully sent via VPS API. Message ID: {result.get('message_id')}")
                 return True
+            elif response.status_code == 429:
+                # Telegram flood control, the forwarder passes retry_after through
+                raise RetryAfter(float(response.json().get("retry_after", 1)))
             else:
                 logger.error(f"VPS API error: {response.status_code} - {response.text}")
+                TelegramController._check_unreachable(chat_id, response)
                 return False
+        except RetryAfter:
+            raise
+        except httpx.TransportError as e:
+            vps_breaker.record_failure(type(e).__name__)
+            logger.error(f"Error sending message via VPS API: {e!r}")
+            return False
         except Exception as e:
             logger.error(f"Error sending message via VPS API: {e}")
             return False
             
     @staticmethod
-    async def _try_send_message(recipient: User, message: str, keyboard=None, parse_mode=None):
+    async def _send_batch_via_vps(messages):
+        """
+        Send many messages through the VPS API in one request.
+        Returns per-message results in order, or None if nothing was sent.
+        Raises BatchOutcomeUnknown if the request failed after the forwarder
+        may have started sending, resending the batch could then duplicate messages.
+        """
+        async with batch_slots:
+            # Skip the VPS while it is known to be down
+            if not await vps_breaker.allow():
+                return None
+            
+            try:
+                logger.info(f"Sending batch of {len(messages)} messages via VPS API")
+                response = await get_http_client().post(
+                    "/send_batch",
+                    json={"messages": messages},
+                    timeout=VPS_BATCH_TIMEOUT
+                )
+            except VPS_NOT_SENT_ERRORS as e:
+                vps_breaker.record_failure(type(e).__name__)
+                logger.error(f"Error sending batch via VPS API: {e!r}")
+                return None
+            except httpx.TransportError as e:
+                # A read timeout or a dropped connection, the batch may be partly sent
+                vps_breaker.record_failure(type(e).__name__)
+                raise BatchOutcomeUnknown(repr(e))
+            except Exception as e:
+                raise BatchOutcomeUnknown(str(e))
+        
+        _record_vps_response(response.status_code)
+        if response.status_code == 200:
+            try:
+                results = response.json().get("results", [])
+            except ValueError as e:
+                raise BatchOutcomeUnknown(f"Invalid batch response: {e}")
+            if len(results) != len(messages):
+                raise BatchOutcomeUnknown(f"Got {len(results)} results for {len(messages)} messages")
+            return results
+        
+        logger.error(f"VPS API batch error: {response.status_code} - {response.text}")
+        # The forwarder validates a batch before sending any of it
+        if response.status_code < 500:
+            return None
+        raise BatchOutcomeUnknown(f"HTTP {response.status_code}")
+    
+    @staticmethod
+    async def _send_direct(recipient: User, message: RenderedMessage):
+        """Send a message with the bot itself, bypassing the VPS."""
+        if not bot or not recipient.telegram_chat_id:
+            return False
+        try:
+            logger.info(f"Sending message to user {recipient.id} via chat_id {recipient.telegram_chat_id} (direct)")
+            await bot.send_message(
+                chat_id=recipient.telegram_chat_id,
+                text=message.text,
+                parse_mode=message.parse_mode,
+                reply_markup=message.keyboard
+            )
+            logger.info(f"Message sent to user {recipient.id} via chat_id (direct)")
+            return True
+        except TelegramRetryAfter as e:
+            raise RetryAfter(e.retry_after)
+        except TelegramAPIError as e:
+            logger.error(f"Error sending message via chat_id (direct): {e}")
+            reason = classify_failure(type(e).__name__, str(e))
+            if reason:
+                delivery_engine.mark_unreachable(recipient.telegram_chat_id, reason)
+            return False
+        except Exception as e:
+            logger.error(f"Error sending message via chat_id (direct): {e}")
+            return False
+
+    @staticmethod
+    def _check_unreachable(chat_id, response):
+        """Remember the chat if the forwarder's error response says it is gone for good."""
+        try:
+            data = response.json()
+        except ValueError:
+            return
+        reason = classify_failure(data.get("error"), data.get("message"))
+        if reason:
+            delivery_engine.mark_unreachable(chat_id, reason)
+
+    @staticmethod
+    def _save_unreachable():
+        """Flag users of the chats found unreachable, so that recipient queries skip them."""
+        chats = delivery_engine.take_unreachable()
+        if not chats:
+            return
+        db = SessionLocal()
+        try:
+            marked = UserRepository.mark_telegram_unreachable(db, chats)
+            logger.info(f"Marked {marked} users with unreachable Telegram chats")
+        except Exception as e:
+            logger.error(f"Error saving unreachable chats: {e}")
+        finally:
+            db.close()
+            
+    @staticmethod
+    async def _try_send_message(recipient: User, message: RenderedMessage):
         """
         Try to send a message to a user using available contact methods.
         Returns True if message was sent successfully, False otherwise.
         """
         # Try to send via VPS first, as this is likely to work better
         if recipient.telegram_chat_id:
-            # Convert aiogram keyboard to format suitable for VPS API
-            inline_keyboard = None
-            if keyboard:
-                inline_keyboard = []
-                # Extract button data from InlineKeyboardMarkup
-                if isinstance(keyboard, InlineKeyboardMarkup):
-                    for row in keyboard.inline_keyboard:
-                        button_row = []
-                        for button in row:
-                            button_data = {"text": button.text}
-                            if button.url:
-                                button_data["url"] = button.url
-                            button_row.append(button_data)
-                        inline_keyboard.append(button_row)
-            
-            if await TelegramController._send_via_vps(
-                recipient.telegram_chat_id, 
-                message, 
-                inline_keyboard, 
-                parse_mode
-            ):
+            if await TelegramController._send_via_vps(recipient.telegram_chat_id, message):
                 return True
+            # The bot would be refused as well
+            if delivery_engine.is_unreachable(recipient.telegram_chat_id):
+                return False
                 
         # Fall back to direct Telegram API if VPS fails and bot is initialized
-        if bot:
-            # Try chat_id first if available
-            if recipient.telegram_chat_id:
-                try:
-                    logger.info(f"Sending message to user {recipient.id} via chat_id {recipient.telegram_chat_id} (direct)")
-                    await bot.send_message(
-                        chat_id=recipient.telegram_chat_id,
-                        text=message,
-                        parse_mode=parse_mode,
-                        reply_markup=keyboard
-                    )
-                    logger.info(f"Message sent to user {recipient.id} via chat_id (direct)")
-                    return True
-                except Exception as e:
-                    logger.error(f"Error sending message via chat_id (direct): {e}")
+        if await TelegramController._send_direct(recipient, message):
+            return True
         
         # If VPS API and direct methods both failed
         logger.warning(f"Could not contact user {recipient.id} via Telegram (all methods failed).")
         return False
 
+    @staticmethod
+    async def _fan_out(deliveries, name: str = "broadcast"):
+        """
+        Send prepared messages, given as (user, message) pairs.
+        Goes through /send_batch of the VPS API, messages it could not deliver
+        fall back to the bot itself through the delivery engine. Batches whose
+        outcome is unknown count as failed instead, so that nobody gets a message twice.
+        """
+        started = time.monotonic()
+        deliveries = list(deliveries)
+        reachable = [(recipient, message) for recipient, message in deliveries if recipient.telegram_chat_id]
+        
+        sent = 0
+        fallback = []
+        for offset in range(0, len(reachable), VPS_BATCH_SIZE):
+            chunk = reachable[offset:offset + VPS_BATCH_SIZE]
+            messages = [message.payload(recipient.telegram_chat_id) for recipient, message in chunk]
+            
+            try:
+                results = await TelegramController._send_batch_via_vps(messages)
+            except BatchOutcomeUnknown as e:
+                logger.error(f"{name}: outcome of a batch of {len(chunk)} messages unknown, not resending: {e}")
+                delivery_engine.record_batch(0, len(chunk))
+                continue
+            if results is None:
+                fallback.extend(chunk)
+                continue
+            
+            chunk_sent = 0
+            chunk_unreachable = 0
+            for delivery, result in zip(chunk, results):
+                if result.get("status") == "success":
+                    chunk_sent += 1
+                    continue
+                reason = classify_failure(result.get("error"), result.get("message"))
+                if reason:
+                    # The bot would be refused as well
+                    delivery_engine.mark_unreachable(delivery[0].telegram_chat_id, reason)
+                    chunk_unreachable += 1
+                else:
+                    fallback.append(delivery)
+            sent += chunk_sent
+            delivery_engine.record_batch(chunk_sent, chunk_unreachable)
+        
+        if fallback and bot:
+            logger.info(f"{name}: {len(fallback)} messages fall back to direct sending")
+            result = await delivery_engine.deliver(
+                (
+                    (recipient.telegram_chat_id, partial(TelegramController._send_direct, recipient, message))
+                    for recipient, message in fallback
+                ),
+                f"{name} (direct)"
+            )
+            sent += result["sent"]
+        elif fallback:
+            delivery_engine.record_batch(0, len(fallback))
+        
+        TelegramController._save_unreachable()
+        
+        failed = len(deliveries) - sent
+        return delivery_engine.report(name, {"total": len(deliveries), "sent": sent, "failed": failed}, started)
+
+    @staticmethod
+    async def _broadcast(recipients, message: RenderedMessage, name: str = "broadcast"):
+        """Send one message to many users."""
+        return await TelegramController._fan_out(((recipient, message) for recipient in recipients), name)
+
+    @staticmethod
+    def _delivery_job(recipient: User, message: RenderedMessage) -> DeliveryJob:
+        """Wrap a message to a user for the delivery engine."""
+        return (
+            recipient.telegram_chat_id or f"user:{recipient.id}",
+            partial(TelegramController._try_send_message, recipient, message)
+        )
+
     @staticmethod
     async def send_event_invitation(user_id: int, event_id: int, base_url: str):
         """Send event invitation to user."""
@@ -171,40 +406,22 @@ class TelegramController:
             # Get event creator
             creator = db.query(User).filter(User.id == event.creator_id).first()
             
+            # A chat that refused delivery stays skipped until the user links Telegram again
+            if user.telegram_unreachable_at is not None:
+                logger.info(f"Skipping invitation to user {user_id}, Telegram chat unreachable")
+                return True
+            
             # Format message
-            event_date = event.event_date.strftime("%d.%m.%Y %H:%M")
-            if IS_LOCAL_DEV:
-                # For local development, include URL in message text instead of inline button
-                message = (
-                    f"🎉 <b>Новое приглашение на мероприятие!</b>\n\n"
-                    f"<b>{event.title}</b>\n"
-                    f"📅 {event_date}\n"
-                    f"📍 {event.location}\n"
-                    f"👤 Организатор: {creator.full_name}\n\n"
-                    f"Ссылка на мероприятие: {base_url}/events/{event_id}\n\n"
-                    f"Посетите сайт, чтобы узнать подробности и подтвердить участие."
-                )
-                keyboard = None
-            else:
-                # For production, use inline keyboard
-                message = (
-                    f"🎉 <b>Новое приглашение на мероприятие!</b>\n\n"
-                    f"<b>{event.title}</b>\n"
-                    f"📅 {event_date}\n"
-                    f"📍 {event.location}\n"
-                    f"👤 Организатор: {creator.full_name}\n\n"
-                    f"Посетите сайт, чтобы узнать подробности и подтвердить участие."
-                )
-                # Create inline keyboard
-                keyboard = InlineKeyboardMarkup(inline_keyboard=[[
-                    InlineKeyboardButton(
-                        text="Открыть на сайте", 
-                        url=f"{base_url}/events/{event_id}"
-                    )
-                ]])
+            message = render_event_message("invitation", event, base_url, creator)
             
             # Send message if user has telegram_chat_id
-            if await TelegramController._try_send_message(user, message, keyboard):
+            sent = await delivery_engine.send(*TelegramController._delivery_job(user, message))
+            unreachable = user.telegram_chat_id and delivery_engine.is_unreachable(user.telegram_chat_id)
+            TelegramController._save_unreachable()
+            if sent:
+                return True
+            if unreachable:
+                # Retrying would fail the same way
                 return True
             
             logger.warning(f"No way to contact user {user_id} via Telegram")
@@ -216,6 +433,25 @@ class TelegramController:
         finally:
             db.close()
 
+    @staticmethod
+    async def _send_reminders(pairs, base_url: str, hours_before: int) -> int:
+        """
+        Broadcast reminders for (event, user) pairs ordered by event.
+        Returns the number of events reminded about.
+        """
+        events = 0
+        for _, group in groupby(pairs, key=lambda pair: pair[0].id):
+            group = list(group)
+            event = group[0][0]
+            users = [user for _, user in group]
+            
+            # Format message once for all participants
+            message = render_event_message("reminder", event, base_url, hours_before=hours_before)
+            result = await TelegramController._broadcast(users, message, f"reminders for event {event.id}")
+            logger.info(f"Sent reminders to {result['sent']}/{len(users)} participants for event {event.id}")
+            events += 1
+        return events
+
     @staticmethod
     async def send_event_reminder(event_id: int, base_url: str, hours_before: int = 24):
         """Send event reminder to participants."""
@@ -224,266 +460,115 @@ class TelegramController:
             logger.warning("Telegram bot not initialized. Skipping reminder.")
             return False
             
-        # Get DB session
-        db = SessionLocal()
         try:
-            # Get event
-            event = db.query(Event).filter(Event.id == event_id).first()
-            if not event:
-                logger.error(f"Event not found: {event_id}")
-                return False
-            
-            # Get participants
-            participants = db.query(EventParticipant).filter(
-                EventParticipant.event_id == event_id
-            ).all()
-            
-            if not participants:
-                logger.info(f"No participants for event: {event_id}")
-                return True
-            
-            # Format message
-            event_date = event.event_date.strftime("%d.%m.%Y %H:%M")
-            if IS_LOCAL_DEV:
-                # For local development, include URL in message text
-                message = (
-                    f"⏰ <b>Напоминание о мероприятии!</b>\n\n"
-                    f"<b>{event.title}</b>\n"
-                    f"📅 {event_date} (через {hours_before} ч.)\n"
-                    f"📍 {event.location}\n\n"
-                    f"Ссылка на мероприятие: {base_url}/events/{event_id}\n\n"
-                    f"Не забудьте посетить мероприятие!"
-                )
-                keyboard = None
-            else:
-                # For production, use inline keyboard
-                message = (
-                    f"⏰ <b>Напоминание о мероприятии!</b>\n\n"
-                    f"<b>{event.title}</b>\n"
-                    f"📅 {event_date} (через {hours_before} ч.)\n"
-                    f"📍 {event.location}\n\n"
-                    f"Не забудьте посетить мероприятие!"
-                )
-                # Create inline keyboard
-                keyboard = InlineKeyboardMarkup(inline_keyboard=[[
-                    InlineKeyboardButton(
-                        text="Открыть на сайте", 
-                        url=f"{base_url}/events/{event_id}"
-                    )
-                ]])
-            
-            # Send messages to participants
-            sent_count = 0
-            for participant in participants:
-                user = db.query(User).filter(User.id == participant.user_id).first()
-                if not user:
-                    continue
-                
-                # Try to send message
-                if await TelegramController._try_send_message(user, message, keyboard, parse_mode="HTML"):
-                    sent_count += 1
-                
-                # Small delay to avoid hitting rate limits
-                await asyncio.sleep(0.1)
-            
-            logger.info(f"Sent reminders to {sent_count}/{len(participants)} participants for event {event_id}")
+            # Get participants reachable in Telegram together with the event,
+            # the session is closed before sending starts
+            async with AsyncSessionLocal() as db:
+                pairs = await AsyncParticipationRepository.get_reminder_recipients(db, event_id=event_id)
+            events = await TelegramController._send_reminders(pairs, base_url, hours_before)
+            if not events:
+                logger.info(f"No participants to remind for event: {event_id}")
             return True
         except Exception as e:
             logger.error(f"Error sending reminders: {e}")
             return False
-        finally:
-            db.close()
 
     @staticmethod
-    async def send_bulk_invitations(event_id: int, base_url: str):
-        """Send invitations to all users invited to an event."""
+    async def notify_event_created(event_id: int, base_url: str):
+        """
+        Notify invitees and the creator's followers about a new event in one broadcast.
+        Every chat gets a single message: the invitation if its user is invited,
+        the follower notification otherwise.
+        """
         # Check if bot is available
         if not bot:
-            logger.warning("Telegram bot not initialized. Skipping bulk invitations.")
+            logger.warning("Telegram bot not initialized. Skipping new event notifications.")
             return False
             
         # Get DB session
         db = SessionLocal()
         try:
-            # Get event
+            # Get event with its creator
             event = db.query(Event).filter(Event.id == event_id).first()
             if not event:
                 logger.error(f"Event not found: {event_id}")
                 return False
+            creator = db.query(User).filter(User.id == event.creator_id).first()
             
-            # Get invitations
-            invitations = db.query(Invitation).filter(
-                Invitation.event_id == event_id
-            ).all()
-            
-            if not invitations:
-                logger.info(f"No invitations for event: {event_id}")
-                return True
-            
-            # Send invitations
-            for invitation in invitations:
-                await TelegramController.send_event_invitation(
-                    invitation.user_id, 
-                    event_id, 
-                    base_url
-                )
-                # Small delay to avoid hitting rate limits
-                await asyncio.sleep(0.3)
-            
-            return True
-        except Exception as e:
-            logger.error(f"Error sending bulk invitations: {e}")
-            return False
-        finally:
-            db.close()
-
-    @staticmethod
-    async def send_upcoming_event_reminders(base_url: str, hours_before: int = 24):
-        """Send reminders for all events happening in the next X hours."""
-        # Check if bot is available
-        if not bot:
-            logger.warning("Telegram bot not initialized. Skipping upcoming event reminders.")
-            return False
-            
-        # Get DB session
-        db = SessionLocal()
-        try:
-            # Get events in the next X hours
-            now = datetime.now()
-            target_time = now + timedelta(hours=hours_before)
+            # Invitees and followers in one query, deduplicated by user
+            audience = InvitationRepository.get_new_event_audience(db, event_id, event.creator_id)
             
-            # Events starting between now and target_time
-            upcoming_events = db.query(Event).filter(
-                Event.event_date > now,
-                Event.event_date <= target_time
-            ).all()
+            # A chat linked to several accounts gets one message, an invitation wins
+            recipients = {}
+            for user, invited in audience:
+                if invited or user.telegram_chat_id not in recipients:
+                    recipients[user.telegram_chat_id] = (user, invited)
             
-            if not upcoming_events:
-                logger.info(f"No upcoming events in the next {hours_before} hours")
+            if not recipients:
+                logger.info(f"No one to notify about event: {event_id}")
                 return True
             
-            # Send reminders for each event
-            for event in upcoming_events:
-                await TelegramController.send_event_reminder(
-                    event.id, 
-                    base_url, 
-                    hours_before
-                )
-                # Small delay between events
-                await asyncio.sleep(0.5)
+            # Format both variants once
+            invitation = render_event_message("invitation", event, base_url, creator)
+            announcement = render_event_message("event_created", event, base_url, creator)
             
+            result = await TelegramController._fan_out(
+                ((user, invitation if invited else announcement) for user, invited in recipients.values()),
+                f"new event notifications for event {event_id}"
+            )
+            logger.info(f"Sent new event notifications to {result['sent']}/{len(recipients)} chats for event {event_id}")
             return True
         except Exception as e:
-            logger.error(f"Error sending upcoming event reminders: {e}")
+            logger.error(f"Error sending new event notifications: {e}")
             return False
         finally:
             db.close()
 
     @staticmethod
-    async def notify_followers_about_event(creator_id: int, event_id: int, base_url: str, is_update: bool = False):
-        """Notify followers about a new or updated event created by the user they follow."""
+    async def notify_event_updates(event_ids: List[int], base_url: str):
+        """
+        Notify followers about updated events with one message per chat.
+        A follower of several updated events gets a digest of all of them.
+        """
         # Check if bot is available
         if not bot:
-            logger.warning("Telegram bot not initialized. Skipping followers notification.")
+            logger.warning("Telegram bot not initialized. Skipping update notifications.")
             return False
             
         # Get DB session
         db = SessionLocal()
         try:
-            # Get the event
-            event = db.query(Event).filter(Event.id == event_id).first()
-            if not event:
-                logger.error(f"Event not found: {event_id}")
-                return False
-            
-            # Get the creator
-            creator = db.query(User).filter(User.id == creator_id).first()
-            if not creator:
-                logger.error(f"Creator not found: {creator_id}")
-                return False
+            # Followers of all updated events with the events and their creators, in one query
+            rows = SubscriptionRepository.get_event_followers(db, event_ids)
             
-            # Get all followers (users who have subscribed to the creator)
-            followers = db.query(User).join(
-                Subscription, User.id == Subscription.follower_id
-            ).filter(
-                Subscription.followed_id == creator_id
-            ).all()
+            # Group the updated events by chat
+            chats = {}
+            for follower, event, creator in rows:
+                _, events = chats.setdefault(follower.telegram_chat_id, (follower, {}))
+                events[event.id] = (event, creator)
             
-            logger.info(f"Found {len(followers)} followers for user {creator_id} (event {event_id})")
-            
-            if not followers:
-                logger.info(f"No followers found for user {creator_id}")
+            if not chats:
+                logger.info(f"No followers to notify about updated events: {event_ids}")
                 return True
             
-            # Format message
-            event_date = event.event_date.strftime("%d.%m.%Y %H:%M")
-            if IS_LOCAL_DEV:
-                # For local development, include URL in message text
-                if is_update:
-                    message = (
-                        f"🔄 <b>Обновление мероприятия от {creator.full_name}</b>\n\n"
-                        f"<b>{event.title}</b>\n"
-                        f"📅 {event_date}\n"
-                        f"📍 {event.location}\n\n"
-                        f"Ссылка на мероприятие: {base_url}/events/{event_id}\n\n"
-                        f"Пользователь, на которого вы подписаны, обновил информацию о мероприятии. "
-                        f"Посетите сайт, чтобы узнать актуальные подробности."
-                    )
-                else:
-                    message = (
-                        f"🔔 <b>Новое мероприятие от {creator.full_name}</b>\n\n"
-                        f"<b>{event.title}</b>\n"
-                        f"📅 {event_date}\n"
-                        f"📍 {event.location}\n\n"
-                        f"Ссылка на мероприятие: {base_url}/events/{event_id}\n\n"
-                        f"Пользователь, на которого вы подписаны, создал новое мероприятие. "
-                        f"Посетите сайт, чтобы узнать подробности и подтвердить участие."
-                    )
-                keyboard = None
-            else:
-                # For production, use inline keyboard
-                if is_update:
-                    message = (
-                        f"🔄 <b>Обновление мероприятия от {creator.full_name}</b>\n\n"
-                        f"<b>{event.title}</b>\n"
-                        f"📅 {event_date}\n"
-                        f"📍 {event.location}\n\n"
-                        f"Пользователь, на которого вы подписаны, обновил информацию о мероприятии. "
-                        f"Посетите сайт, чтобы узнать актуальные подробности."
-                    )
-                else:
-                    message = (
-                        f"🔔 <b>Новое мероприятие от {creator.full_name}</b>\n\n"
-                        f"<b>{event.title}</b>\n"
-                        f"📅 {event_date}\n"
-                        f"📍 {event.location}\n\n"
-                        f"Пользователь, на которого вы подписаны, создал новое мероприятие. "
-                        f"Посетите сайт, чтобы узнать подробности и подтвердить участие."
-                    )
-                # Create inline keyboard
-                keyboard = InlineKeyboardMarkup(inline_keyboard=[[
-                    InlineKeyboardButton(
-                        text="Открыть на сайте", 
-                        url=f"{base_url}/events/{event_id}"
-                    )
-                ]])
-            
-            # Send notification to each follower
-            sent_count = 0
-            for follower in followers:
-                # Try to send message
-                logger.info(f"Attempting to send notification to follower {follower.id} ({follower.full_name})")
-                if await TelegramController._try_send_message(follower, message, keyboard, parse_mode="HTML"):
-                    sent_count += 1
-                
-                # Small delay to avoid hitting rate limits
-                await asyncio.sleep(0.1)
-            
-            action_type = "update" if is_update else "creation"
-            logger.info(f"Sent {action_type} notifications to {sent_count}/{len(followers)} followers for user {creator_id}")
+            # Render each distinct set of events once, a long digest takes several messages
+            rendered = {}
+            deliveries = []
+            for user, events in chats.values():
+                key = tuple(events)
+                if key not in rendered:
+                    if len(events) == 1:
+                        event, creator = next(iter(events.values()))
+                        rendered[key] = [render_event_message("event_updated", event, base_url, creator)]
+                    else:
+                        rendered[key] = render_updates_digest(list(events.values()), base_url)
+                deliveries.extend((user, message) for message in rendered[key])
+            
+            result = await TelegramController._fan_out(deliveries, f"update notifications for events {event_ids}")
+            logger.info(f"Sent update notifications for {len(event_ids)} events to {len(chats)} chats: {result['sent']}/{len(deliveries)} messages")
             return True
         except Exception as e:
-            logger.error(f"Error notifying followers: {e}")
+            logger.error(f"Error sending update notifications: {e}")
             return False
         finally:
             db.close()
@@ -499,21 +584,18 @@ if bot and dp:
 
         if len(args) == 2 and args[1].startswith("link_"):
             token = args[1]
-            db = SessionLocal()
-            try:
-                user = TelegramLinkService.get_user_by_token(db, token)
-                if user:
-                    user.telegram_chat_id = str(chat_id)
-                    db.commit()
+            async with AsyncSessionLocal() as db:
+                try:
+                    user = await db.run_sync(TelegramLinkService.get_user_by_token, token)
+                    if user:
+                        await AsyncUserRepository.link_telegram(db, user, str(chat_id))
 
-                    await message.answer("✅ Ваш Telegram успешно привязан к аккаунту!")
-                else:
-                    await message.answer("❌ Ссылка недействительна или устарела.")
-            except Exception as e:
-                logger.error(f"Failed to link Telegram: {e}")
-                await message.answer("❌ Произошла ошибка. Попробуйте позже.")
-            finally:
-                db.close()
+                        await message.answer("✅ Ваш Telegram успешно привязан к аккаунту!")
+                    else:
+                        await message.answer("❌ Ссылка недействительна или устарела.")
+                except Exception as e:
+                    logger.error(f"Failed to link Telegram: {e}")
+                    await message.answer("❌ Произошла ошибка. Попробуйте позже.")
         else:
             await message.answer("👋 Привет! Я бот для уведомлений. Используйте команду /link для привязки.")
 
@@ -534,42 +616,37 @@ if bot and dp:
 
     @router.message(Command("events"))
     async def events_command(message: Message):
-        db = SessionLocal()
-        try:
-            user = db.query(User).filter(User.telegram_chat_id == str(message.chat.id)).first()
-            if not user:
-                await message.answer("Вы не привязаны к сайту. Привяжите аккаунт.")
-                return
+        async with AsyncSessionLocal() as db:
+            try:
+                user = await AsyncUserRepository.get_by_telegram_chat_id(db, str(message.chat.id))
+                if not user:
+                    await message.answer("Вы не привязаны к сайту. Привяжите аккаунт.")
+                    return
 
-            now = datetime.now()
-            participations = db.query(EventParticipant).filter(
-                EventParticipant.user_id == user.id
-            ).all()
+                upcoming = await AsyncEventRepository.get_upcoming_participations(db, user.id, 5)
 
-            event_ids = [p.event_id for p in participations]
-            upcoming = db.query(Event).filter(
-                Event.id.in_(event_ids), Event.event_date > now
-            ).order_by(Event.event_date).limit(5).all()
+                if not upcoming:
+                    await message.answer("📅 Нет запланированных мероприятий.")
+                    return
 
-            if not upcoming:
-                await message.answer("📅 Нет запланированных мероприятий.")
-                return
+                text = "📅 <b>Ближайшие мероприятия:</b>\n\n"
+                for event in upcoming:
+                    event_date = event.event_date.strftime("%d.%m.%Y %H:%M")
+                    text += f"<b>{event.title}</b>\n📅 {event_date}\n📍 {event.location}\n\n"
 
-            text = "📅 <b>Ближайшие мероприятия:</b>\n\n"
-            for event in upcoming:
-                event_date = event.event_date.strftime("%d.%m.%Y %H:%M")
-                text += f"<b>{event.title}</b>\n📅 {event_date}\n📍 {event.location}\n\n"
+                await message.answer(text)
+            except Exception as e:
+                logger.error(f"/events error: {e}")
+                await message.answer("Произошла ошибка. Попробуйте позже.")
 
-            await message.answer(text)
-        except Exception as e:
-            logger.error(f"/events error: {e}")
-            await message.answer("Произошла ошибка. Попробуйте позже.")
-        finally:
-            db.close()
 
+def _setup_dispatcher():
+    # The worker may start the bot again after losing and regaining leadership
+    if router.parent_router is None:
+        dp.include_router(router)
 
 async def start_bot():
-    """Start the Telegram bot polling."""
+    """Start the Telegram bot: register the webhook, or poll when webhook mode is off."""
     if not bot or not dp:
         logger.warning("Telegram bot not initialized. Skipping bot start.")
         return
@@ -582,23 +659,93 @@ async def start_bot():
         except Exception as e:
             logger.warning(f"Could not get bot info: {e}")
             
-        dp.include_router(router)
+        _setup_dispatcher()
+        if WEBHOOK_MODE:
+            # Updates go to the API processes, see feed_webhook_update()
+            await bot.set_webhook(
+                TELEGRAM_WEBHOOK_URL,
+                secret_token=TELEGRAM_WEBHOOK_SECRET,
+                allowed_updates=dp.resolve_used_update_types(),
+                max_connections=TELEGRAM_WEBHOOK_CONCURRENCY
+            )
+            logger.info(f"Telegram webhook set to {TELEGRAM_WEBHOOK_URL}")
+            return
         await bot.delete_webhook(drop_pending_updates=True)
-        await dp.start_polling(bot)
+        # Signals belong to the hosting process, which calls stop_bot()
+        await dp.start_polling(bot, handle_signals=False)
         logger.info("Telegram bot polling started successfully")
     except Exception as e:
         logger.error(f"Failed to start Telegram bot: {e}")
 
+def check_webhook_secret(token: Optional[str]) -> bool:
+    """Check the secret token Telegram sends with every webhook request."""
+    return WEBHOOK_MODE and hmac.compare_digest(token or "", TELEGRAM_WEBHOOK_SECRET)
+
+async def _process_update(update: Update):
+    try:
+        await dp.feed_update(bot, update)
+    except Exception as e:
+        logger.error(f"Error processing Telegram update {update.update_id}: {e}")
+    finally:
+        webhook_slots.release()
+
+async def feed_webhook_update(data: Dict[str, Any]):
+    """Hand an update from the webhook to the dispatcher without waiting for its handlers.
+
+    Waits while TELEGRAM_WEBHOOK_CONCURRENCY updates are being processed, so
+    that a burst slows Telegram's deliveries down instead of piling up tasks.
+    """
+    _setup_dispatcher()
+    try:
+        update = Update.model_validate(data, context={"bot": bot})
+    except ValidationError as e:
+        # Telegram would retry a failed request, the same payload fails again
+        logger.error(f"Dropping invalid Telegram update {data.get('update_id')}: {e}")
+        return
+    await webhook_slots.acquire()
+    task = asyncio.create_task(_process_update(update))
+    webhook_tasks.add(task)
+    task.add_done_callback(webhook_tasks.discard)
+
+async def drain_webhook_updates():
+    """Wait for updates still being processed, then close the bot's HTTP session they used."""
+    if webhook_tasks:
+        await asyncio.gather(*webhook_tasks, return_exceptions=True)
+    if WEBHOOK_MODE and bot:
+        await bot.session.close()
+
+async def start_http_client():
+    """Open the pooled VPS API client."""
+    get_http_client()
+
+async def stop_http_client():
+    """Close the pooled VPS API client."""
+    global http_client
+    if http_client is not None:
+        await http_client.aclose()
+        http_client = None
+        logger.info("VPS API client closed")
+
 async def stop_bot():
     """Stop the Telegram bot."""
     if not bot:
         return
         
     try:
+        if dp:
+            try:
+                await dp.stop_polling()
+            except RuntimeError:
+                # Polling was not running
+                pass
         await bot.session.close()
         if dp and dp.storage:
             await dp.storage.close()
             await dp.storage.wait_closed()
         logger.info("Telegram bot stopped successfully")
     except Exception as e:
-        logger.error(f"Error stopping Telegram bot: {e}")
\ No newline at end of file
+        logger.error(f"Error stopping Telegram bot: {e}")
+
+def get_vps_circuit_metrics():
+    """Get state and transitions of the VPS circuit breaker."""
+    return vps_breaker.metrics()
@@ -4,20 +4,29 @@ from fastapi import FastAPI, Request, Depends, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 from dotenv import load_dotenv
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from starlette.middleware.base import BaseHTTPMiddleware
 
 from .routers import router
-from .config.database import Base, engine, get_db
+from .config.database import Base, engine, async_engine, get_async_db, get_pool_metrics
 from .models import User, Event, EventImage, EventParticipant, Invitation, Subscription, Comment, Review
-from .controllers import start_bot, stop_bot, start_scheduler, stop_scheduler
+from .utils.cache import get_cache_metrics
+from .utils.delivery import get_delivery_metrics
+from .controllers import get_outbox_metrics, get_vps_circuit_metrics, drain_webhook_updates
+from .worker import run_worker
 
 # Load environment variables
 load_dotenv()
 
+# Run the bot, scheduler and outbox delivery inside the API process instead of
+# a separate `python -m app.worker`. Safe with several API workers: the bot and
+# the scheduler still run on a single elected leader.
+RUN_WORKER_IN_API = os.getenv("RUN_WORKER_IN_API", "False").lower() == "true"
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -85,24 +94,26 @@ async def startup_event():
     Base.metadata.create_all(bind=engine)
     logger.info("Database tables created")
     
-    # Start Telegram bot
-    asyncio.create_task(start_bot())
-    logger.info("Telegram bot started")
-    
-    # Start scheduler
-    start_scheduler()
-    logger.info("Scheduler started")
+    # Start background services in this process if configured
+    if RUN_WORKER_IN_API:
+        app.state.worker_stopping = asyncio.Event()
+        app.state.worker_task = asyncio.create_task(run_worker(app.state.worker_stopping))
+        logger.info("Background worker started in the API process")
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Stop services on shutdown."""
-    # Stop Telegram bot
-    await stop_bot()
-    logger.info("Telegram bot stopped")
+    # Stop the background worker, unfinished notifications are picked up after restart
+    if RUN_WORKER_IN_API:
+        app.state.worker_stopping.set()
+        await app.state.worker_task
+        logger.info("Background worker stopped")
+    
+    # Let handlers of received Telegram updates finish and close the bot session
+    await drain_webhook_updates()
     
-    # Stop scheduler
-    stop_scheduler()
-    logger.info("Scheduler stopped")
+    # Close async database connections
+    await async_engine.dispose()
 
 # Root endpoint
 @app.get("/", tags=["root"])
@@ -115,11 +126,11 @@ async def root():
 
 # Health check endpoint
 @app.get("/health", tags=["health"])
-async def health_check(db: Session = Depends(get_db)):
+async def health_check(db: AsyncSession = Depends(get_async_db)):
     """Health check endpoint."""
     try:
         # Check database connection
-        db.execute("SELECT 1")
+        await db.execute(text("SELECT 1"))
         db_status = "healthy"
     except Exception as e:
         db_status = f"unhealthy: {str(e)}"
@@ -129,6 +140,18 @@ async def health_check(db: Session = Depends(get_db)):
         "database": db_status
     }
 
+# Metrics endpoint
+@app.get("/metrics", tags=["health"])
+async def metrics(db: AsyncSession = Depends(get_async_db)):
+    """Runtime metrics."""
+    return {
+        "db_pool": get_pool_metrics(),
+        "cache": get_cache_metrics(),
+        "delivery": get_delivery_metrics(),
+        "outbox": await get_outbox_metrics(db),
+        "vps_circuit": get_vps_circuit_metrics()
+    }
+
 
 # Error handlers
 @app.exception_handler(Exception)
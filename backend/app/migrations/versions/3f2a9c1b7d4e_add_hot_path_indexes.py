@@ -0,0 +1,77 @@
+"""Add indexes for hot filter columns
+
+Revision ID: 3f2a9c1b7d4e
+Revises:
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f2a9c1b7d4e'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns, extra kwargs)
+INDEXES = [
+    ("ix_events_creator_id_created_at", "events", ["creator_id", "created_at", "id"], {}),
+    ("ix_events_created_at_id", "events", ["created_at", "id"], {}),
+    ("ix_events_event_date", "events", ["event_date"], {}),
+    ("ix_event_images_event_id", "event_images", ["event_id"], {}),
+    ("ix_event_participants_user_id", "event_participants", ["user_id"], {}),
+    ("ix_invitations_user_id", "invitations", ["user_id"], {}),
+    ("ix_subscriptions_followed_id", "subscriptions", ["followed_id"], {}),
+    ("ix_comments_event_id_created_at", "comments", ["event_id", "created_at", "id"], {}),
+    ("ix_reviews_event_id_created_at", "reviews", ["event_id", "created_at", "id"], {}),
+    (
+        "ix_users_telegram_chat_id", "users", ["telegram_chat_id"],
+        {"postgresql_where": sa.text("telegram_chat_id IS NOT NULL")}
+    ),
+]
+
+# (name, table, columns)
+UNIQUE_CONSTRAINTS = [
+    ("uq_event_participants_event_user", "event_participants", ["event_id", "user_id"]),
+    ("uq_invitations_event_user", "invitations", ["event_id", "user_id"]),
+]
+
+
+def _table_exists(table: str) -> bool:
+    # Fresh databases get the full schema from create_all
+    return table in sa.inspect(op.get_bind()).get_table_names()
+
+
+def _unique_constraint_exists(table: str, name: str) -> bool:
+    constraints = sa.inspect(op.get_bind()).get_unique_constraints(table)
+    return any(constraint["name"] == name for constraint in constraints)
+
+
+def upgrade() -> None:
+    for name, table, columns in UNIQUE_CONSTRAINTS:
+        if not _table_exists(table) or _unique_constraint_exists(table, name):
+            continue
+        # Drop duplicate rows, keeping the oldest one
+        op.execute(
+            f"DELETE FROM {table} a USING {table} b "
+            f"WHERE a.event_id = b.event_id AND a.user_id = b.user_id AND a.id > b.id"
+        )
+        op.create_unique_constraint(name, table, columns)
+
+    for name, table, columns, kwargs in INDEXES:
+        if _table_exists(table):
+            op.create_index(name, table, columns, if_not_exists=True, **kwargs)
+
+
+def downgrade() -> None:
+    for name, table, columns, kwargs in reversed(INDEXES):
+        if _table_exists(table):
+            op.drop_index(name, table_name=table, if_exists=True)
+
+    for name, table, columns in reversed(UNIQUE_CONSTRAINTS):
+        if _table_exists(table) and _unique_constraint_exists(table, name):
+            op.drop_constraint(name, table, type_="unique")
@@ -0,0 +1,78 @@
+"""Add full-text and trigram search indexes
+
+Revision ID: 8b1e4d2c6a90
+Revises: 3f2a9c1b7d4e
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import TSVECTOR
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b1e4d2c6a90'
+down_revision: Union[str, None] = '3f2a9c1b7d4e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+EVENT_SEARCH_VECTOR = (
+    "setweight(to_tsvector('russian', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('russian', coalesce(location, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(location, '')), 'B') || "
+    "setweight(to_tsvector('russian', coalesce(description, '')), 'C')"
+)
+
+# (name, column)
+USER_TRGM_INDEXES = [
+    ("ix_users_username_trgm", "username"),
+    ("ix_users_full_name_trgm", "full_name"),
+    ("ix_users_phone_trgm", "phone"),
+]
+
+
+def _table_exists(table: str) -> bool:
+    # Fresh databases get the full schema from create_all
+    return table in sa.inspect(op.get_bind()).get_table_names()
+
+
+def _column_exists(table: str, column: str) -> bool:
+    columns = sa.inspect(op.get_bind()).get_columns(table)
+    return any(item["name"] == column for item in columns)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    if _table_exists("events"):
+        if not _column_exists("events", "search_vector"):
+            # Generated column: PostgreSQL fills it on insert and update
+            op.add_column(
+                "events",
+                sa.Column("search_vector", TSVECTOR, sa.Computed(EVENT_SEARCH_VECTOR, persisted=True))
+            )
+        op.create_index(
+            "ix_events_search_vector", "events", ["search_vector"],
+            postgresql_using="gin", if_not_exists=True
+        )
+
+    if _table_exists("users"):
+        for name, column in USER_TRGM_INDEXES:
+            op.create_index(
+                name, "users", [column],
+                postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"}, if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    if _table_exists("users"):
+        for name, column in reversed(USER_TRGM_INDEXES):
+            op.drop_index(name, table_name="users", if_exists=True)
+
+    if _table_exists("events"):
+        op.drop_index("ix_events_search_vector", table_name="events", if_exists=True)
+        if _column_exists("events", "search_vector"):
+            op.drop_column("events", "search_vector")
@@ -0,0 +1,42 @@
+"""Add unreachable Telegram chat flags to users
+
+Revision ID: a4d9e2f7c3b1
+Revises: f2b8d5c1e9a7
+Create Date: 2026-10-17 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4d9e2f7c3b1'
+down_revision: Union[str, None] = 'f2b8d5c1e9a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _table_exists(table: str) -> bool:
+    return table in sa.inspect(op.get_bind()).get_table_names()
+
+
+def _column_exists(table: str, column: str) -> bool:
+    columns = sa.inspect(op.get_bind()).get_columns(table)
+    return any(item["name"] == column for item in columns)
+
+
+def upgrade() -> None:
+    # Fresh databases get the columns from create_all
+    if not _table_exists("users") or _column_exists("users", "telegram_unreachable_at"):
+        return
+
+    op.add_column("users", sa.Column("telegram_unreachable_at", sa.DateTime(timezone=True), nullable=True))
+    op.add_column("users", sa.Column("telegram_unreachable_reason", sa.String(20), nullable=True))
+
+
+def downgrade() -> None:
+    if _table_exists("users") and _column_exists("users", "telegram_unreachable_at"):
+        op.drop_column("users", "telegram_unreachable_reason")
+        op.drop_column("users", "telegram_unreachable_at")
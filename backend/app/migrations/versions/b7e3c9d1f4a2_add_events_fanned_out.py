@@ -0,0 +1,59 @@
+"""Mark events that were not fanned out to feed timelines
+
+Revision ID: b7e3c9d1f4a2
+Revises: a4d9e2f7c3b1
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+import os
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e3c9d1f4a2'
+down_revision: Union[str, None] = 'a4d9e2f7c3b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FEED_FANOUT_MAX_FOLLOWERS = int(os.getenv("FEED_FANOUT_MAX_FOLLOWERS", "5000"))
+
+
+def _table_exists(table: str) -> bool:
+    return table in sa.inspect(op.get_bind()).get_table_names()
+
+
+def _column_exists(table: str, column: str) -> bool:
+    columns = sa.inspect(op.get_bind()).get_columns(table)
+    return any(item["name"] == column for item in columns)
+
+
+def upgrade() -> None:
+    # Fresh databases get the column from create_all
+    if not _table_exists("events") or _column_exists("events", "fanned_out"):
+        return
+
+    op.add_column(
+        "events",
+        sa.Column("fanned_out", sa.Boolean(), nullable=False, server_default=sa.text("true"))
+    )
+
+    # Events of creators above the threshold were pulled on read, keep pulling them.
+    # Some may also be in timelines from before, the feed query drops duplicates.
+    op.execute(sa.text(
+        "UPDATE events SET fanned_out = false "
+        "FROM users WHERE users.id = events.creator_id AND users.followers_count > :max_followers"
+    ).bindparams(max_followers=FEED_FANOUT_MAX_FOLLOWERS))
+
+    op.create_index(
+        "ix_events_creator_id_created_at_pulled", "events", ["creator_id", "created_at", "id"],
+        postgresql_where=sa.text("NOT fanned_out")
+    )
+
+
+def downgrade() -> None:
+    if _table_exists("events") and _column_exists("events", "fanned_out"):
+        op.drop_index("ix_events_creator_id_created_at_pulled", table_name="events")
+        op.drop_column("events", "fanned_out")
@@ -0,0 +1,50 @@
+"""Add denormalized counter columns
+
+Revision ID: c4d7e2a1f5b3
+Revises: 8b1e4d2c6a90
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d7e2a1f5b3'
+down_revision: Union[str, None] = '8b1e4d2c6a90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column, backfill expression)
+COUNTERS = [
+    ("users", "events_count", "(SELECT count(*) FROM events WHERE events.creator_id = users.id)"),
+    ("users", "followers_count", "(SELECT count(*) FROM subscriptions WHERE subscriptions.followed_id = users.id)"),
+    ("users", "following_count", "(SELECT count(*) FROM subscriptions WHERE subscriptions.follower_id = users.id)"),
+    ("events", "participants_count", "(SELECT count(*) FROM event_participants WHERE event_participants.event_id = events.id)"),
+]
+
+
+def _table_exists(table: str) -> bool:
+    # Fresh databases get the full schema from create_all
+    return table in sa.inspect(op.get_bind()).get_table_names()
+
+
+def _column_exists(table: str, column: str) -> bool:
+    columns = sa.inspect(op.get_bind()).get_columns(table)
+    return any(item["name"] == column for item in columns)
+
+
+def upgrade() -> None:
+    for table, column, backfill in COUNTERS:
+        if not _table_exists(table) or _column_exists(table, column):
+            continue
+        op.add_column(table, sa.Column(column, sa.Integer(), nullable=False, server_default="0"))
+        op.execute(f"UPDATE {table} SET {column} = {backfill}")
+
+
+def downgrade() -> None:
+    for table, column, backfill in reversed(COUNTERS):
+        if _table_exists(table) and _column_exists(table, column):
+            op.drop_column(table, column)
@@ -0,0 +1,33 @@
+"""Index feed timeline rows by event
+
+Revision ID: c8f1a6d3e5b9
+Revises: b7e3c9d1f4a2
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8f1a6d3e5b9'
+down_revision: Union[str, None] = 'b7e3c9d1f4a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _table_exists(table: str) -> bool:
+    return table in sa.inspect(op.get_bind()).get_table_names()
+
+
+def upgrade() -> None:
+    # Fresh databases get the index from create_all
+    if _table_exists("feed_entries"):
+        op.create_index("ix_feed_entries_event_id", "feed_entries", ["event_id"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    if _table_exists("feed_entries"):
+        op.drop_index("ix_feed_entries_event_id", table_name="feed_entries", if_exists=True)
@@ -0,0 +1,56 @@
+"""Add feed timeline table
+
+Revision ID: d9a3f6b8c2e1
+Revises: c4d7e2a1f5b3
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+import os
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9a3f6b8c2e1'
+down_revision: Union[str, None] = 'c4d7e2a1f5b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FEED_FANOUT_MAX_FOLLOWERS = int(os.getenv("FEED_FANOUT_MAX_FOLLOWERS", "5000"))
+
+
+def _table_exists(table: str) -> bool:
+    return table in sa.inspect(op.get_bind()).get_table_names()
+
+
+def upgrade() -> None:
+    # Fresh databases get the table from create_all
+    if _table_exists("feed_entries") or not _table_exists("events"):
+        return
+
+    op.create_table(
+        "feed_entries",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("event_id", sa.Integer(), sa.ForeignKey("events.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("creator_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index("ix_feed_entries_user_id_created_at", "feed_entries", ["user_id", "created_at", "event_id"])
+    op.create_index("ix_feed_entries_user_id_creator_id", "feed_entries", ["user_id", "creator_id"])
+
+    # Fan out existing events of creators below the threshold
+    op.execute(sa.text(
+        "INSERT INTO feed_entries (user_id, event_id, creator_id, created_at) "
+        "SELECT s.follower_id, e.id, e.creator_id, e.created_at "
+        "FROM subscriptions s "
+        "JOIN events e ON e.creator_id = s.followed_id "
+        "JOIN users u ON u.id = s.followed_id "
+        "WHERE u.followers_count <= :max_followers"
+    ).bindparams(max_followers=FEED_FANOUT_MAX_FOLLOWERS))
+
+
+def downgrade() -> None:
+    if _table_exists("feed_entries"):
+        op.drop_table("feed_entries")
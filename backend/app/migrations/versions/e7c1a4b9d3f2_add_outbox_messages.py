@@ -0,0 +1,50 @@
+"""Add notification outbox table
+
+Revision ID: e7c1a4b9d3f2
+Revises: d9a3f6b8c2e1
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7c1a4b9d3f2'
+down_revision: Union[str, None] = 'd9a3f6b8c2e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _table_exists(table: str) -> bool:
+    return table in sa.inspect(op.get_bind()).get_table_names()
+
+
+def upgrade() -> None:
+    # Fresh databases get the table from create_all
+    if _table_exists("outbox_messages") or not _table_exists("events"):
+        return
+
+    op.create_table(
+        "outbox_messages",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("kind", sa.String(50), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("idempotency_key", sa.String(255), nullable=False, unique=True),
+        sa.Column("status", sa.String(20), nullable=False, server_default="pending"),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("available_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("sent_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index("ix_outbox_messages_id", "outbox_messages", ["id"])
+    op.create_index("ix_outbox_messages_status_available_at", "outbox_messages", ["status", "available_at"])
+
+
+def downgrade() -> None:
+    if _table_exists("outbox_messages"):
+        op.drop_table("outbox_messages")
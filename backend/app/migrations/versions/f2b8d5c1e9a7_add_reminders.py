@@ -0,0 +1,71 @@
+"""Add reminders table
+
+Revision ID: f2b8d5c1e9a7
+Revises: e7c1a4b9d3f2
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.repositories.reminder_repository import REMINDER_OFFSETS_HOURS
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b8d5c1e9a7'
+down_revision: Union[str, None] = 'e7c1a4b9d3f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _table_exists(table: str) -> bool:
+    return table in sa.inspect(op.get_bind()).get_table_names()
+
+
+def upgrade() -> None:
+    # Fresh databases get the table from create_all
+    if _table_exists("reminders") or not _table_exists("events"):
+        return
+
+    op.create_table(
+        "reminders",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("event_id", sa.Integer(), sa.ForeignKey("events.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("hours_before", sa.Integer(), nullable=False),
+        sa.Column("due_at", sa.DateTime(), nullable=False),
+        sa.Column("sent_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.UniqueConstraint("event_id", "hours_before", name="uq_reminders_event_hours"),
+    )
+    op.create_index("ix_reminders_id", "reminders", ["id"])
+    op.create_index(
+        "ix_reminders_due_at_unsent", "reminders", ["due_at"],
+        postgresql_where=sa.text("sent_at IS NULL")
+    )
+
+    if not REMINDER_OFFSETS_HOURS:
+        return
+
+    # Schedule the reminders of upcoming events. event_date is local time
+    # without time zone, compare with the app's clock like ReminderRepository.schedule
+    offsets = ", ".join(f"(:hours_{index})" for index in range(len(REMINDER_OFFSETS_HOURS)))
+    op.execute(sa.text(
+        f"""
+        INSERT INTO reminders (event_id, hours_before, due_at)
+        SELECT events.id, offsets.hours, events.event_date - make_interval(hours => offsets.hours)
+        FROM events CROSS JOIN (VALUES {offsets}) AS offsets (hours)
+        WHERE events.event_date - make_interval(hours => offsets.hours) > :now
+        """
+    ).bindparams(
+        now=datetime.now(),
+        **{f"hours_{index}": hours for index, hours in enumerate(REMINDER_OFFSETS_HOURS)}
+    ))
+
+
+def downgrade() -> None:
+    if _table_exists("reminders"):
+        op.drop_table("reminders")
@@ -2,6 +2,9 @@ from .user import User
 from .event import Event, EventImage, EventParticipant, Invitation
 from .subscription import Subscription
 from .interaction import Comment, Review
+from .feed import FeedEntry
+from .outbox import OutboxMessage
+from .reminder import Reminder
 from .base import Base, BaseModel
 
 __all__ = [
@@ -13,6 +16,9 @@ __all__ = [
     "Subscription",
     "Comment",
     "Review",
+    "FeedEntry",
+    "OutboxMessage",
+    "Reminder",
     "Base",
     "BaseModel"
 ] 
\ No newline at end of file
@@ -1,8 +1,12 @@
-from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Integer
-from sqlalchemy.orm import relationship
+from sqlalchemy import (
+    Column, String, DateTime, Text, ForeignKey, Integer, Boolean, Index, UniqueConstraint, Computed, text
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from typing import Dict, Any, List
 
 from .base import Base, BaseModel
+from ..utils.search import EVENT_SEARCH_VECTOR
 
 class Event(Base, BaseModel):
     """Event model."""
@@ -14,6 +18,15 @@ class Event(Base, BaseModel):
     description = Column(Text, nullable=True)
     creator_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     
+    # Denormalized counter, see EventRepository.reconcile_counters
+    participants_count = Column(Integer, nullable=False, default=0, server_default="0")
+    
+    # False when the creator was above the fan-out threshold, followers pull the event on read
+    fanned_out = Column(Boolean, nullable=False, default=True, server_default=text("true"))
+    
+    # Full-text search document, kept in sync by PostgreSQL on insert/update
+    search_vector = deferred(Column(TSVECTOR, Computed(EVENT_SEARCH_VECTOR, persisted=True)))
+    
     # Relationships
     creator = relationship("User", back_populates="events")
     images = relationship("EventImage", back_populates="event", cascade="all, delete-orphan")
@@ -22,6 +35,22 @@ class Event(Base, BaseModel):
     comments = relationship("Comment", back_populates="event", cascade="all, delete-orphan")
     reviews = relationship("Review", back_populates="event", cascade="all, delete-orphan")
     
+    __table_args__ = (
+        # Creator listings and feed, newest first
+        Index("ix_events_creator_id_created_at", "creator_id", "created_at", "id"),
+        # Events pulled into feeds, see FeedRepository.get_feed_slice
+        Index(
+            "ix_events_creator_id_created_at_pulled", "creator_id", "created_at", "id",
+            postgresql_where=text("NOT fanned_out")
+        ),
+        # Global listing keyset pagination
+        Index("ix_events_created_at_id", "created_at", "id"),
+        # Reminder time windows
+        Index("ix_events_event_date", "event_date"),
+        # Full-text search
+        Index("ix_events_search_vector", "search_vector", postgresql_using="gin"),
+    )
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert event to dictionary with serialized image paths."""
         result = {
@@ -51,6 +80,10 @@ class EventImage(Base, BaseModel):
     
     # Relationships
     event = relationship("Event", back_populates="images")
+    
+    __table_args__ = (
+        Index("ix_event_images_event_id", "event_id"),
+    )
 
 class EventParticipant(Base, BaseModel):
     """Event participant model."""
@@ -60,8 +93,14 @@ class EventParticipant(Base, BaseModel):
     event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), nullable=False)
     
     # Relationships
-    user = relationship("User", back_populates="participations")
+    user = relationship("User", back_populates="participations", lazy="selectin")
     event = relationship("Event", back_populates="participants")
+    
+    # A user can join an event only once
+    __table_args__ = (
+        UniqueConstraint('event_id', 'user_id', name='uq_event_participants_event_user'),
+        Index("ix_event_participants_user_id", "user_id"),
+    )
 
 class Invitation(Base, BaseModel):
     """Invitation model."""
@@ -71,5 +110,11 @@ class Invitation(Base, BaseModel):
     event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), nullable=False)
     
     # Relationships
-    user = relationship("User", back_populates="invitations")
-    event = relationship("Event", back_populates="invitations") 
\ No newline at end of file
+    user = relationship("User", back_populates="invitations", lazy="selectin")
+    event = relationship("Event", back_populates="invitations")
+    
+    # A user can be invited to an event only once
+    __table_args__ = (
+        UniqueConstraint('event_id', 'user_id', name='uq_invitations_event_user'),
+        Index("ix_invitations_user_id", "user_id"),
+    ) 
\ No newline at end of file
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, ForeignKey, Integer, DateTime, Index
+
+from .base import Base
+
+class FeedEntry(Base):
+    """Precomputed feed timeline row: event fanned out to one follower.
+
+    created_at copies the event's so that the timeline sorts and pages
+    with the same (created_at, id) cursors as event listings.
+    """
+    __tablename__ = "feed_entries"
+    
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), primary_key=True)
+    creator_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    
+    __table_args__ = (
+        # Newest-first slice of one user's timeline
+        Index("ix_feed_entries_user_id_created_at", "user_id", "created_at", "event_id"),
+        # Unfollow removes one creator's entries
+        Index("ix_feed_entries_user_id_creator_id", "user_id", "creator_id"),
+        # Timelines holding an event, for cache invalidation and cascading deletes
+        Index("ix_feed_entries_event_id", "event_id"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Integer, Text, Float, CheckConstraint
+from sqlalchemy import Column, ForeignKey, Integer, Text, Float, CheckConstraint, Index
 from sqlalchemy.orm import relationship
 
 from .base import Base, BaseModel
@@ -12,8 +12,12 @@ class Comment(Base, BaseModel):
     event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), nullable=False)
     
     # Relationships
-    user = relationship("User", back_populates="comments")
+    user = relationship("User", back_populates="comments", lazy="selectin")
     event = relationship("Event", back_populates="comments")
+    
+    __table_args__ = (
+        Index("ix_comments_event_id_created_at", "event_id", "created_at", "id"),
+    )
 
 class Review(Base, BaseModel):
     """Review model for events."""
@@ -25,10 +29,11 @@ class Review(Base, BaseModel):
     event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), nullable=False)
     
     # Relationships
-    user = relationship("User", back_populates="reviews")
+    user = relationship("User", back_populates="reviews", lazy="selectin")
     event = relationship("Event", back_populates="reviews")
     
     # Ensure rating is between 1 and 5
     __table_args__ = (
         CheckConstraint('rating >= 1 AND rating <= 5', name='check_rating_range'),
+        Index("ix_reviews_event_id_created_at", "event_id", "created_at", "id"),
     ) 
\ No newline at end of file
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Index
+from sqlalchemy.sql import func
+
+from .base import Base, BaseModel
+
+class OutboxMessage(Base, BaseModel):
+    """Notification written in the transaction of the change that caused it.
+
+    The outbox dispatcher claims due messages in batches and delivers them.
+    status goes pending -> processing -> sent, or dead after too many attempts.
+    While processing, available_at is the end of the claim lease.
+    """
+    __tablename__ = "outbox_messages"
+    
+    kind = Column(String(50), nullable=False)
+    payload = Column(JSON, nullable=False)
+    idempotency_key = Column(String(255), nullable=False, unique=True)
+    status = Column(String(20), nullable=False, default="pending", server_default="pending")
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    available_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    last_error = Column(Text, nullable=True)
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+    
+    __table_args__ = (
+        # Dispatcher scans due messages
+        Index("ix_outbox_messages_status_available_at", "status", "available_at"),
+    )
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Index, UniqueConstraint, text
+
+from .base import Base, BaseModel
+
+class Reminder(Base, BaseModel):
+    """Reminder about an event due hours_before its start.
+
+    Rows are written with the event and moved along when its date changes.
+    sent_at is the ledger: it is set in the transaction that hands the
+    reminder to the outbox, so each reminder goes out once.
+    """
+    __tablename__ = "reminders"
+    
+    event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), nullable=False)
+    hours_before = Column(Integer, nullable=False)
+    due_at = Column(DateTime, nullable=False)
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+    
+    __table_args__ = (
+        UniqueConstraint("event_id", "hours_before", name="uq_reminders_event_hours"),
+        # Scheduler looks up the next unsent reminder
+        Index("ix_reminders_due_at_unsent", "due_at", postgresql_where=text("sent_at IS NULL")),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Integer, UniqueConstraint
+from sqlalchemy import Column, ForeignKey, Integer, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 
 from .base import Base, BaseModel
@@ -11,10 +11,12 @@ class Subscription(Base, BaseModel):
     followed_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     
     # Relationships
-    follower = relationship("User", foreign_keys=[follower_id], back_populates="following")
-    followed = relationship("User", foreign_keys=[followed_id], back_populates="followers")
+    follower = relationship("User", foreign_keys=[follower_id], back_populates="following", lazy="selectin")
+    followed = relationship("User", foreign_keys=[followed_id], back_populates="followers", lazy="selectin")
     
     # Ensure a user can only follow another user once
     __table_args__ = (
         UniqueConstraint('follower_id', 'followed_id', name='unique_follower_followed'),
+        # Followers lookups (follower_id is covered by the unique constraint)
+        Index("ix_subscriptions_followed_id", "followed_id"),
     ) 
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean
+from sqlalchemy import Column, String, Boolean, Integer, DateTime, Index, DDL, event, text
 from sqlalchemy.orm import relationship
 
 from .base import Base, BaseModel
@@ -15,6 +15,38 @@ class User(Base, BaseModel):
     is_active = Column(Boolean, default=True)
     telegram_chat_id = Column(String, nullable=True)
     
+    # Set when the chat blocked the bot or no longer exists, cleared when the
+    # user links Telegram again. Notifications skip such users.
+    telegram_unreachable_at = Column(DateTime(timezone=True), nullable=True)
+    telegram_unreachable_reason = Column(String(20), nullable=True)
+    
+    # Denormalized counters, see UserRepository.reconcile_counters
+    events_count = Column(Integer, nullable=False, default=0, server_default="0")
+    followers_count = Column(Integer, nullable=False, default=0, server_default="0")
+    following_count = Column(Integer, nullable=False, default=0, server_default="0")
+    
+    __table_args__ = (
+        # Bot lookups by chat; most users have no linked chat
+        Index(
+            "ix_users_telegram_chat_id",
+            "telegram_chat_id",
+            postgresql_where=text("telegram_chat_id IS NOT NULL")
+        ),
+        # Trigram indexes for substring search
+        Index(
+            "ix_users_username_trgm", "username",
+            postgresql_using="gin", postgresql_ops={"username": "gin_trgm_ops"}
+        ),
+        Index(
+            "ix_users_full_name_trgm", "full_name",
+            postgresql_using="gin", postgresql_ops={"full_name": "gin_trgm_ops"}
+        ),
+        Index(
+            "ix_users_phone_trgm", "phone",
+            postgresql_using="gin", postgresql_ops={"phone": "gin_trgm_ops"}
+        ),
+    )
+    
     # Relationships
     events = relationship("Event", back_populates="creator", cascade="all, delete-orphan")
     participations = relationship("EventParticipant", back_populates="user", cascade="all, delete-orphan")
@@ -36,4 +68,11 @@ class User(Base, BaseModel):
         foreign_keys="Subscription.follower_id",
         back_populates="follower",
         cascade="all, delete-orphan"
-    ) 
\ No newline at end of file
+    )
+
+# Trigram operator classes come from the pg_trgm extension
+event.listen(
+    User.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+)
\ No newline at end of file
@@ -3,6 +3,14 @@ from .event_repository import EventRepository
 from .subscription_repository import SubscriptionRepository
 from .participation_repository import ParticipationRepository, InvitationRepository
 from .interaction_repository import CommentRepository, ReviewRepository
+from .feed_repository import FeedRepository
+from .outbox_repository import OutboxRepository
+from .reminder_repository import ReminderRepository
+from .async_repository import (
+    AsyncRepository, AsyncUserRepository, AsyncEventRepository, AsyncSubscriptionRepository,
+    AsyncParticipationRepository, AsyncInvitationRepository, AsyncCommentRepository, AsyncReviewRepository,
+    AsyncOutboxRepository, AsyncReminderRepository
+)
 
 __all__ = [
     "UserRepository",
@@ -11,5 +19,18 @@ __all__ = [
     "ParticipationRepository",
     "InvitationRepository",
     "CommentRepository",
-    "ReviewRepository"
+    "ReviewRepository",
+    "FeedRepository",
+    "OutboxRepository",
+    "ReminderRepository",
+    "AsyncRepository",
+    "AsyncUserRepository",
+    "AsyncEventRepository",
+    "AsyncSubscriptionRepository",
+    "AsyncParticipationRepository",
+    "AsyncInvitationRepository",
+    "AsyncCommentRepository",
+    "AsyncReviewRepository",
+    "AsyncOutboxRepository",
+    "AsyncReminderRepository"
 ] 
\ No newline at end of file
@@ -0,0 +1,45 @@
+import functools
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .user_repository import UserRepository
+from .event_repository import EventRepository
+from .subscription_repository import SubscriptionRepository
+from .participation_repository import ParticipationRepository, InvitationRepository
+from .interaction_repository import CommentRepository, ReviewRepository
+from .outbox_repository import OutboxRepository
+from .reminder_repository import ReminderRepository
+
+class AsyncRepository:
+    """Async variant of a repository.
+
+    Every static method of the wrapped repository becomes a coroutine that takes
+    an AsyncSession. The method body runs through ``AsyncSession.run_sync``, so
+    queries go over the asyncpg driver and never block the event loop.
+    """
+
+    def __init__(self, repository):
+        self._repository = repository
+
+    def __getattr__(self, name):
+        method = getattr(self._repository, name)
+        if not callable(method):
+            return method
+
+        @functools.wraps(method)
+        async def wrapper(db: AsyncSession, *args, **kwargs):
+            return await db.run_sync(method, *args, **kwargs)
+
+        return wrapper
+
+    def __repr__(self):
+        return f"Async{self._repository.__name__}"
+
+AsyncUserRepository = AsyncRepository(UserRepository)
+AsyncEventRepository = AsyncRepository(EventRepository)
+AsyncSubscriptionRepository = AsyncRepository(SubscriptionRepository)
+AsyncParticipationRepository = AsyncRepository(ParticipationRepository)
+AsyncInvitationRepository = AsyncRepository(InvitationRepository)
+AsyncCommentRepository = AsyncRepository(CommentRepository)
+AsyncReviewRepository = AsyncRepository(ReviewRepository)
+AsyncOutboxRepository = AsyncRepository(OutboxRepository)
+AsyncReminderRepository = AsyncRepository(ReminderRepository)
@@ -1,10 +1,15 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from sqlalchemy.orm import Session, selectinload, joinedload
+from sqlalchemy import func, desc, select, exists, false, update
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any
 
-from ..models import Event, EventImage, EventParticipant, Invitation, User, Subscription
+from ..models import Event, EventImage, EventParticipant, Invitation, User
 from ..schemas import EventCreate, EventUpdate
+from ..utils.pagination import CursorKey, paginate
+from ..utils.search import to_prefix_query, prefix_tsquery
+from .feed_repository import FeedRepository
+from .outbox_repository import OutboxRepository, OUTBOX_HOLD_SECONDS
+from .reminder_repository import ReminderRepository
 
 class EventRepository:
     @staticmethod
@@ -18,6 +23,20 @@ class EventRepository:
             creator_id=creator_id
         )
         db.add(db_event)
+        
+        # Count the event and fan it out to follower timelines in the same transaction
+        db.query(User).filter(User.id == creator_id).update(
+            {User.events_count: User.events_count + 1}, synchronize_session=False
+        )
+        db.flush()
+        FeedRepository.fan_out_event(db, db_event.id, creator_id)
+        ReminderRepository.schedule(db, db_event.id, db_event.event_date)
+        
+        # Notification is held until the caller has added invitations, see release_notification()
+        OutboxRepository.enqueue(
+            db, "event_created", {"event_id": db_event.id, "creator_id": creator_id},
+            f"event_created:{db_event.id}", delay=OUTBOX_HOLD_SECONDS
+        )
         db.commit()
         db.refresh(db_event)
         return db_event
@@ -40,6 +59,49 @@ class EventRepository:
         event = db.query(Event).filter(Event.id == event_id).first()
         return event
 
+    @staticmethod
+    def get_detail(db: Session, event_id: int, user_id: Optional[int] = None):
+        """Get event with creator, images, participants count and viewer flags in one query.
+
+        Returns a (event, participants_count, is_user_participant, is_user_invited)
+        row or None if the event does not exist.
+        """
+        if user_id is not None:
+            is_participant = exists().where(
+                EventParticipant.event_id == Event.id,
+                EventParticipant.user_id == user_id
+            )
+            is_invited = exists().where(
+                Invitation.event_id == Event.id,
+                Invitation.user_id == user_id
+            )
+        else:
+            is_participant = false()
+            is_invited = false()
+        
+        return db.query(
+            Event,
+            Event.participants_count,
+            is_participant.label("is_user_participant"),
+            is_invited.label("is_user_invited")
+        ).options(
+            joinedload(Event.creator),
+            joinedload(Event.images)
+        ).filter(Event.id == event_id).first()
+
+    @staticmethod
+    def get_user_flags(db: Session, event_id: int, user_id: int):
+        """Get (is_user_participant, is_user_invited) for one user in one query."""
+        is_participant = exists().where(
+            EventParticipant.event_id == event_id,
+            EventParticipant.user_id == user_id
+        )
+        is_invited = exists().where(
+            Invitation.event_id == event_id,
+            Invitation.user_id == user_id
+        )
+        return db.execute(select(is_participant, is_invited)).one()
+
     @staticmethod
     def update(db: Session, event_id: int, event_data: EventUpdate):
         """Update event."""
@@ -80,15 +142,31 @@ class EventRepository:
         for key, value in update_data.items():
             setattr(db_event, key, value)
         
+        # Move reminders and notify followers in the same transaction, edits in
+        # quick succession share one notification
+        ReminderRepository.schedule(db, event_id, db_event.event_date)
+        OutboxRepository.debounce(
+            db, "event_updated", {"event_id": event_id, "creator_id": db_event.creator_id},
+            f"event_updated:{event_id}"
+        )
         db.commit()
         db.refresh(db_event)
         return db_event
 
+    @staticmethod
+    def release_notification(db: Session, event_id: int):
+        """Make the held notification of a new event due now."""
+        OutboxRepository.release(db, f"event_created:{event_id}")
+        db.commit()
+
     @staticmethod
     def delete(db: Session, event_id: int):
         """Delete event."""
         db_event = db.query(Event).filter(Event.id == event_id).first()
         if db_event:
+            db.query(User).filter(User.id == db_event.creator_id).update(
+                {User.events_count: User.events_count - 1}, synchronize_session=False
+            )
             db.delete(db_event)
             db.commit()
             return True
@@ -105,77 +183,116 @@ class EventRepository:
         return False
 
     @staticmethod
-    def get_all(db: Session, skip: int = 0, limit: int = 100, upcoming_only: bool = False) -> List[Dict[str, Any]]:
+    def get_all(
+        db: Session, 
+        skip: int = 0, 
+        limit: int = 100, 
+        upcoming_only: bool = False, 
+        cursor: Optional[CursorKey] = None
+    ) -> List[Dict[str, Any]]:
         """Get all events."""
-        query = db.query(Event)
+        query = db.query(Event).options(selectinload(Event.images))
         
         if upcoming_only:
             now = datetime.now()
             query = query.filter(Event.event_date >= now)
         
-        events = query.order_by(desc(Event.created_at)).offset(skip).limit(limit).all()
+        events = paginate(query, Event, skip, limit, cursor)
         
         # Convert events to dictionaries with serialized image paths
         return [event.to_dict() for event in events]
 
     @staticmethod
-    def get_events_by_creator(db: Session, creator_id: int, skip: int = 0, limit: int = 100) -> List[Event]:
+    def get_events_by_creator(
+        db: Session, 
+        creator_id: int, 
+        skip: int = 0, 
+        limit: int = 100, 
+        cursor: Optional[CursorKey] = None
+    ) -> List[Event]:
         """Get events by creator ID."""
-        events = db.query(Event).filter(
+        query = db.query(Event).options(selectinload(Event.images)).filter(
             Event.creator_id == creator_id
-        ).order_by(desc(Event.created_at)).offset(skip).limit(limit).all()
-        return events
+        )
+        return paginate(query, Event, skip, limit, cursor)
 
     @staticmethod
     def get_upcoming_events_by_creator(db: Session, creator_id: int, skip: int = 0, limit: int = 100) -> List[Event]:
         """Get upcoming events by creator ID."""
         now = datetime.now()
-        events = db.query(Event).filter(
+        events = db.query(Event).options(selectinload(Event.images)).filter(
             Event.creator_id == creator_id,
             Event.event_date >= now
         ).order_by(Event.event_date).offset(skip).limit(limit).all()
         return events
 
     @staticmethod
-    def get_user_feed(db: Session, user_id: int, skip: int = 0, limit: int = 100) -> List[Event]:
-        """Get events from users the current user is following."""
-        # Get IDs of users the current user is following
-        following_ids = db.query(Subscription.followed_id).filter(
-            Subscription.follower_id == user_id
-        ).all()
-        following_ids = [followed_id for (followed_id,) in following_ids]
-        
-        if not following_ids:
-            return []
-        
-        events = db.query(Event).filter(
-            Event.creator_id.in_(following_ids)
-        ).order_by(desc(Event.created_at)).offset(skip).limit(limit).all()
+    def get_upcoming_participations(db: Session, user_id: int, limit: int = 5) -> List[Event]:
+        """Get upcoming events the user participates in."""
+        now = datetime.now()
+        events = db.query(Event).join(
+            EventParticipant, EventParticipant.event_id == Event.id
+        ).filter(
+            EventParticipant.user_id == user_id,
+            Event.event_date > now
+        ).order_by(Event.event_date).limit(limit).all()
         return events
 
     @staticmethod
-    def search(db: Session, query: str, skip: int = 0, limit: int = 100, upcoming_only: bool = False) -> List[Event]:
-        """Search events by title or location."""
-        search_query = f"%{query}%"
-        base_query = db.query(Event).filter(
-            (Event.title.ilike(search_query)) | 
-            (Event.location.ilike(search_query)) |
-            (Event.description.ilike(search_query))
-        )
+    def get_user_feed(
+        db: Session, 
+        user_id: int, 
+        skip: int = 0, 
+        limit: int = 100, 
+        cursor: Optional[CursorKey] = None
+    ) -> List[Event]:
+        """Get events from users the current user is following."""
+        feed = FeedRepository.get_feed_slice(db, user_id, skip, limit, cursor)
+        return db.query(Event).options(selectinload(Event.images)).join(
+            feed, Event.id == feed.c.event_id
+        ).order_by(
+            desc(feed.c.created_at), desc(feed.c.event_id)
+        ).offset(0 if cursor else skip).limit(limit).all()
+
+    @staticmethod
+    def search(
+        db: Session, 
+        query: str, 
+        skip: int = 0, 
+        limit: int = 100, 
+        upcoming_only: bool = False, 
+        cursor: Optional[CursorKey] = None,
+        ranked: bool = True
+    ) -> List[Event]:
+        """Full-text search events by title, location, or description."""
+        base_query = db.query(Event).options(selectinload(Event.images))
+        rank = None
+        
+        prefix_query = to_prefix_query(query)
+        if prefix_query:
+            # Uses the GIN index on the generated search_vector column
+            tsquery = prefix_tsquery(prefix_query)
+            base_query = base_query.filter(Event.search_vector.op("@@")(tsquery))
+            rank = func.ts_rank_cd(Event.search_vector, tsquery)
+        else:
+            # No words to match (punctuation only), fall back to substring search
+            search_query = f"%{query}%"
+            base_query = base_query.filter(
+                (Event.title.ilike(search_query)) | 
+                (Event.location.ilike(search_query)) |
+                (Event.description.ilike(search_query))
+            )
         
         if upcoming_only:
             now = datetime.now()
             base_query = base_query.filter(Event.event_date >= now)
         
-        events = base_query.order_by(desc(Event.created_at)).offset(skip).limit(limit).all()
-        return events
+        return paginate(base_query, Event, skip, limit, cursor, rank if ranked else None)
 
     @staticmethod
     def get_participants_count(db: Session, event_id: int):
         """Get the number of participants for an event."""
-        return db.query(func.count(EventParticipant.id)).filter(
-            EventParticipant.event_id == event_id
-        ).scalar()
+        return db.query(Event.participants_count).filter(Event.id == event_id).scalar() or 0
 
     @staticmethod
     def is_user_participant(db: Session, event_id: int, user_id: int):
@@ -213,4 +330,19 @@ class EventRepository:
             Event.event_date >= now,
             Event.event_date <= future
         ).all()
-        return events 
\ No newline at end of file
+        return events
+
+    @staticmethod
+    def reconcile_counters(db: Session) -> int:
+        """Repair drifted participants_count values, return the number of fixed events."""
+        actual = select(func.count(EventParticipant.id)).where(
+            EventParticipant.event_id == Event.id
+        ).scalar_subquery()
+        result = db.execute(
+            update(Event)
+            .where(Event.participants_count != actual)
+            .values(participants_count=actual)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return result.rowcount
\ No newline at end of file
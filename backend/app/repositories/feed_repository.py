@@ -0,0 +1,151 @@
+import os
+from sqlalchemy.orm import Session
+from sqlalchemy import select, insert, literal, union, tuple_
+from dotenv import load_dotenv
+
+from typing import List, Optional
+
+from ..models import FeedEntry, Event, Subscription, User
+from ..utils.pagination import CursorKey
+
+# Load environment variables
+load_dotenv()
+
+# Creators with more followers are not fanned out on write, followers read their events on demand
+FEED_FANOUT_MAX_FOLLOWERS = int(os.getenv("FEED_FANOUT_MAX_FOLLOWERS", "5000"))
+
+# Recent events of a newly followed creator copied into the follower's timeline
+FEED_BACKFILL_LIMIT = int(os.getenv("FEED_BACKFILL_LIMIT", "100"))
+
+class FeedRepository:
+    @staticmethod
+    def is_fanned_out(db: Session, creator_id: int) -> bool:
+        """Check whether the creator's events are pushed to follower timelines."""
+        followers_count = db.query(User.followers_count).filter(User.id == creator_id).scalar() or 0
+        return followers_count <= FEED_FANOUT_MAX_FOLLOWERS
+
+    @staticmethod
+    def fan_out_event(db: Session, event_id: int, creator_id: int) -> bool:
+        """Add an event to every follower's timeline with one INSERT ... SELECT. Does not commit.
+
+        Events of creators above the threshold are marked instead and stay
+        pulled on read even after the creator drops below it.
+        """
+        if not FeedRepository.is_fanned_out(db, creator_id):
+            db.query(Event).filter(Event.id == event_id).update(
+                {Event.fanned_out: False}, synchronize_session=False
+            )
+            return False
+
+        rows = select(
+            Subscription.follower_id, Event.id, Event.creator_id, Event.created_at
+        ).join(
+            Event, Event.creator_id == Subscription.followed_id
+        ).where(Event.id == event_id)
+        db.execute(insert(FeedEntry).from_select(
+            ["user_id", "event_id", "creator_id", "created_at"], rows
+        ))
+        return True
+
+    @staticmethod
+    def add_creator_events(db: Session, user_id: int, creator_id: int):
+        """Backfill a follower's timeline with the creator's recent fanned out events. Does not commit.
+
+        The creator's other events are pulled on read.
+        """
+        rows = select(
+            literal(user_id), Event.id, Event.creator_id, Event.created_at
+        ).where(
+            Event.creator_id == creator_id,
+            Event.fanned_out.is_(True),
+            ~select(FeedEntry.event_id).where(
+                FeedEntry.user_id == user_id,
+                FeedEntry.event_id == Event.id
+            ).exists()
+        ).order_by(Event.created_at.desc()).limit(FEED_BACKFILL_LIMIT)
+        db.execute(insert(FeedEntry).from_select(
+            ["user_id", "event_id", "creator_id", "created_at"], rows
+        ))
+
+    @staticmethod
+    def remove_creator_events(db: Session, user_id: int, creator_id: int):
+        """Drop a creator's events from a follower's timeline. Does not commit."""
+        db.query(FeedEntry).filter(
+            FeedEntry.user_id == user_id,
+            FeedEntry.creator_id == creator_id
+        ).delete(synchronize_session=False)
+
+    @staticmethod
+    def get_timeline_users(db: Session, event_id: int) -> List[int]:
+        """Get IDs of users whose timeline holds the event."""
+        rows = db.query(FeedEntry.user_id).filter(FeedEntry.event_id == event_id).all()
+        return [row.user_id for row in rows]
+
+    @staticmethod
+    def get_new_event_feed_users(db: Session, event_id: int) -> List[int]:
+        """Get IDs of users whose feed changed with a newly created event.
+
+        A fanned out event is in its followers' timelines. The first pulled
+        event of a creator changes every follower's pulled creators, later
+        ones only show up through the creator's own events.
+        """
+        event = db.query(Event.creator_id, Event.fanned_out).filter(Event.id == event_id).first()
+        if event is None:
+            return []
+        if event.fanned_out:
+            return FeedRepository.get_timeline_users(db, event_id)
+        
+        earlier_pulled = db.query(Event.id).filter(
+            Event.creator_id == event.creator_id,
+            Event.fanned_out.is_(False),
+            Event.id < event_id
+        ).first()
+        if earlier_pulled is not None:
+            return []
+        rows = db.query(Subscription.follower_id).filter(Subscription.followed_id == event.creator_id).all()
+        return [row.follower_id for row in rows]
+
+    @staticmethod
+    def get_pulled_creators(db: Session, user_id: int) -> List[int]:
+        """Get IDs of followed creators with events that are pulled on read."""
+        followed_creators = select(Subscription.followed_id).where(Subscription.follower_id == user_id)
+        rows = db.query(Event.creator_id).filter(
+            Event.creator_id.in_(followed_creators),
+            Event.fanned_out.is_(False)
+        ).distinct().all()
+        return [row.creator_id for row in rows]
+
+    @staticmethod
+    def get_feed_slice(db: Session, user_id: int, skip: int = 0, limit: int = 100, cursor: Optional[CursorKey] = None):
+        """Get a (event_id, created_at) subquery covering one feed page.
+
+        Merges the precomputed timeline with events of followed creators
+        that were never fanned out, pulled on read.
+        """
+        window = limit if cursor else skip + limit
+        
+        pushed = select(
+            FeedEntry.event_id.label("event_id"), FeedEntry.created_at.label("created_at")
+        ).where(FeedEntry.user_id == user_id)
+        
+        followed_creators = select(Subscription.followed_id).where(Subscription.follower_id == user_id)
+        pulled = select(
+            Event.id.label("event_id"), Event.created_at.label("created_at")
+        ).where(
+            Event.creator_id.in_(followed_creators),
+            Event.fanned_out.is_(False)
+        )
+        
+        if cursor:
+            pushed = pushed.where(tuple_(FeedEntry.created_at, FeedEntry.event_id) < cursor)
+            pulled = pulled.where(tuple_(Event.created_at, Event.id) < cursor)
+        
+        # Each side only needs its newest rows for this page
+        pushed = pushed.order_by(FeedEntry.created_at.desc(), FeedEntry.event_id.desc()).limit(window)
+        pulled = pulled.order_by(Event.created_at.desc(), Event.id.desc()).limit(window)
+        
+        # UNION drops events present on both sides
+        return union(
+            select(pushed.subquery()),
+            select(pulled.subquery())
+        ).subquery()
\ No newline at end of file
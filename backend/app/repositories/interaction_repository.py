@@ -1,10 +1,11 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from sqlalchemy import func
 from typing import List, Optional
 from datetime import datetime
 
 from ..models import Comment, Review, Event
 from ..schemas import CommentCreate, CommentUpdate, ReviewCreate, ReviewUpdate
+from ..utils.pagination import CursorKey, paginate
 
 class CommentRepository:
     @staticmethod
@@ -60,11 +61,10 @@ class CommentRepository:
         return False
 
     @staticmethod
-    def get_by_event(db: Session, event_id: int, skip: int = 0, limit: int = 100):
+    def get_by_event(db: Session, event_id: int, skip: int = 0, limit: int = 100, cursor: Optional[CursorKey] = None):
         """Get comments for an event."""
-        return db.query(Comment).filter(
-            Comment.event_id == event_id
-        ).order_by(desc(Comment.created_at)).offset(skip).limit(limit).all()
+        query = db.query(Comment).filter(Comment.event_id == event_id)
+        return paginate(query, Comment, skip, limit, cursor)
 
 class ReviewRepository:
     @staticmethod
@@ -140,11 +140,10 @@ class ReviewRepository:
         return False
 
     @staticmethod
-    def get_by_event(db: Session, event_id: int, skip: int = 0, limit: int = 100):
+    def get_by_event(db: Session, event_id: int, skip: int = 0, limit: int = 100, cursor: Optional[CursorKey] = None):
         """Get reviews for an event."""
-        return db.query(Review).filter(
-            Review.event_id == event_id
-        ).order_by(desc(Review.created_at)).offset(skip).limit(limit).all()
+        query = db.query(Review).filter(Review.event_id == event_id)
+        return paginate(query, Review, skip, limit, cursor)
 
     @staticmethod
     def get_average_rating(db: Session, event_id: int):
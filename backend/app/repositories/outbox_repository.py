@@ -0,0 +1,198 @@
+import os
+import uuid
+from datetime import timedelta
+from sqlalchemy.orm import Session
+from sqlalchemy import func, select, update, delete, or_, and_, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from dotenv import load_dotenv
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..models import OutboxMessage
+
+# Load environment variables
+load_dotenv()
+
+# A claimed message is handed to another dispatcher if not settled within the
+# lease, the dispatcher renews it while delivery runs, see renew_leases()
+OUTBOX_LEASE_SECONDS = int(os.getenv("OUTBOX_LEASE_SECONDS", "300"))
+
+# Messages held back until the writing request finishes, delivered anyway after the hold
+OUTBOX_HOLD_SECONDS = int(os.getenv("OUTBOX_HOLD_SECONDS", "60"))
+
+# Update notifications wait this long after the last edit of an event
+OUTBOX_DEBOUNCE_SECONDS = int(os.getenv("OUTBOX_DEBOUNCE_SECONDS", "300"))
+
+PENDING = "pending"
+PROCESSING = "processing"
+SENT = "sent"
+DEAD = "dead"
+
+class OutboxRepository:
+    @staticmethod
+    def enqueue(db: Session, kind: str, payload: Dict[str, Any], idempotency_key: str, delay: float = 0) -> bool:
+        """Add a message unless one with the same key exists. Does not commit."""
+        values = {
+            "kind": kind,
+            "payload": payload,
+            "idempotency_key": idempotency_key,
+            "status": PENDING,
+            "available_at": func.now() + timedelta(seconds=delay)
+        }
+        result = db.execute(
+            insert(OutboxMessage).values(**values).on_conflict_do_nothing(index_elements=["idempotency_key"])
+        )
+        return result.rowcount > 0
+
+    @staticmethod
+    def debounce(db: Session, kind: str, payload: Dict[str, Any], key: str, delay: float = OUTBOX_DEBOUNCE_SECONDS):
+        """Add a message due after delay, or push back the undelivered one with the same key. Does not commit.
+
+        A settled message with the key is reused for the next round. While it
+        is being delivered, the change goes out in a follow-up message.
+        """
+        statement = insert(OutboxMessage).values(
+            kind=kind,
+            payload=payload,
+            idempotency_key=key,
+            status=PENDING,
+            available_at=func.now() + timedelta(seconds=delay)
+        )
+        result = db.execute(statement.on_conflict_do_update(
+            index_elements=["idempotency_key"],
+            set_={
+                "payload": statement.excluded.payload,
+                "status": PENDING,
+                "attempts": 0,
+                "available_at": statement.excluded.available_at,
+                "last_error": None,
+                "sent_at": None,
+                "created_at": func.now()
+            },
+            where=OutboxMessage.status != PROCESSING
+        ))
+        if result.rowcount == 0:
+            OutboxRepository.enqueue(db, kind, payload, f"{key}:{uuid.uuid4().hex}", delay)
+
+    @staticmethod
+    def release(db: Session, idempotency_key: str):
+        """Make a held message due now. Does not commit."""
+        db.execute(
+            update(OutboxMessage).where(
+                OutboxMessage.idempotency_key == idempotency_key,
+                OutboxMessage.status == PENDING
+            ).values(available_at=func.now())
+        )
+
+    @staticmethod
+    def claim_batch(
+        db: Session,
+        limit: int,
+        lease_seconds: int = OUTBOX_LEASE_SECONDS,
+        kind: Optional[str] = None,
+        ahead_seconds: float = 0
+    ) -> List[Dict[str, Any]]:
+        """Lease up to limit due messages, oldest first.
+
+        SKIP LOCKED lets several dispatchers claim disjoint batches. Messages
+        whose lease expired (dispatcher died mid-delivery) are claimed again.
+        With ahead_seconds, pending messages due within that time are claimed
+        early; kind restricts the claim to one kind of message.
+        """
+        due = select(OutboxMessage.id).where(
+            or_(
+                and_(
+                    OutboxMessage.status == PENDING,
+                    OutboxMessage.available_at <= func.now() + timedelta(seconds=ahead_seconds)
+                ),
+                and_(
+                    OutboxMessage.status == PROCESSING,
+                    OutboxMessage.available_at <= func.now()
+                )
+            )
+        )
+        if kind is not None:
+            due = due.where(OutboxMessage.kind == kind)
+        due = due.order_by(OutboxMessage.available_at, OutboxMessage.id).limit(limit).with_for_update(skip_locked=True)
+
+        rows = db.execute(
+            update(OutboxMessage).where(OutboxMessage.id.in_(due)).values(
+                status=PROCESSING,
+                attempts=OutboxMessage.attempts + 1,
+                available_at=func.now() + timedelta(seconds=lease_seconds)
+            ).returning(
+                OutboxMessage.id, OutboxMessage.kind, OutboxMessage.payload, OutboxMessage.idempotency_key,
+                OutboxMessage.attempts, OutboxMessage.created_at
+            )
+        ).all()
+        db.commit()
+        return [dict(row._mapping) for row in sorted(rows, key=lambda row: row.id)]
+
+    @staticmethod
+    def renew_leases(db: Session, claims: List[Tuple[int, int]], lease_seconds: int = OUTBOX_LEASE_SECONDS) -> int:
+        """Extend the lease of messages still being delivered. Returns the number renewed.
+
+        Claims are (id, attempts) pairs of claimed messages. A message claimed
+        again by another dispatcher since then has more attempts and is left alone.
+        """
+        if not claims:
+            return 0
+        result = db.execute(
+            update(OutboxMessage).where(
+                tuple_(OutboxMessage.id, OutboxMessage.attempts).in_(claims),
+                OutboxMessage.status == PROCESSING
+            ).values(available_at=func.now() + timedelta(seconds=lease_seconds))
+        )
+        db.commit()
+        return result.rowcount
+
+    @staticmethod
+    def mark_sent(db: Session, message_id: int):
+        """Settle a delivered message."""
+        db.execute(
+            update(OutboxMessage).where(OutboxMessage.id == message_id).values(
+                status=SENT, sent_at=func.now(), last_error=None
+            )
+        )
+        db.commit()
+
+    @staticmethod
+    def mark_failed(db: Session, message_id: int, error: str, retry_in: Optional[float]):
+        """Schedule a retry after retry_in seconds, or dead-letter the message when None."""
+        values = {"last_error": error}
+        if retry_in is None:
+            values["status"] = DEAD
+        else:
+            values["status"] = PENDING
+            values["available_at"] = func.now() + timedelta(seconds=retry_in)
+        db.execute(update(OutboxMessage).where(OutboxMessage.id == message_id).values(**values))
+        db.commit()
+
+    @staticmethod
+    def get_stats(db: Session) -> Dict[str, Any]:
+        """Get message counts by status and the age of the oldest undelivered message."""
+        counts = dict(db.query(OutboxMessage.status, func.count()).group_by(OutboxMessage.status).all())
+        oldest_age = db.query(
+            func.extract("epoch", func.now() - func.min(OutboxMessage.created_at))
+        ).filter(
+            OutboxMessage.status.in_([PENDING, PROCESSING])
+        ).scalar()
+        return {
+            "pending": counts.get(PENDING, 0),
+            "processing": counts.get(PROCESSING, 0),
+            "sent": counts.get(SENT, 0),
+            "dead": counts.get(DEAD, 0),
+            "oldest_pending_seconds": round(float(oldest_age), 1) if oldest_age is not None else None
+        }
+
+    @staticmethod
+    def purge_sent(db: Session, older_than_days: int) -> int:
+        """Delete delivered messages older than the given number of days."""
+        result = db.execute(
+            delete(OutboxMessage).where(
+                OutboxMessage.status == SENT,
+                OutboxMessage.sent_at < func.now() - timedelta(days=older_than_days)
+            )
+        )
+        db.commit()
+        return result.rowcount
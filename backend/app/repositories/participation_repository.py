@@ -1,8 +1,11 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import List, Optional
+from sqlalchemy import func, select, literal, bindparam, any_, union_all, Integer
+from sqlalchemy.dialects.postgresql import insert, ARRAY
+from typing import Iterable, List, Optional, Tuple
 
 from ..models import EventParticipant, Invitation, User, Subscription, Event
+from ..utils.pagination import CursorKey, paginate
+from .outbox_repository import OutboxRepository
 
 class ParticipationRepository:
     @staticmethod
@@ -23,6 +26,11 @@ class ParticipationRepository:
             user_id=user_id
         )
         db.add(db_participant)
+        
+        # Count the participant in the same transaction
+        db.query(Event).filter(Event.id == event_id).update(
+            {Event.participants_count: Event.participants_count + 1}, synchronize_session=False
+        )
         db.commit()
         db.refresh(db_participant)
         return db_participant
@@ -37,16 +45,18 @@ class ParticipationRepository:
         
         if db_participant:
             db.delete(db_participant)
+            db.query(Event).filter(Event.id == event_id).update(
+                {Event.participants_count: Event.participants_count - 1}, synchronize_session=False
+            )
             db.commit()
             return True
         return False
 
     @staticmethod
-    def get_event_participants(db: Session, event_id: int, skip: int = 0, limit: int = 100):
+    def get_event_participants(db: Session, event_id: int, skip: int = 0, limit: int = 100, cursor: Optional[CursorKey] = None):
         """Get all participants for an event."""
-        return db.query(EventParticipant).filter(
-            EventParticipant.event_id == event_id
-        ).offset(skip).limit(limit).all()
+        query = db.query(EventParticipant).filter(EventParticipant.event_id == event_id)
+        return paginate(query, EventParticipant, skip, limit, cursor)
 
     @staticmethod
     def get_user_participations(db: Session, user_id: int, skip: int = 0, limit: int = 100):
@@ -55,6 +65,24 @@ class ParticipationRepository:
             EventParticipant.user_id == user_id
         ).offset(skip).limit(limit).all()
 
+    @staticmethod
+    def get_reminder_recipients(db: Session, event_id: int) -> List[Tuple[Event, User]]:
+        """Get (event, participant) pairs of an event.
+
+        Only participants with a linked, reachable Telegram chat are returned.
+        Rows are loaded at once, so that no cursor stays open while the caller
+        sends the reminders.
+        """
+        return db.query(Event, User).join(
+            EventParticipant, EventParticipant.event_id == Event.id
+        ).join(
+            User, User.id == EventParticipant.user_id
+        ).filter(
+            Event.id == event_id,
+            User.telegram_chat_id.isnot(None),
+            User.telegram_unreachable_at.is_(None)
+        ).order_by(User.id).all()
+
 class InvitationRepository:
     @staticmethod
     def create_invitation(db: Session, event_id: int, user_id: int):
@@ -74,6 +102,13 @@ class InvitationRepository:
             user_id=user_id
         )
         db.add(db_invitation)
+        db.flush()
+        
+        # Notify the invitee in the same transaction
+        OutboxRepository.enqueue(
+            db, "invitation", {"event_id": event_id, "user_id": user_id},
+            f"invitation:{db_invitation.id}"
+        )
         db.commit()
         db.refresh(db_invitation)
         return db_invitation
@@ -94,11 +129,10 @@ class InvitationRepository:
         return db.query(Invitation).filter(Invitation.id == invitation_id).first()
 
     @staticmethod
-    def get_event_invitations(db: Session, event_id: int, skip: int = 0, limit: int = 100):
+    def get_event_invitations(db: Session, event_id: int, skip: int = 0, limit: int = 100, cursor: Optional[CursorKey] = None):
         """Get all invitations for an event."""
-        return db.query(Invitation).filter(
-            Invitation.event_id == event_id
-        ).offset(skip).limit(limit).all()
+        query = db.query(Invitation).filter(Invitation.event_id == event_id)
+        return paginate(query, Invitation, skip, limit, cursor)
 
     @staticmethod
     def get_user_invitations(db: Session, user_id: int, skip: int = 0, limit: int = 100):
@@ -108,17 +142,59 @@ class InvitationRepository:
         ).offset(skip).limit(limit).all()
 
     @staticmethod
-    def create_invitations_for_followers(db: Session, event_id: int, creator_id: int):
-        """Create invitations for all followers of the event creator."""
-        # Get all followers of the creator
-        followers = db.query(Subscription).filter(
-            Subscription.followed_id == creator_id
-        ).all()
+    def get_new_event_audience(db: Session, event_id: int, creator_id: int) -> List[Tuple[User, bool]]:
+        """Get users to tell about a new event: invitees and followers of the creator.
+
+        Returns (user, invited) pairs, each user once. Users without a linked,
+        reachable Telegram chat are left out.
+        """
+        invitees = select(
+            Invitation.user_id.label("user_id"), literal(True).label("invited")
+        ).where(Invitation.event_id == event_id)
+        followers = select(
+            Subscription.follower_id.label("user_id"), literal(False).label("invited")
+        ).where(Subscription.followed_id == creator_id)
+        audience = union_all(invitees, followers).subquery()
         
-        # Create invitations for each follower
-        invitations = []
-        for follower in followers:
-            invitation = InvitationRepository.create_invitation(db, event_id, follower.follower_id)
-            invitations.append(invitation)
+        return db.query(User, func.bool_or(audience.c.invited)).join(
+            audience, audience.c.user_id == User.id
+        ).filter(
+            User.telegram_chat_id.isnot(None),
+            User.telegram_unreachable_at.is_(None)
+        ).group_by(User.id).order_by(User.id).all()
+
+    @staticmethod
+    def _insert_invitations(db: Session, rows) -> List[Invitation]:
+        """Insert (event_id, user_id) rows in one INSERT ... SELECT ... ON CONFLICT DO NOTHING.
+
+        Returns only the invitations that were created.
+        """
+        statement = insert(Invitation).from_select(
+            ["event_id", "user_id"], rows
+        ).on_conflict_do_nothing(
+            constraint="uq_invitations_event_user"
+        ).returning(Invitation)
+        invitations = db.scalars(statement).all()
+        db.commit()
+        return invitations
+
+    @staticmethod
+    def create_invitations(db: Session, event_id: int, user_ids: Iterable[int]) -> List[Invitation]:
+        """Create invitations for many users at once, skipping unknown and already invited users."""
+        user_ids = list(set(user_ids))
+        if not user_ids:
+            return []
         
-        return invitations 
\ No newline at end of file
+        # One array parameter instead of one parameter per user
+        rows = select(literal(event_id), User.id).where(
+            User.id == any_(bindparam("user_ids", user_ids, type_=ARRAY(Integer)))
+        )
+        return InvitationRepository._insert_invitations(db, rows)
+
+    @staticmethod
+    def create_invitations_for_followers(db: Session, event_id: int, creator_id: int) -> List[Invitation]:
+        """Create invitations for all followers of the event creator."""
+        rows = select(literal(event_id), Subscription.follower_id).where(
+            Subscription.followed_id == creator_id
+        )
+        return InvitationRepository._insert_invitations(db, rows) 
\ No newline at end of file
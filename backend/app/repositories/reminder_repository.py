@@ -0,0 +1,107 @@
+import os
+import logging
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+from sqlalchemy import func, select, update, delete, case
+from sqlalchemy.dialects.postgresql import insert
+from dotenv import load_dotenv
+
+from typing import Optional
+
+from ..models import Reminder
+from .outbox_repository import OutboxRepository
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Reminders are due this many hours before an event starts
+REMINDER_OFFSETS_HOURS = [int(hours) for hours in os.getenv("REMINDER_OFFSETS_HOURS", "24,1").split(",") if hours.strip()]
+
+class ReminderRepository:
+    @staticmethod
+    def schedule(db: Session, event_id: int, event_date: datetime):
+        """Create the reminders of an event or move them to its new date. Does not commit.
+
+        Reminders whose due time has already passed are not created, and an
+        unsent one of those is dropped when the event moves closer.
+        """
+        now = datetime.now()
+        # event_date is stored without time zone, in local time
+        if event_date.tzinfo is not None:
+            event_date = event_date.astimezone().replace(tzinfo=None)
+        due = {hours: event_date - timedelta(hours=hours) for hours in REMINDER_OFFSETS_HOURS}
+        
+        upcoming = [
+            {"event_id": event_id, "hours_before": hours, "due_at": due_at}
+            for hours, due_at in due.items() if due_at > now
+        ]
+        if upcoming:
+            statement = insert(Reminder).values(upcoming)
+            db.execute(statement.on_conflict_do_update(
+                constraint="uq_reminders_event_hours",
+                set_={
+                    "due_at": statement.excluded.due_at,
+                    # A moved reminder goes out again for the new date
+                    "sent_at": case((Reminder.due_at == statement.excluded.due_at, Reminder.sent_at), else_=None)
+                }
+            ))
+        
+        passed = [hours for hours, due_at in due.items() if due_at <= now]
+        if passed:
+            db.execute(
+                delete(Reminder).where(
+                    Reminder.event_id == event_id,
+                    Reminder.hours_before.in_(passed),
+                    Reminder.sent_at.is_(None)
+                )
+            )
+
+    @staticmethod
+    def dispatch_due(db: Session, limit: int) -> int:
+        """Hand up to limit due reminders to the outbox. Returns the number of reminders taken.
+
+        The ledger entry and the outbox message are written in one transaction
+        and SKIP LOCKED keeps concurrent schedulers apart, so every reminder is
+        handed over once. Reminders of events that already started are only
+        marked as sent.
+        """
+        now = datetime.now()
+        due = select(Reminder.id).where(
+            Reminder.sent_at.is_(None),
+            Reminder.due_at <= now
+        ).order_by(Reminder.due_at).limit(limit).with_for_update(skip_locked=True)
+        
+        rows = db.execute(
+            update(Reminder).where(Reminder.id.in_(due)).values(sent_at=func.now()).returning(
+                Reminder.event_id, Reminder.hours_before, Reminder.due_at
+            )
+        ).all()
+        
+        for row in rows:
+            if row.due_at + timedelta(hours=row.hours_before) <= now:
+                logger.warning(f"Skipping {row.hours_before} h reminder for event {row.event_id}, the event has started")
+                continue
+            OutboxRepository.enqueue(
+                db, "reminder", {"event_id": row.event_id, "hours_before": row.hours_before},
+                f"reminder:{row.event_id}:{row.hours_before}:{row.due_at.isoformat()}"
+            )
+        db.commit()
+        return len(rows)
+
+    @staticmethod
+    def next_due_at(db: Session) -> Optional[datetime]:
+        """Get the due time of the next unsent reminder."""
+        return db.query(func.min(Reminder.due_at)).filter(Reminder.sent_at.is_(None)).scalar()
+
+    @staticmethod
+    def purge_sent(db: Session, older_than_days: int) -> int:
+        """Delete ledger entries of reminders sent more than the given number of days ago."""
+        result = db.execute(
+            delete(Reminder).where(
+                Reminder.sent_at < func.now() - timedelta(days=older_than_days)
+            )
+        )
+        db.commit()
+        return result.rowcount
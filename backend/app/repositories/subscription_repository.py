@@ -1,8 +1,9 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import List, Optional
+from sqlalchemy.orm import Session, aliased
+from typing import Iterable, List, Optional, Tuple
 
-from ..models import Subscription, User
+from ..models import Subscription, User, Event
+from ..utils.pagination import CursorKey, paginate
+from .feed_repository import FeedRepository
 
 class SubscriptionRepository:
     @staticmethod
@@ -27,10 +28,28 @@ class SubscriptionRepository:
             followed_id=followed_id
         )
         db.add(db_subscription)
+        
+        # Count the subscription on both users in the same transaction
+        SubscriptionRepository._update_counters(db, follower_id, followed_id, 1)
+        FeedRepository.add_creator_events(db, follower_id, followed_id)
         db.commit()
         db.refresh(db_subscription)
         return db_subscription
 
+    @staticmethod
+    def _update_counters(db: Session, follower_id: int, followed_id: int, delta: int):
+        """Shift following/followers counts of both users by delta.
+
+        Rows are updated in id order, so that A following B while B follows A
+        lock them in the same order instead of deadlocking.
+        """
+        counters = {follower_id: User.following_count, followed_id: User.followers_count}
+        for user_id in sorted(counters):
+            column = counters[user_id]
+            db.query(User).filter(User.id == user_id).update(
+                {column: column + delta}, synchronize_session=False
+            )
+
     @staticmethod
     def unfollow_user(db: Session, follower_id: int, followed_id: int):
         """Delete a subscription (unfollow a user)."""
@@ -41,25 +60,23 @@ class SubscriptionRepository:
         
         if db_subscription:
             db.delete(db_subscription)
+            SubscriptionRepository._update_counters(db, follower_id, followed_id, -1)
+            FeedRepository.remove_creator_events(db, follower_id, followed_id)
             db.commit()
             return True
         return False
 
     @staticmethod
-    def get_followers(db: Session, user_id: int, skip: int = 0, limit: int = 100):
+    def get_followers(db: Session, user_id: int, skip: int = 0, limit: int = 100, cursor: Optional[CursorKey] = None):
         """Get all followers of a user."""
-        followers = db.query(Subscription).filter(
-            Subscription.followed_id == user_id
-        ).offset(skip).limit(limit).all()
-        return followers
+        query = db.query(Subscription).filter(Subscription.followed_id == user_id)
+        return paginate(query, Subscription, skip, limit, cursor)
 
     @staticmethod
-    def get_following(db: Session, user_id: int, skip: int = 0, limit: int = 100):
+    def get_following(db: Session, user_id: int, skip: int = 0, limit: int = 100, cursor: Optional[CursorKey] = None):
         """Get all users a user is following."""
-        following = db.query(Subscription).filter(
-            Subscription.follower_id == user_id
-        ).offset(skip).limit(limit).all()
-        return following
+        query = db.query(Subscription).filter(Subscription.follower_id == user_id)
+        return paginate(query, Subscription, skip, limit, cursor)
 
     @staticmethod
     def is_following(db: Session, follower_id: int, followed_id: int):
@@ -73,13 +90,29 @@ class SubscriptionRepository:
     @staticmethod
     def get_followers_count(db: Session, user_id: int):
         """Get the number of followers of a user."""
-        return db.query(func.count(Subscription.id)).filter(
-            Subscription.followed_id == user_id
-        ).scalar()
+        return db.query(User.followers_count).filter(User.id == user_id).scalar() or 0
 
     @staticmethod
     def get_following_count(db: Session, user_id: int):
         """Get the number of users a user is following."""
-        return db.query(func.count(Subscription.id)).filter(
-            Subscription.follower_id == user_id
-        ).scalar() 
\ No newline at end of file
+        return db.query(User.following_count).filter(User.id == user_id).scalar() or 0 
+
+    @staticmethod
+    def get_event_followers(db: Session, event_ids: Iterable[int]) -> List[Tuple[User, Event, User]]:
+        """Get (follower, event, creator) rows for followers of the creators of the given events.
+
+        Followers without a linked, reachable Telegram chat are left out. Rows
+        come ordered by follower, then by event date.
+        """
+        creator = aliased(User)
+        return db.query(User, Event, creator).join(
+            Subscription, Subscription.follower_id == User.id
+        ).join(
+            Event, Event.creator_id == Subscription.followed_id
+        ).join(
+            creator, creator.id == Event.creator_id
+        ).filter(
+            Event.id.in_(list(event_ids)),
+            User.telegram_chat_id.isnot(None),
+            User.telegram_unreachable_at.is_(None)
+        ).order_by(User.id, Event.event_date, Event.id).all()
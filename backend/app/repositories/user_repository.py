@@ -1,8 +1,10 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select, update, or_
+from typing import Dict, Optional
 from ..models import User, Event, Subscription
 from ..schemas import UserCreate, UserUpdate
 from ..utils.security import get_password_hash
+from ..utils.pagination import CursorKey, paginate
 
 class UserRepository:
     @staticmethod
@@ -36,6 +38,11 @@ class UserRepository:
         """Get user by phone."""
         return db.query(User).filter(User.phone == phone).first()
 
+    @staticmethod
+    def get_by_telegram_chat_id(db: Session, chat_id: str):
+        """Get user by linked Telegram chat ID."""
+        return db.query(User).filter(User.telegram_chat_id == chat_id).first()
+
     @staticmethod
     def update(db: Session, user_id: int, user_data: UserUpdate):
         """Update user."""
@@ -57,27 +64,68 @@ class UserRepository:
         db.refresh(db_user)
         return db_user
 
+    @staticmethod
+    def link_telegram(db: Session, user: User, chat_id: str):
+        """Link a Telegram chat to the user, making it reachable again."""
+        user.telegram_chat_id = chat_id
+        user.telegram_unreachable_at = None
+        user.telegram_unreachable_reason = None
+        db.commit()
+
+    @staticmethod
+    def mark_telegram_unreachable(db: Session, chats: Dict[str, str]) -> int:
+        """Flag users whose chats refused delivery, given reasons by chat id."""
+        marked = 0
+        for reason in set(chats.values()):
+            chat_ids = [chat_id for chat_id, chat_reason in chats.items() if chat_reason == reason]
+            result = db.execute(
+                update(User).where(
+                    User.telegram_chat_id.in_(chat_ids),
+                    User.telegram_unreachable_at.is_(None)
+                ).values(
+                    telegram_unreachable_at=func.now(),
+                    telegram_unreachable_reason=reason
+                )
+            )
+            marked += result.rowcount
+        db.commit()
+        return marked
+
     @staticmethod
     def get_all(db: Session, skip: int = 0, limit: int = 100):
         """Get all users."""
         return db.query(User).offset(skip).limit(limit).all()
 
     @staticmethod
-    def search(db: Session, query: str, skip: int = 0, limit: int = 100):
-        """Search users by username or phone."""
+    def search(
+        db: Session,
+        query: str,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[CursorKey] = None,
+        ranked: bool = True
+    ):
+        """Search users by username, phone, or full name."""
+        # Substring matches are served by the pg_trgm GIN indexes
         search_query = f"%{query}%"
-        return db.query(User).filter(
+        base_query = db.query(User).filter(
             (User.username.ilike(search_query)) | 
             (User.phone.ilike(search_query)) |
             (User.full_name.ilike(search_query))
-        ).offset(skip).limit(limit).all()
+        )
+        rank = func.greatest(
+            func.similarity(User.username, query),
+            func.similarity(User.full_name, query)
+        )
+        return paginate(base_query, User, skip, limit, cursor, rank if ranked else None)
 
     @staticmethod
     def get_user_stats(db: Session, user_id: int):
         """Get user statistics: event count, follower count, following count."""
-        events_count = db.query(func.count(Event.id)).filter(Event.creator_id == user_id).scalar()
-        followers_count = db.query(func.count(Subscription.id)).filter(Subscription.followed_id == user_id).scalar()
-        following_count = db.query(func.count(Subscription.id)).filter(Subscription.follower_id == user_id).scalar()
+        row = db.query(User.events_count, User.followers_count, User.following_count).filter(
+            User.id == user_id
+        ).first()
+        events_count, followers_count, following_count = row if row else (0, 0, 0)
         
         return {
             "events_count": events_count,
@@ -93,4 +141,33 @@ class UserRepository:
             db.delete(db_user)
             db.commit()
             return True
-        return False 
\ No newline at end of file
+        return False
+
+    @staticmethod
+    def reconcile_counters(db: Session) -> int:
+        """Repair drifted events/followers/following counts, return the number of fixed users."""
+        events_count = select(func.count(Event.id)).where(
+            Event.creator_id == User.id
+        ).scalar_subquery()
+        followers_count = select(func.count(Subscription.id)).where(
+            Subscription.followed_id == User.id
+        ).scalar_subquery()
+        following_count = select(func.count(Subscription.id)).where(
+            Subscription.follower_id == User.id
+        ).scalar_subquery()
+        result = db.execute(
+            update(User)
+            .where(or_(
+                User.events_count != events_count,
+                User.followers_count != followers_count,
+                User.following_count != following_count
+            ))
+            .values(
+                events_count=events_count,
+                followers_count=followers_count,
+                following_count=following_count
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return result.rowcount
\ No newline at end of file
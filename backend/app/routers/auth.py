@@ -1,8 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..config.database import get_db
+from ..config.database import get_async_db
 from ..services import AuthService
 from ..schemas import UserCreate, UserDisplay, Token
 
@@ -13,12 +13,12 @@ router = APIRouter(
 )
 
 @router.post("/register", response_model=UserDisplay, status_code=status.HTTP_201_CREATED)
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """Register a new user."""
-    return AuthService.register(db, user_data)
+    return await db.run_sync(AuthService.register, user_data)
 
 @router.post("/login", response_model=Token)
-async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
     """Login and get access token."""
     # Convert form data to UserLogin model
     from ..schemas import UserLogin
@@ -28,4 +28,4 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session =
     )
     
     # Login user
-    return AuthService.login(db, user_login) 
\ No newline at end of file
+    return await db.run_sync(AuthService.login, user_login) 
\ No newline at end of file
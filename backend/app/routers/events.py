@@ -1,6 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query, BackgroundTasks
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Union
 from datetime import datetime
 import json
 import logging
@@ -8,16 +8,17 @@ import logging
 # Configure logger
 logger = logging.getLogger(__name__)
 
-from ..config.database import get_db
+from ..config.database import get_async_db
 from ..utils.security import get_current_active_user, get_current_user
+from ..utils.pagination import decode_cursor, page_response
 from ..services import EventService, ParticipationService, InvitationService, CommentService, ReviewService
 from ..schemas import (
-    EventCreate, EventUpdate, EventDisplay, EventDetail, 
-    CommentCreate, CommentUpdate, CommentDisplay,
-    ReviewCreate, ReviewUpdate, ReviewDisplay, ReviewsResponse, ParticipantDisplay, InvitationDisplay
+    EventCreate, EventUpdate, EventDisplay, EventDetail, EventPage,
+    CommentCreate, CommentUpdate, CommentDisplay, CommentPage,
+    ReviewCreate, ReviewUpdate, ReviewDisplay, ReviewsResponse,
+    ParticipantDisplay, ParticipantPage, InvitationDisplay, InvitationPage
 )
 from ..models import User
-from ..controllers.telegram_controller import TelegramController
 
 router = APIRouter(
     prefix="/api/events",
@@ -42,7 +43,6 @@ def parse_json_field(field: str, default=None):
 
 @router.post("", response_model=EventDisplay, status_code=status.HTTP_201_CREATED)
 async def create_event(
-    background_tasks: BackgroundTasks,
     title: str = Form(...),
     event_date: datetime = Form(...),
     location: str = Form(...),
@@ -50,7 +50,7 @@ async def create_event(
     invited_users: str = Form(None),  # JSON string of user IDs
     images: List[UploadFile] = File(None),
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new event."""
     # Parse invited users
@@ -65,78 +65,77 @@ async def create_event(
         invited_users=invited_users_list
     )
     
-    # Create event
+    # Create event, invitations and follower notifications go out through the outbox
     event = await EventService.create_event(db, event_data, images, current_user)
     
-    # Send invitations in the background
-    logger.info(f"Sending bulk invitations for event {event['id']} to {BASE_URL}")
-    background_tasks.add_task(
-        TelegramController.send_bulk_invitations,
-        event['id'],
-        BASE_URL
-    )
-    
-    # Notify followers about the new event
-    background_tasks.add_task(
-        TelegramController.notify_followers_about_event,
-        current_user.id,
-        event['id'],
-        BASE_URL
-    )
-    
     return event
 
-@router.get("", response_model=List[EventDisplay])
+@router.get("", response_model=Union[List[EventDisplay], EventPage])
 async def get_events(
     skip: int = 0,
     limit: int = 10,
     upcoming_only: bool = False,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get all events."""
-    from ..repositories import EventRepository
-    return EventRepository.get_all(db, skip, limit, upcoming_only)
+    """Get all events.
+    
+    Pass `cursor` (empty for the first page) to get an items/next_cursor page
+    instead of a plain list.
+    """
+    from ..repositories import AsyncEventRepository
+    events = await AsyncEventRepository.get_all(db, skip, limit, upcoming_only, decode_cursor(cursor))
+    return page_response(events, limit, cursor)
 
-@router.get("/feed", response_model=List[EventDisplay])
+@router.get("/feed", response_model=Union[List[EventDisplay], EventPage])
 async def get_event_feed(
     skip: int = 0,
     limit: int = 10,
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get event feed for current user."""
-    return EventService.get_user_feed(db, current_user.id, skip, limit)
+    events = await EventService.get_user_feed(db, current_user.id, skip, limit, decode_cursor(cursor))
+    return page_response(events, limit, cursor)
 
-@router.get("/search", response_model=List[EventDisplay])
+@router.get("/search", response_model=Union[List[EventDisplay], EventPage])
 async def search_events(
     query: str = Query(..., min_length=3),
     upcoming_only: bool = False,
     skip: int = 0,
     limit: int = 10,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Search events by title, location, or description."""
-    return EventService.search_events(db, query, upcoming_only, skip, limit)
+    # Offset results are ranked by relevance, cursor pages keep newest-first order
+    events = await db.run_sync(
+        EventService.search_events, query, upcoming_only, skip, limit, decode_cursor(cursor), cursor is None
+    )
+    return page_response(events, limit, cursor)
 
-@router.get("/users/{user_id}", response_model=List[EventDisplay])
+@router.get("/users/{user_id}", response_model=Union[List[EventDisplay], EventPage])
 async def get_user_events(
     user_id: int,
     skip: int = 0,
     limit: int = 10,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get events created by a specific user."""
-    return EventService.get_user_events(db, user_id, skip, limit)
+    events = await db.run_sync(EventService.get_user_events, user_id, skip, limit, decode_cursor(cursor))
+    return page_response(events, limit, cursor)
 
 @router.get("/{event_id}", response_model=EventDetail)
 async def get_event(
     event_id: int,
     current_user: Optional[User] = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get event by ID."""
     try:
-        return EventService.get_event_by_id(db, event_id, current_user)
+        return await EventService.get_event_by_id(db, event_id, current_user)
     except HTTPException as e:
         # Pass through HTTP exceptions
         raise e
@@ -151,7 +150,6 @@ async def get_event(
 @router.put("/{event_id}", response_model=EventDisplay)
 async def update_event(
     event_id: int,
-    background_tasks: BackgroundTasks,
     title: Optional[str] = Form(None),
     event_date: Optional[datetime] = Form(None),
     location: Optional[str] = Form(None),
@@ -160,7 +158,7 @@ async def update_event(
     invited_users: Optional[str] = Form(None),
     images: List[UploadFile] = File(None),
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update an event."""
     # Parse existing images and invited users
@@ -177,7 +175,7 @@ async def update_event(
         invitees=invited_users_list
     )
     
-    # Update event
+    # Update event, followers are notified through the outbox
     event = await EventService.update_event(db, event_id, event_data, current_user)
     
     # Add new images if provided
@@ -186,24 +184,15 @@ async def update_event(
             if image.content_type.startswith('image/'):
                 await EventService.add_event_image(db, event_id, image, current_user)
     
-    # Notify followers about the updated event
-    background_tasks.add_task(
-        TelegramController.notify_followers_about_event,
-        current_user.id,
-        event_id,
-        BASE_URL,
-        is_update=True
-    )
-    
     # Get the updated event
-    return EventService.get_event_by_id(db, event_id, current_user)
+    return await EventService.get_event_by_id(db, event_id, current_user)
 
 @router.post("/{event_id}/images", response_model=EventDetail)
 async def upload_event_image(
     event_id: int,
     image: UploadFile = File(...),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Upload image for an event."""
     try:
@@ -230,7 +219,7 @@ async def delete_event_image(
     event_id: int,
     image_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete an event image."""
     return await EventService.delete_event_image(db, image_id, current_user)
@@ -239,7 +228,7 @@ async def delete_event_image(
 async def delete_event(
     event_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete an event."""
     return await EventService.delete_event(db, event_id, current_user)
@@ -249,50 +238,45 @@ async def delete_event(
 async def join_event(
     event_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Join an event."""
-    return ParticipationService.join_event(db, event_id, current_user)
+    return await ParticipationService.join_event(db, event_id, current_user)
 
 @router.delete("/{event_id}/leave", status_code=status.HTTP_200_OK)
 async def leave_event(
     event_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Leave an event."""
-    return ParticipationService.leave_event(db, event_id, current_user)
+    return await ParticipationService.leave_event(db, event_id, current_user)
 
-@router.get("/{event_id}/participants", response_model=List[ParticipantDisplay])
+@router.get("/{event_id}/participants", response_model=Union[List[ParticipantDisplay], ParticipantPage])
 async def get_event_participants(
     event_id: int,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all participants for an event."""
-    return ParticipationService.get_event_participants(db, event_id, skip, limit)
+    participants = await db.run_sync(
+        ParticipationService.get_event_participants, event_id, skip, limit, decode_cursor(cursor)
+    )
+    return page_response(participants, limit, cursor)
 
 # Invitation routes
 @router.post("/{event_id}/invite/{user_id}", response_model=InvitationDisplay)
 async def invite_user(
     event_id: int,
     user_id: int,
-    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Invite a user to an event."""
-    invitation = InvitationService.create_invitation(db, event_id, user_id, current_user)
-    
-    # Send invitation in the background
-    background_tasks.add_task(
-        TelegramController.send_event_invitation,
-        user_id,
-        event_id,
-        BASE_URL
-    )
-    
+    # The invitation notification goes out through the outbox
+    invitation = await db.run_sync(InvitationService.create_invitation, event_id, user_id, current_user)
     return invitation
 
 @router.delete("/{event_id}/invitations/{invitation_id}", status_code=status.HTTP_200_OK)
@@ -300,21 +284,25 @@ async def delete_invitation(
     event_id: int,
     invitation_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete an invitation."""
-    return InvitationService.delete_invitation(db, invitation_id, current_user)
+    return await db.run_sync(InvitationService.delete_invitation, invitation_id, current_user)
 
-@router.get("/{event_id}/invitations", response_model=List[InvitationDisplay])
+@router.get("/{event_id}/invitations", response_model=Union[List[InvitationDisplay], InvitationPage])
 async def get_event_invitations(
     event_id: int,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all invitations for an event."""
-    return InvitationService.get_event_invitations(db, event_id, current_user, skip, limit)
+    invitations = await db.run_sync(
+        InvitationService.get_event_invitations, event_id, current_user, skip, limit, decode_cursor(cursor)
+    )
+    return page_response(invitations, limit, cursor)
 
 # Comment routes
 @router.post("/{event_id}/comments", response_model=CommentDisplay)
@@ -322,39 +310,41 @@ async def create_comment(
     event_id: int,
     comment_data: CommentCreate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new comment."""
-    return CommentService.create_comment(db, comment_data, event_id, current_user)
+    return await db.run_sync(CommentService.create_comment, comment_data, event_id, current_user)
 
 @router.put("/comments/{comment_id}", response_model=CommentDisplay)
 async def update_comment(
     comment_id: int,
     comment_data: CommentUpdate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a comment."""
-    return CommentService.update_comment(db, comment_id, comment_data, current_user)
+    return await db.run_sync(CommentService.update_comment, comment_id, comment_data, current_user)
 
 @router.delete("/comments/{comment_id}", status_code=status.HTTP_200_OK)
 async def delete_comment(
     comment_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a comment."""
-    return CommentService.delete_comment(db, comment_id, current_user)
+    return await db.run_sync(CommentService.delete_comment, comment_id, current_user)
 
-@router.get("/{event_id}/comments", response_model=List[CommentDisplay])
+@router.get("/{event_id}/comments", response_model=Union[List[CommentDisplay], CommentPage])
 async def get_event_comments(
     event_id: int,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all comments for an event."""
-    return CommentService.get_event_comments(db, event_id, skip, limit)
+    comments = await db.run_sync(CommentService.get_event_comments, event_id, skip, limit, decode_cursor(cursor))
+    return page_response(comments, limit, cursor)
 
 # Review routes
 @router.post("/{event_id}/reviews", response_model=ReviewDisplay)
@@ -362,36 +352,37 @@ async def create_review(
     event_id: int,
     review_data: ReviewCreate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new review."""
-    return ReviewService.create_review(db, event_id, review_data, current_user)
+    return await db.run_sync(ReviewService.create_review, event_id, review_data, current_user)
 
 @router.put("/reviews/{review_id}", response_model=ReviewDisplay)
 async def update_review(
     review_id: int,
     review_data: ReviewUpdate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a review."""
-    return ReviewService.update_review(db, review_id, review_data, current_user)
+    return await db.run_sync(ReviewService.update_review, review_id, review_data, current_user)
 
 @router.delete("/reviews/{review_id}", status_code=status.HTTP_200_OK)
 async def delete_review(
     review_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a review."""
-    return ReviewService.delete_review(db, review_id, current_user)
+    return await db.run_sync(ReviewService.delete_review, review_id, current_user)
 
 @router.get("/{event_id}/reviews", response_model=ReviewsResponse)
 async def get_event_reviews(
     event_id: int,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all reviews for an event."""
-    return ReviewService.get_event_reviews(db, event_id, skip, limit) 
\ No newline at end of file
+    return await db.run_sync(ReviewService.get_event_reviews, event_id, skip, limit, decode_cursor(cursor)) 
\ No newline at end of file
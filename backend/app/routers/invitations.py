@@ -1,8 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from ..config.database import get_db
+from ..config.database import get_async_db
 from ..utils.security import get_current_active_user
 from ..services import InvitationService
 from ..schemas import InvitationDisplay
@@ -19,7 +19,7 @@ async def get_user_invitations(
     skip: int = 0,
     limit: int = 10,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all invitations for the current user."""
-    return InvitationService.get_user_invitations(db, current_user, skip, limit) 
\ No newline at end of file
+    return await db.run_sync(InvitationService.get_user_invitations, current_user, skip, limit) 
\ No newline at end of file
@@ -1,8 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from ..config.database import get_db
+from ..config.database import get_async_db
 from ..utils.security import get_current_active_user
 from ..services import ParticipationService
 from ..schemas import ParticipantDisplay
@@ -19,7 +19,7 @@ async def get_user_participations(
     skip: int = 0,
     limit: int = 10,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all events the current user is participating in."""
-    return ParticipationService.get_user_participations(db, current_user.id, skip, limit) 
\ No newline at end of file
+    return await db.run_sync(ParticipationService.get_user_participations, current_user.id, skip, limit) 
\ No newline at end of file
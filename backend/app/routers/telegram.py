@@ -1,11 +1,12 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, HTTPException, status
 from sqlalchemy.orm import Session
 import os
+from typing import Optional
 from app.services.telegram_deeplink_service import TelegramLinkService
 from app.config.database import get_db
 from app.models import User
 from app.utils.security import get_current_active_user
-from app.controllers.telegram_controller import bot
+from app.controllers.telegram_controller import bot, WEBHOOK_MODE, check_webhook_secret, feed_webhook_update
 
 router = APIRouter(prefix="/api/telegram", tags=["telegram"])
 
@@ -30,4 +31,17 @@ def create_telegram_link_token(
         if not bot_username:
             bot_username = "psu_vkr_events_bot"
     link = f"https://t.me/{bot_username}?start={token}"
-    return {"deep_link": link} 
\ No newline at end of file
+    return {"deep_link": link}
+
+@router.post("/webhook", include_in_schema=False)
+async def telegram_webhook(
+    update: dict,
+    secret_token: Optional[str] = Header(None, alias="X-Telegram-Bot-Api-Secret-Token")
+):
+    """Receive an update from Telegram in webhook mode."""
+    if not bot or not WEBHOOK_MODE:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Webhook mode is disabled")
+    if not check_webhook_secret(secret_token):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid secret token")
+    await feed_webhook_update(update)
+    return {"ok": True} 
\ No newline at end of file
@@ -1,11 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Union
 
-from ..config.database import get_db
+from ..config.database import get_async_db
 from ..utils.security import get_current_active_user
+from ..utils.pagination import decode_cursor, page_response
 from ..services import UserService, SubscriptionService
-from ..schemas import UserDisplay, UserDetail, UserUpdate, SubscriptionDisplay
+from ..schemas import UserDisplay, UserDetail, UserUpdate, UserPage, SubscriptionDisplay, SubscriptionPage
 from ..models import User
 
 router = APIRouter(
@@ -17,29 +18,34 @@ router = APIRouter(
 @router.get("/me", response_model=UserDetail)
 async def get_current_user_profile(
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get current user profile."""
-    user = UserService.get_user_by_id(db, current_user.id)
+    user = await UserService.get_user_by_id(db, current_user.id)
     return user
 
-@router.get("/search", response_model=List[UserDisplay])
+@router.get("/search", response_model=Union[List[UserDisplay], UserPage])
 async def search_users(
     query: str = Query(..., min_length=3),
     skip: int = 0,
     limit: int = 10,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Search users by username, phone, or full name."""
-    return UserService.search_users(db, query, skip, limit)
+    # Offset results are ranked by relevance, cursor pages keep newest-first order
+    users = await db.run_sync(
+        UserService.search_users, query, skip, limit, decode_cursor(cursor), cursor is None
+    )
+    return page_response(users, limit, cursor)
 
 @router.get("/{user_id}", response_model=UserDetail)
 async def get_user_profile(
     user_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get user profile by ID."""
-    return UserService.get_user_by_id(db, user_id)
+    return await UserService.get_user_by_id(db, user_id)
 
 @router.put("/me", response_model=UserDisplay)
 async def update_profile(
@@ -47,7 +53,7 @@ async def update_profile(
     full_name: str = Form(None),
     phone: str = Form(None),
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update current user profile."""
     # Create user data schema from form fields
@@ -62,7 +68,7 @@ async def update_profile(
 async def update_profile_picture(
     profile_picture: UploadFile = File(...),
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update current user profile picture."""
     return await UserService.update_profile_picture(db, current_user.id, profile_picture, current_user)
@@ -72,45 +78,49 @@ async def update_profile_picture(
 async def follow_user(
     user_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Follow a user."""
-    return SubscriptionService.follow_user(db, user_id, current_user)
+    return await SubscriptionService.follow_user(db, user_id, current_user)
 
 @router.delete("/{user_id}/unfollow", status_code=status.HTTP_200_OK)
 async def unfollow_user(
     user_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Unfollow a user."""
-    return SubscriptionService.unfollow_user(db, user_id, current_user)
+    return await SubscriptionService.unfollow_user(db, user_id, current_user)
 
-@router.get("/{user_id}/followers", response_model=List[SubscriptionDisplay])
+@router.get("/{user_id}/followers", response_model=Union[List[SubscriptionDisplay], SubscriptionPage])
 async def get_followers(
     user_id: int,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all followers of a user."""
-    return SubscriptionService.get_followers(db, user_id, skip, limit)
+    followers = await db.run_sync(SubscriptionService.get_followers, user_id, skip, limit, decode_cursor(cursor))
+    return page_response(followers, limit, cursor)
 
-@router.get("/{user_id}/following", response_model=List[SubscriptionDisplay])
+@router.get("/{user_id}/following", response_model=Union[List[SubscriptionDisplay], SubscriptionPage])
 async def get_following(
     user_id: int,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all users a user is following."""
-    return SubscriptionService.get_following(db, user_id, skip, limit)
+    following = await db.run_sync(SubscriptionService.get_following, user_id, skip, limit, decode_cursor(cursor))
+    return page_response(following, limit, cursor)
 
 @router.get("/{user_id}/is-following")
 async def check_is_following(
     user_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Check if current user is following another user."""
-    return SubscriptionService.check_is_following(db, user_id, current_user) 
\ No newline at end of file
+    return await db.run_sync(SubscriptionService.check_is_following, user_id, current_user) 
\ No newline at end of file
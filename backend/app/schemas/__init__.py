@@ -1,32 +1,32 @@
 from .user import (
     UserBase, UserCreate, UserUpdate, UserDisplay, UserDetail, 
-    UserLogin, Token, TokenData
+    UserLogin, Token, TokenData, UserPage
 )
 from .event import (
-    EventBase, EventCreate, EventUpdate, EventDisplay, EventDetail,
+    EventBase, EventCreate, EventUpdate, EventDisplay, EventDetail, EventPage,
     EventImageBase, EventImageCreate, EventImageDisplay,
-    ParticipantBase, ParticipantCreate, ParticipantDisplay,
-    InvitationBase, InvitationCreate, InvitationDisplay
+    ParticipantBase, ParticipantCreate, ParticipantDisplay, ParticipantPage,
+    InvitationBase, InvitationCreate, InvitationDisplay, InvitationPage
 )
 from .interaction import (
-    CommentBase, CommentCreate, CommentUpdate, CommentDisplay,
+    CommentBase, CommentCreate, CommentUpdate, CommentDisplay, CommentPage,
     ReviewBase, ReviewCreate, ReviewUpdate, ReviewDisplay, ReviewsResponse
 )
 from .subscription import (
-    SubscriptionBase, SubscriptionCreate, SubscriptionDisplay
+    SubscriptionBase, SubscriptionCreate, SubscriptionDisplay, SubscriptionPage
 )
 
 __all__ = [
     "UserBase", "UserCreate", "UserUpdate", "UserDisplay", "UserDetail", 
-    "UserLogin", "Token", "TokenData",
+    "UserLogin", "Token", "TokenData", "UserPage",
     
-    "EventBase", "EventCreate", "EventUpdate", "EventDisplay", "EventDetail",
+    "EventBase", "EventCreate", "EventUpdate", "EventDisplay", "EventDetail", "EventPage",
     "EventImageBase", "EventImageCreate", "EventImageDisplay",
-    "ParticipantBase", "ParticipantCreate", "ParticipantDisplay",
-    "InvitationBase", "InvitationCreate", "InvitationDisplay",
+    "ParticipantBase", "ParticipantCreate", "ParticipantDisplay", "ParticipantPage",
+    "InvitationBase", "InvitationCreate", "InvitationDisplay", "InvitationPage",
     
-    "CommentBase", "CommentCreate", "CommentUpdate", "CommentDisplay",
+    "CommentBase", "CommentCreate", "CommentUpdate", "CommentDisplay", "CommentPage",
     "ReviewBase", "ReviewCreate", "ReviewUpdate", "ReviewDisplay", "ReviewsResponse",
     
-    "SubscriptionBase", "SubscriptionCreate", "SubscriptionDisplay"
+    "SubscriptionBase", "SubscriptionCreate", "SubscriptionDisplay", "SubscriptionPage"
 ] 
\ No newline at end of file
@@ -63,6 +63,11 @@ class EventDetail(EventDisplay):
         from_attributes = True
         orm_mode = True  # For backward compatibility
 
+# Event Page Schema (cursor pagination)
+class EventPage(BaseModel):
+    items: List[EventDisplay]
+    next_cursor: Optional[str] = None
+
 # Participant Schema
 class ParticipantBase(BaseModel):
     user_id: int
@@ -80,6 +85,10 @@ class ParticipantDisplay(BaseModel):
         from_attributes = True
         orm_mode = True  # For backward compatibility
 
+class ParticipantPage(BaseModel):
+    items: List[ParticipantDisplay]
+    next_cursor: Optional[str] = None
+
 # Invitation Schema
 class InvitationBase(BaseModel):
     user_id: int
@@ -95,4 +104,8 @@ class InvitationDisplay(BaseModel):
     
     class Config:
         from_attributes = True
-        orm_mode = True  # For backward compatibility 
\ No newline at end of file
+        orm_mode = True  # For backward compatibility
+
+class InvitationPage(BaseModel):
+    items: List[InvitationDisplay]
+    next_cursor: Optional[str] = None
\ No newline at end of file
@@ -25,6 +25,10 @@ class CommentDisplay(BaseModel):
         from_attributes = True
         orm_mode = True  # For backward compatibility
 
+class CommentPage(BaseModel):
+    items: List[CommentDisplay]
+    next_cursor: Optional[str] = None
+
 # Review Schema
 class ReviewBase(BaseModel):
     text: Optional[str] = None
@@ -64,6 +68,7 @@ class ReviewDisplay(BaseModel):
 class ReviewsResponse(BaseModel):
     reviews: List[ReviewDisplay]
     average_rating: float
+    next_cursor: Optional[str] = None
     
     class Config:
         from_attributes = True
@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from typing import Optional, List
 from datetime import datetime
 
 from .user import UserDisplay
@@ -18,4 +19,8 @@ class SubscriptionDisplay(BaseModel):
     
     class Config:
         from_attributes = True
-        orm_mode = True  # For backward compatibility 
\ No newline at end of file
+        orm_mode = True  # For backward compatibility
+
+class SubscriptionPage(BaseModel):
+    items: List[SubscriptionDisplay]
+    next_cursor: Optional[str] = None
\ No newline at end of file
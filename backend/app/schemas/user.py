@@ -37,6 +37,11 @@ class UserDisplay(UserBase):
         from_attributes = True
         orm_mode = True  # Для обратной совместимости
 
+# User Page Schema (cursor pagination)
+class UserPage(BaseModel):
+    items: List[UserDisplay]
+    next_cursor: Optional[str] = None
+
 # User Detail Schema with counts
 class UserDetail(UserDisplay):
     events_count: int = 0
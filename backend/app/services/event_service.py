@@ -1,52 +1,111 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status, UploadFile
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 
 from ..models import User, Event
-from ..repositories import EventRepository, InvitationRepository, SubscriptionRepository
+from ..repositories import (
+    EventRepository, InvitationRepository, SubscriptionRepository, FeedRepository, AsyncEventRepository
+)
 from ..schemas import EventCreate, EventUpdate, EventDetail
 from ..utils.upload import save_image, delete_file
+from ..utils.pagination import CursorKey
+from ..utils.cache import (
+    event_detail_cache, feed_cache, invalidate, event_scope, user_scope, feed_scope, creator_scope,
+    MISSING
+)
 
 class EventService:
     @staticmethod
     async def create_event(
-        db: Session, 
+        db: AsyncSession, 
         event_data: EventCreate, 
         images: Optional[List[UploadFile]], 
         current_user: User
     ):
         """Create a new event."""
-        # Create event
-        event = EventRepository.create(db, event_data, current_user.id)
-        
-        # Add images if provided
+        # Save images if provided
+        image_paths = []
         if images:
             for image in images:
-                image_path = await save_image(image, folder="events")
-                EventRepository.add_image(db, event.id, image_path)
+                image_paths.append(await save_image(image, folder="events"))
+        
+        event = await db.run_sync(EventService._create_event, event_data, image_paths, current_user.id)
+        
+        # Creator's events count changed, followers' feeds got the event
+        feed_users = await db.run_sync(FeedRepository.get_new_event_feed_users, event["id"])
+        await invalidate(
+            user_scope(current_user.id), creator_scope(current_user.id), *map(feed_scope, feed_users)
+        )
+        return event
+
+    @staticmethod
+    async def _feed_scopes(db: AsyncSession, event_id: int) -> List[str]:
+        """Get feed scopes of the users whose timeline holds the event."""
+        user_ids = await db.run_sync(FeedRepository.get_timeline_users, event_id)
+        return [feed_scope(user_id) for user_id in user_ids]
+
+    @staticmethod
+    def _create_event(db: Session, event_data: EventCreate, image_paths: List[str], creator_id: int):
+        """Create event rows: event, images and invitations."""
+        # Create event
+        event = EventRepository.create(db, event_data, creator_id)
+        
+        # Add images
+        for image_path in image_paths:
+            EventRepository.add_image(db, event.id, image_path)
         
         # Create invitations for followers if not explicitly specified
         if event_data.invited_users is None:
-            InvitationRepository.create_invitations_for_followers(db, event.id, current_user.id)
+            InvitationRepository.create_invitations_for_followers(db, event.id, creator_id)
         # Create invitations for specified users
         elif event_data.invited_users:
-            for user_id in event_data.invited_users:
-                InvitationRepository.create_invitation(db, event.id, user_id)
+            InvitationRepository.create_invitations(db, event.id, event_data.invited_users)
+        
+        # Invitations are in place, deliver the notification now
+        EventRepository.release_notification(db, event.id)
         
         # Refresh the event to get the images
         db.refresh(event)
         return event.to_dict()
 
     @staticmethod
-    def get_event_by_id(db: Session, event_id: int, current_user: Optional[User] = None):
+    async def get_event_by_id(db: AsyncSession, event_id: int, current_user: Optional[User] = None):
         """Get event by ID with additional details."""
-        event = EventRepository.get_by_id(db, event_id)
-        if not event:
+        user_id = current_user.id if current_user else None
+        
+        # Shared part comes from the cache, viewer flags are always fresh
+        cache_key = await event_detail_cache.key(event_id, scopes=[event_scope(event_id)])
+        cached = await event_detail_cache.get(cache_key)
+        if cached is not MISSING:
+            event_dict = dict(cached)
+            if user_id is not None:
+                is_user_participant, is_user_invited = await AsyncEventRepository.get_user_flags(db, event_id, user_id)
+            else:
+                is_user_participant, is_user_invited = False, False
+        else:
+            event_dict, is_user_participant, is_user_invited = await db.run_sync(
+                EventService._get_event_detail, event_id, user_id
+            )
+            await event_detail_cache.set(cache_key, dict(event_dict))
+        
+        # Add current user flags
+        event_dict["is_user_participant"] = bool(is_user_participant)
+        event_dict["is_user_invited"] = bool(is_user_invited)
+        
+        return event_dict
+
+    @staticmethod
+    def _get_event_detail(db: Session, event_id: int, user_id: Optional[int]):
+        """Load the viewer-independent event detail and the viewer's flags."""
+        row = EventRepository.get_detail(db, event_id, user_id)
+        if not row:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Мероприятие не найдено"
             )
+        event, participants_count, is_user_participant, is_user_invited = row
         
         # Create event detail dict
         event_dict = event.to_dict()
@@ -61,27 +120,13 @@ class EventService:
             "profile_picture": event.creator.profile_picture
         }
         
-        # Get participants count
-        event_dict["participants_count"] = EventRepository.get_participants_count(db, event_id)
-        
-        # Check if current user is participant and invited if user is logged in
-        if current_user:
-            event_dict["is_user_participant"] = EventRepository.is_user_participant(db, event_id, current_user.id)
-            event_dict["is_user_invited"] = EventRepository.is_user_invited(db, event_id, current_user.id)
-        else:
-            event_dict["is_user_participant"] = False
-            event_dict["is_user_invited"] = False
-        
-        return event_dict
+        # Add participants count
+        event_dict["participants_count"] = participants_count or 0
+        return event_dict, is_user_participant, is_user_invited
 
     @staticmethod
-    async def update_event(
-        db: Session, 
-        event_id: int, 
-        event_data: EventUpdate, 
-        current_user: User
-    ):
-        """Update an event."""
+    def _get_editable_event(db: Session, event_id: int, current_user: User):
+        """Get an event the current user is allowed to edit."""
         # Get event
         event = EventRepository.get_by_id(db, event_id)
         if not event:
@@ -104,62 +149,73 @@ class EventService:
                 detail="Нельзя редактировать прошедшее мероприятие"
             )
         
+        return event
+
+    @staticmethod
+    def _get_images_to_delete(db: Session, event_id: int, event_data: EventUpdate, current_user: User) -> List[str]:
+        """Check edit rights and return image paths dropped by the update."""
+        event = EventService._get_editable_event(db, event_id, current_user)
+        
         # Handle deleted images - if existing_images is provided
-        if event_data.existing_images is not None:
-            # Get current images
-            current_images = [img.image_path for img in event.images]
-            
-            # Find images to delete
-            images_to_delete = [path for path in current_images if path not in event_data.existing_images]
-            
-            # Delete the image files
-            for image_path in images_to_delete:
-                await delete_file(image_path)
+        if event_data.existing_images is None:
+            return []
         
-        # Update event
+        # Find images to delete
+        current_images = [img.image_path for img in event.images]
+        return [path for path in current_images if path not in event_data.existing_images]
+
+    @staticmethod
+    def _update_event(db: Session, event_id: int, event_data: EventUpdate) -> Dict[str, Any]:
+        """Update event row and serialize it."""
         updated_event = EventRepository.update(db, event_id, event_data)
         return updated_event.to_dict()
 
+    @staticmethod
+    async def update_event(
+        db: AsyncSession, 
+        event_id: int, 
+        event_data: EventUpdate, 
+        current_user: User
+    ):
+        """Update an event."""
+        images_to_delete = await db.run_sync(
+            EventService._get_images_to_delete, event_id, event_data, current_user
+        )
+        
+        # Delete the image files
+        for image_path in images_to_delete:
+            await delete_file(image_path)
+        
+        # Update event
+        updated_event = await db.run_sync(EventService._update_event, event_id, event_data)
+        await invalidate(
+            event_scope(event_id), creator_scope(current_user.id), *await EventService._feed_scopes(db, event_id)
+        )
+        return updated_event
+
     @staticmethod
     async def add_event_image(
-        db: Session, 
+        db: AsyncSession, 
         event_id: int, 
         image: UploadFile, 
         current_user: User
     ):
         """Add an image to an event."""
-        # Get event
-        event = EventRepository.get_by_id(db, event_id)
-        if not event:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Мероприятие не найдено"
-            )
-        
-        # Check if user is the creator
-        if event.creator_id != current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="У вас нет прав на редактирование этого мероприятия"
-            )
-        
-        # Check if event has already passed
-        if event.event_date < datetime.now():
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Нельзя редактировать прошедшее мероприятие"
-            )
+        await db.run_sync(EventService._get_editable_event, event_id, current_user)
         
         # Save image
         image_path = await save_image(image, folder="events")
         
         # Add image to event
-        event_image = EventRepository.add_image(db, event_id, image_path)
+        event_image = await AsyncEventRepository.add_image(db, event_id, image_path)
+        await invalidate(
+            event_scope(event_id), creator_scope(current_user.id), *await EventService._feed_scopes(db, event_id)
+        )
         return event_image
 
     @staticmethod
-    async def delete_event(db: Session, event_id: int, current_user: User):
-        """Delete an event."""
+    def _get_deletable_event_images(db: Session, event_id: int, current_user: User) -> List[str]:
+        """Check delete rights and return the event image paths."""
         # Get event
         event = EventRepository.get_by_id(db, event_id)
         if not event:
@@ -175,17 +231,26 @@ class EventService:
                 detail="У вас нет прав на удаление этого мероприятия"
             )
         
+        return [image.image_path for image in event.images]
+
+    @staticmethod
+    async def delete_event(db: AsyncSession, event_id: int, current_user: User):
+        """Delete an event."""
+        image_paths = await db.run_sync(EventService._get_deletable_event_images, event_id, current_user)
+        
         # Delete images
-        for image in event.images:
-            await delete_file(image.image_path)
+        for image_path in image_paths:
+            await delete_file(image_path)
         
-        # Delete event
-        EventRepository.delete(db, event_id)
+        # Delete event, its timeline rows go with it
+        feed_scopes = await EventService._feed_scopes(db, event_id)
+        await AsyncEventRepository.delete(db, event_id)
+        await invalidate(event_scope(event_id), user_scope(current_user.id), creator_scope(current_user.id), *feed_scopes)
         return {"status": "success", "message": "Мероприятие успешно удалено"}
 
     @staticmethod
-    async def delete_event_image(db: Session, image_id: int, current_user: User):
-        """Delete an event image."""
+    def _get_deletable_image(db: Session, image_id: int, current_user: User):
+        """Get an event image the current user is allowed to delete."""
         # Check if image exists and get the event
         from ..models import EventImage
         image = db.query(EventImage).filter(EventImage.id == image_id).first()
@@ -205,35 +270,73 @@ class EventService:
                 detail="У вас нет прав на удаление изображений этого мероприятия"
             )
         
+        return image
+
+    @staticmethod
+    async def delete_event_image(db: AsyncSession, image_id: int, current_user: User):
+        """Delete an event image."""
+        image = await db.run_sync(EventService._get_deletable_image, image_id, current_user)
+        
         # Delete image file
         await delete_file(image.image_path)
         
         # Delete image from database
-        EventRepository.delete_image(db, image_id)
+        await AsyncEventRepository.delete_image(db, image_id)
+        await invalidate(
+            event_scope(image.event_id), creator_scope(current_user.id),
+            *await EventService._feed_scopes(db, image.event_id)
+        )
         return {"status": "success", "message": "Изображение успешно удалено"}
 
     @staticmethod
-    def get_user_events(db: Session, user_id: int, skip: int = 0, limit: int = 10):
+    def get_user_events(db: Session, user_id: int, skip: int = 0, limit: int = 10, cursor: Optional[CursorKey] = None):
         """Get events created by a user."""
-        events = EventRepository.get_events_by_creator(db, user_id, skip, limit)
+        events = EventRepository.get_events_by_creator(db, user_id, skip, limit, cursor)
         return [event.to_dict() for event in events]
 
     @staticmethod
-    def get_user_feed(db: Session, user_id: int, skip: int = 0, limit: int = 10):
+    async def get_user_feed(db: AsyncSession, user_id: int, skip: int = 0, limit: int = 10, cursor: Optional[CursorKey] = None):
         """Get events from users the current user is following."""
-        events = EventRepository.get_user_feed(db, user_id, skip, limit)
+        # Timeline changes bump the user's feed scope, so a hit never touches the database
+        cache_key = await feed_cache.key(
+            user_id, skip, limit, cursor[0].isoformat() if cursor else "", cursor[1] if cursor else "",
+            scopes=[feed_scope(user_id)]
+        )
+        cached = await feed_cache.get_checked(cache_key)
+        if cached is not MISSING:
+            return cached
+        
+        # Events pulled on read are not in the timeline, their creators' scopes are checked instead
+        pulled_creators = await db.run_sync(FeedRepository.get_pulled_creators, user_id)
+        versions = await feed_cache.versions(creator_scope(creator_id) for creator_id in pulled_creators)
+        result = await db.run_sync(EventService._get_user_feed, user_id, skip, limit, cursor)
+        await feed_cache.set_checked(cache_key, result, versions)
+        return result
+
+    @staticmethod
+    def _get_user_feed(db: Session, user_id: int, skip: int, limit: int, cursor: Optional[CursorKey]):
+        """Load and serialize a feed page."""
+        events = EventRepository.get_user_feed(db, user_id, skip, limit, cursor)
         return [event.to_dict() for event in events]
 
     @staticmethod
-    def search_events(db: Session, query: str, upcoming_only: bool = False, skip: int = 0, limit: int = 10):
-        """Search events by title, location, or description."""
+    def search_events(
+        db: Session, 
+        query: str, 
+        upcoming_only: bool = False, 
+        skip: int = 0, 
+        limit: int = 10, 
+        cursor: Optional[CursorKey] = None,
+        ranked: bool = True
+    ):
+        """Search events by title, location, or description, best matches first."""
         if not query or len(query) < 3:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Поисковый запрос должен содержать не менее 3 символов"
             )
         
-        events = EventRepository.search(db, query, skip, limit, upcoming_only)
+        events = EventRepository.search(db, query, skip, limit, upcoming_only, cursor, ranked)
         return [event.to_dict() for event in events]
 
     @staticmethod
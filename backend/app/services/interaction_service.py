@@ -1,10 +1,12 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from datetime import datetime
+from typing import Optional
 
 from ..models import User, Review
 from ..repositories import CommentRepository, ReviewRepository, EventRepository
 from ..schemas import CommentCreate, CommentUpdate, ReviewCreate, ReviewUpdate
+from ..utils.pagination import CursorKey, get_next_cursor
 
 class CommentService:
     @staticmethod
@@ -49,7 +51,7 @@ class CommentService:
         return {"status": "success", "message": "Комментарий успешно удален"}
 
     @staticmethod
-    def get_event_comments(db: Session, event_id: int, skip: int = 0, limit: int = 100):
+    def get_event_comments(db: Session, event_id: int, skip: int = 0, limit: int = 100, cursor: Optional[CursorKey] = None):
         """Get all comments for an event."""
         # Check if event exists
         event = EventRepository.get_by_id(db, event_id)
@@ -60,7 +62,7 @@ class CommentService:
             )
         
         # Get comments
-        return CommentRepository.get_by_event(db, event_id, skip, limit)
+        return CommentRepository.get_by_event(db, event_id, skip, limit, cursor)
 
 class ReviewService:
     @staticmethod
@@ -130,7 +132,7 @@ class ReviewService:
         return {"status": "success", "message": "Отзыв успешно удален"}
 
     @staticmethod
-    def get_event_reviews(db: Session, event_id: int, skip: int = 0, limit: int = 100):
+    def get_event_reviews(db: Session, event_id: int, skip: int = 0, limit: int = 100, cursor: Optional[CursorKey] = None):
         """Get all reviews for an event."""
         # Check if event exists
         event = EventRepository.get_by_id(db, event_id)
@@ -141,12 +143,13 @@ class ReviewService:
             )
         
         # Get reviews
-        reviews = ReviewRepository.get_by_event(db, event_id, skip, limit)
+        reviews = ReviewRepository.get_by_event(db, event_id, skip, limit, cursor)
         
         # Get average rating
         avg_rating = ReviewRepository.get_average_rating(db, event_id)
         
         return {
             "reviews": reviews,
-            "average_rating": avg_rating
+            "average_rating": avg_rating,
+            "next_cursor": get_next_cursor(reviews, limit)
         } 
\ No newline at end of file
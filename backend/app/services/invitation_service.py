@@ -1,8 +1,10 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
+from typing import Optional
 
 from ..models import User, Event
 from ..repositories import InvitationRepository, EventRepository, UserRepository
+from ..utils.pagination import CursorKey
 
 class InvitationService:
     @staticmethod
@@ -72,7 +74,14 @@ class InvitationService:
         return {"status": "success", "message": "Приглашение успешно удалено"}
 
     @staticmethod
-    def get_event_invitations(db: Session, event_id: int, current_user: User, skip: int = 0, limit: int = 100):
+    def get_event_invitations(
+        db: Session, 
+        event_id: int, 
+        current_user: User, 
+        skip: int = 0, 
+        limit: int = 100, 
+        cursor: Optional[CursorKey] = None
+    ):
         """Get all invitations for an event."""
         # Check if event exists
         event = EventRepository.get_by_id(db, event_id)
@@ -90,7 +99,7 @@ class InvitationService:
             )
         
         # Get invitations
-        return InvitationRepository.get_event_invitations(db, event_id, skip, limit)
+        return InvitationRepository.get_event_invitations(db, event_id, skip, limit, cursor)
 
     @staticmethod
     def get_user_invitations(db: Session, current_user: User, skip: int = 0, limit: int = 100):
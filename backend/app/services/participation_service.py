@@ -1,13 +1,24 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
+from typing import Optional
 
 from ..models import User, Event
 from ..repositories import ParticipationRepository, EventRepository
+from ..utils.pagination import CursorKey
+from ..utils.cache import invalidate, event_scope
 
 class ParticipationService:
     @staticmethod
-    def join_event(db: Session, event_id: int, current_user: User):
+    async def join_event(db: AsyncSession, event_id: int, current_user: User):
         """Join an event as a participant."""
+        participant = await db.run_sync(ParticipationService._join_event, event_id, current_user)
+        await invalidate(event_scope(event_id))
+        return participant
+
+    @staticmethod
+    def _join_event(db: Session, event_id: int, current_user: User):
+        """Check the event and add the participant row."""
         # Check if event exists
         event = EventRepository.get_by_id(db, event_id)
         if not event:
@@ -24,12 +35,18 @@ class ParticipationService:
             )
         
         # Add participant
-        participant = ParticipationRepository.add_participant(db, event_id, current_user.id)
-        return participant
+        return ParticipationRepository.add_participant(db, event_id, current_user.id)
 
     @staticmethod
-    def leave_event(db: Session, event_id: int, current_user: User):
+    async def leave_event(db: AsyncSession, event_id: int, current_user: User):
         """Leave an event as a participant."""
+        result = await db.run_sync(ParticipationService._leave_event, event_id, current_user)
+        await invalidate(event_scope(event_id))
+        return result
+
+    @staticmethod
+    def _leave_event(db: Session, event_id: int, current_user: User):
+        """Check the event and remove the participant row."""
         # Check if event exists
         event = EventRepository.get_by_id(db, event_id)
         if not event:
@@ -56,7 +73,7 @@ class ParticipationService:
         return {"status": "success", "message": "Вы успешно покинули мероприятие"}
 
     @staticmethod
-    def get_event_participants(db: Session, event_id: int, skip: int = 0, limit: int = 100):
+    def get_event_participants(db: Session, event_id: int, skip: int = 0, limit: int = 100, cursor: Optional[CursorKey] = None):
         """Get all participants for an event."""
         # Check if event exists
         event = EventRepository.get_by_id(db, event_id)
@@ -67,7 +84,7 @@ class ParticipationService:
             )
         
         # Get participants
-        return ParticipationRepository.get_event_participants(db, event_id, skip, limit)
+        return ParticipationRepository.get_event_participants(db, event_id, skip, limit, cursor)
 
     @staticmethod
     def get_user_participations(db: Session, user_id: int, skip: int = 0, limit: int = 100):
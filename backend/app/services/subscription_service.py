@@ -1,13 +1,24 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
+from typing import Optional
 
 from ..models import User
 from ..repositories import SubscriptionRepository, UserRepository
+from ..utils.pagination import CursorKey
+from ..utils.cache import invalidate, user_scope, feed_scope
 
 class SubscriptionService:
     @staticmethod
-    def follow_user(db: Session, followed_id: int, current_user: User):
+    async def follow_user(db: AsyncSession, followed_id: int, current_user: User):
         """Follow a user."""
+        subscription = await db.run_sync(SubscriptionService._follow_user, followed_id, current_user)
+        await invalidate(user_scope(followed_id), user_scope(current_user.id), feed_scope(current_user.id))
+        return subscription
+
+    @staticmethod
+    def _follow_user(db: Session, followed_id: int, current_user: User):
+        """Check the user and create the subscription row."""
         # Check if user exists
         followed_user = UserRepository.get_by_id(db, followed_id)
         if not followed_user:
@@ -31,12 +42,18 @@ class SubscriptionService:
             )
         
         # Create subscription
-        subscription = SubscriptionRepository.follow_user(db, current_user.id, followed_id)
-        return subscription
+        return SubscriptionRepository.follow_user(db, current_user.id, followed_id)
 
     @staticmethod
-    def unfollow_user(db: Session, followed_id: int, current_user: User):
+    async def unfollow_user(db: AsyncSession, followed_id: int, current_user: User):
         """Unfollow a user."""
+        result = await db.run_sync(SubscriptionService._unfollow_user, followed_id, current_user)
+        await invalidate(user_scope(followed_id), user_scope(current_user.id), feed_scope(current_user.id))
+        return result
+
+    @staticmethod
+    def _unfollow_user(db: Session, followed_id: int, current_user: User):
+        """Check the user and delete the subscription row."""
         # Check if user exists
         followed_user = UserRepository.get_by_id(db, followed_id)
         if not followed_user:
@@ -63,7 +80,7 @@ class SubscriptionService:
         return {"status": "success", "message": "Вы успешно отписались"}
 
     @staticmethod
-    def get_followers(db: Session, user_id: int, skip: int = 0, limit: int = 100):
+    def get_followers(db: Session, user_id: int, skip: int = 0, limit: int = 100, cursor: Optional[CursorKey] = None):
         """Get all followers of a user."""
         # Check if user exists
         user = UserRepository.get_by_id(db, user_id)
@@ -74,10 +91,10 @@ class SubscriptionService:
             )
         
         # Get followers
-        return SubscriptionRepository.get_followers(db, user_id, skip, limit)
+        return SubscriptionRepository.get_followers(db, user_id, skip, limit, cursor)
 
     @staticmethod
-    def get_following(db: Session, user_id: int, skip: int = 0, limit: int = 100):
+    def get_following(db: Session, user_id: int, skip: int = 0, limit: int = 100, cursor: Optional[CursorKey] = None):
         """Get all users a user is following."""
         # Check if user exists
         user = UserRepository.get_by_id(db, user_id)
@@ -88,7 +105,7 @@ class SubscriptionService:
             )
         
         # Get following
-        return SubscriptionRepository.get_following(db, user_id, skip, limit)
+        return SubscriptionRepository.get_following(db, user_id, skip, limit, cursor)
 
     @staticmethod
     def check_is_following(db: Session, followed_id: int, current_user: User):
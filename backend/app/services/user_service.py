@@ -1,15 +1,31 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status, UploadFile
+from typing import Optional
 
-from ..repositories import UserRepository
+from ..repositories import UserRepository, AsyncUserRepository
 from ..schemas import UserUpdate, UserDetail
 from ..utils.upload import save_image, delete_file
+from ..utils.pagination import CursorKey
+from ..utils.cache import user_detail_cache, invalidate, user_scope, MISSING
 from ..models import User
 
 class UserService:
     @staticmethod
-    def get_user_by_id(db: Session, user_id: int):
+    async def get_user_by_id(db: AsyncSession, user_id: int):
         """Get user by ID with detail."""
+        cache_key = await user_detail_cache.key(user_id, scopes=[user_scope(user_id)])
+        cached = await user_detail_cache.get(cache_key)
+        if cached is not MISSING:
+            return UserDetail.model_validate(cached)
+        
+        user_detail = await db.run_sync(UserService._get_user_detail, user_id)
+        await user_detail_cache.set(cache_key, user_detail.model_dump())
+        return user_detail
+
+    @staticmethod
+    def _get_user_detail(db: Session, user_id: int) -> UserDetail:
+        """Load a user with stats."""
         user = UserRepository.get_by_id(db, user_id)
         if not user:
             raise HTTPException(
@@ -25,12 +41,18 @@ class UserService:
         user_detail.events_count = stats["events_count"]
         user_detail.followers_count = stats["followers_count"]
         user_detail.following_count = stats["following_count"]
-        
         return user_detail
 
     @staticmethod
-    async def update_user(db: Session, user_id: int, user_data: UserUpdate, current_user: User):
+    async def update_user(db: AsyncSession, user_id: int, user_data: UserUpdate, current_user: User):
         """Update user profile."""
+        updated_user = await db.run_sync(UserService._update_user, user_id, user_data, current_user)
+        await invalidate(user_scope(user_id))
+        return updated_user
+
+    @staticmethod
+    def _update_user(db: Session, user_id: int, user_data: UserUpdate, current_user: User):
+        """Check uniqueness and update the user row."""
         # Check if user is authorized to update
         if user_id != current_user.id:
             raise HTTPException(
@@ -67,7 +89,7 @@ class UserService:
         return updated_user
 
     @staticmethod
-    async def update_profile_picture(db: Session, user_id: int, profile_picture: UploadFile, current_user: User):
+    async def update_profile_picture(db: AsyncSession, user_id: int, profile_picture: UploadFile, current_user: User):
         """Update user profile picture."""
         # Check if user is authorized to update
         if user_id != current_user.id:
@@ -85,17 +107,25 @@ class UserService:
         
         # Update user profile picture path
         user_data = UserUpdate(profile_picture=image_path)
-        updated_user = UserRepository.update(db, user_id, user_data)
+        updated_user = await AsyncUserRepository.update(db, user_id, user_data)
+        await invalidate(user_scope(user_id))
         
         return updated_user
 
     @staticmethod
-    def search_users(db: Session, query: str, skip: int = 0, limit: int = 10):
-        """Search users by username, phone, or full name."""
+    def search_users(
+        db: Session,
+        query: str,
+        skip: int = 0,
+        limit: int = 10,
+        cursor: Optional[CursorKey] = None,
+        ranked: bool = True
+    ):
+        """Search users by username, phone, or full name, best matches first."""
         if not query or len(query) < 3:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Поисковый запрос должен содержать не менее 3 символов"
             )
         
-        return UserRepository.search(db, query, skip, limit) 
\ No newline at end of file
+        return UserRepository.search(db, query, skip, limit, cursor, ranked) 
\ No newline at end of file
@@ -0,0 +1,327 @@
+import os
+import json
+import time
+import logging
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+CACHE_REDIS_TIMEOUT = float(os.getenv("CACHE_REDIS_TIMEOUT", "0.5"))
+CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", "60"))
+CACHE_FEED_TTL_SECONDS = float(os.getenv("CACHE_FEED_TTL_SECONDS", "30"))
+CACHE_MAX_SIZE = int(os.getenv("CACHE_MAX_SIZE", "1024"))
+CACHE_MAX_VERSIONS = int(os.getenv("CACHE_MAX_VERSIONS", str(CACHE_MAX_SIZE * 4)))
+
+# Bump to drop every cached value after a change of the cached data shape
+CACHE_KEY_PREFIX = os.getenv("CACHE_KEY_PREFIX", "events:v2")
+
+# Returned by get() when the key is absent or expired
+MISSING = object()
+
+class MemoryCacheBackend:
+    """Thread-safe LRU cache local to the process, entries expire after their ttl.
+
+    Methods are coroutines only to share the interface of RedisCacheBackend,
+    they never wait.
+    """
+
+    name = "memory"
+
+    def __init__(self, maxsize: int = CACHE_MAX_SIZE, max_versions: int = CACHE_MAX_VERSIONS):
+        self.maxsize = maxsize
+        self.max_versions = max_versions
+        self._data = OrderedDict()
+        self._versions: OrderedDict = OrderedDict()
+        # Version of scopes not in _versions. Raised above every evicted version,
+        # so that a forgotten scope never goes back to a version its stale keys use
+        self._version_floor = 0
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    async def get(self, key: str) -> Any:
+        """Get a value or MISSING, refreshing its LRU position."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._data[key]
+                return MISSING
+            self._data.move_to_end(key)
+            return entry[1]
+
+    async def set(self, key: str, value: Any, ttl: float):
+        """Store a value, evicting the least recently used entries when full."""
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    async def get_versions(self, scopes: List[str]) -> List[int]:
+        """Get the current version of each scope."""
+        with self._lock:
+            return [self._versions.get(scope, self._version_floor) for scope in scopes]
+
+    async def bump_versions(self, scopes: Iterable[str]):
+        """Increment scope versions so that keys built from them are never read again."""
+        with self._lock:
+            for scope in scopes:
+                self._versions[scope] = self._versions.get(scope, self._version_floor) + 1
+                self._versions.move_to_end(scope)
+            # Forget the least recently bumped scopes
+            while len(self._versions) > self.max_versions:
+                _, version = self._versions.popitem(last=False)
+                self._version_floor = max(self._version_floor, version + 1)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Get backend size and evictions."""
+        with self._lock:
+            return {
+                "backend": self.name,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "evictions": self.evictions,
+                "versions": len(self._versions)
+            }
+
+def _encode_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, date):
+        return {"__date__": value.isoformat()}
+    raise TypeError(f"{type(value).__name__} is not cacheable")
+
+def _decode_object(value: Dict[str, Any]) -> Any:
+    if len(value) == 1:
+        if "__datetime__" in value:
+            return datetime.fromisoformat(value["__datetime__"])
+        if "__date__" in value:
+            return date.fromisoformat(value["__date__"])
+    return value
+
+def dumps(value: Any) -> bytes:
+    """Serialize a cached value: JSON with dates and datetimes, tuples become lists."""
+    return json.dumps(value, default=_encode_default, separators=(",", ":")).encode()
+
+def loads(raw: bytes) -> Any:
+    """Deserialize a value written by dumps()."""
+    return json.loads(raw, object_hook=_decode_object)
+
+class RedisCacheBackend:
+    """Cache shared by all worker processes through a Redis-protocol server.
+
+    Values are stored as JSON rather than pickles, so whoever can write to the
+    server can corrupt cached responses but not run code in the workers.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str = CACHE_REDIS_URL, client=None):
+        if client is None:
+            # Async client, a slow server must not block the event loop
+            import redis.asyncio as redis
+            client = redis.Redis.from_url(
+                url,
+                socket_timeout=CACHE_REDIS_TIMEOUT,
+                socket_connect_timeout=CACHE_REDIS_TIMEOUT
+            )
+        self.client = client
+        self.errors = 0
+
+    def _key(self, key: str) -> str:
+        return f"{CACHE_KEY_PREFIX}:{key}"
+
+    def _failed(self, action: str, error: Exception):
+        # The cache is an optimization: log and fall through to the database
+        self.errors += 1
+        logger.warning(f"Cache {action} failed: {error}")
+
+    async def get(self, key: str) -> Any:
+        """Get a value or MISSING."""
+        try:
+            raw = await self.client.get(self._key(key))
+        except Exception as e:
+            self._failed("get", e)
+            return MISSING
+        if raw is None:
+            return MISSING
+        try:
+            return loads(raw)
+        except ValueError as e:
+            self._failed("decode", e)
+            return MISSING
+
+    async def set(self, key: str, value: Any, ttl: float):
+        """Store a value with expiry."""
+        try:
+            await self.client.set(self._key(key), dumps(value), px=int(ttl * 1000))
+        except Exception as e:
+            self._failed("set", e)
+
+    async def get_versions(self, scopes: List[str]) -> Optional[List[int]]:
+        """Get the current version of each scope in one round trip, None if unavailable."""
+        try:
+            values = await self.client.mget([self._key(f"version:{scope}") for scope in scopes])
+        except Exception as e:
+            self._failed("version read", e)
+            return None
+        return [int(value) if value is not None else 0 for value in values]
+
+    async def bump_versions(self, scopes: Iterable[str]):
+        """Increment scope versions atomically for every worker."""
+        try:
+            async with self.client.pipeline(transaction=False) as pipeline:
+                for scope in scopes:
+                    pipeline.incr(self._key(f"version:{scope}"))
+                await pipeline.execute()
+        except Exception as e:
+            self._failed("invalidation", e)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Get backend error count."""
+        return {
+            "backend": self.name,
+            "errors": self.errors
+        }
+
+def create_backend():
+    """Create the backend selected by CACHE_BACKEND."""
+    if CACHE_BACKEND == "redis":
+        return RedisCacheBackend()
+    if CACHE_BACKEND != "memory":
+        logger.warning(f"Unknown CACHE_BACKEND {CACHE_BACKEND}, using memory")
+    return MemoryCacheBackend()
+
+backend = create_backend()
+
+class Cache:
+    """Named group of cached values with versioned keys and hit/miss counters.
+
+    A key embeds the versions of the scopes its value depends on, so invalidating
+    a scope makes every worker miss without deleting anything.
+    """
+
+    def __init__(self, name: str, ttl: float = CACHE_TTL_SECONDS):
+        self.name = name
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    async def key(self, *parts: Any, scopes: Iterable[str] = ()) -> Optional[str]:
+        """Build a key for parts and the current versions of scopes, None if unavailable."""
+        scopes = list(scopes)
+        versions = await backend.get_versions(scopes) if scopes else []
+        if versions is None:
+            return None
+        tokens = [self.name, *map(str, parts)]
+        tokens += [f"{scope}@{version}" for scope, version in zip(scopes, versions)]
+        return ":".join(tokens)
+
+    async def get(self, key: Optional[str]) -> Any:
+        """Get a cached value or MISSING."""
+        value = await backend.get(key) if key is not None else MISSING
+        with self._lock:
+            if value is MISSING:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    async def set(self, key: Optional[str], value: Any):
+        """Cache a value under a key from key()."""
+        if key is not None:
+            await backend.set(key, value, self.ttl)
+
+    async def versions(self, scopes: Iterable[str]) -> Optional[Dict[str, int]]:
+        """Read scope versions to store with a value by set_checked(), None if unavailable.
+
+        For scopes only known once the data is loaded. Read them before
+        loading, so that a change made meanwhile makes the value stale.
+        """
+        scopes = list(scopes)
+        versions = await backend.get_versions(scopes) if scopes else []
+        if versions is None:
+            return None
+        return dict(zip(scopes, versions))
+
+    async def get_checked(self, key: Optional[str]) -> Any:
+        """Get a value stored by set_checked(), MISSING if any of its scopes changed since."""
+        entry = await backend.get(key) if key is not None else MISSING
+        value = MISSING
+        if entry is not MISSING:
+            scopes = list(entry["versions"])
+            current = await backend.get_versions(scopes) if scopes else []
+            if current == list(entry["versions"].values()):
+                value = entry["value"]
+        with self._lock:
+            if value is MISSING:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    async def set_checked(self, key: Optional[str], value: Any, versions: Optional[Dict[str, int]]):
+        """Cache a value with the scope versions it was loaded at."""
+        if key is not None and versions is not None:
+            await backend.set(key, {"versions": versions, "value": value}, self.ttl)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Get hit/miss counters of this process."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0
+            }
+
+async def invalidate(*scopes: str):
+    """Invalidate every cached value that depends on any of the scopes."""
+    if scopes:
+        await backend.bump_versions(scopes)
+
+# Scopes
+def event_scope(event_id: int) -> str:
+    return f"event:{event_id}"
+
+def user_scope(user_id: int) -> str:
+    return f"user:{user_id}"
+
+# Feed timeline of a user, bumped when the user follows or unfollows someone
+# and when a fanned out event in the timeline is created, changed or deleted
+def feed_scope(user_id: int) -> str:
+    return f"feed:{user_id}"
+
+# Events of a creator, bumped when one of them is created, changed or deleted.
+# Feeds only check it for creators whose events are pulled on read.
+def creator_scope(user_id: int) -> str:
+    return f"creator:{user_id}"
+
+# Event detail without per-user flags
+event_detail_cache = Cache("event_detail")
+
+# UserDetail with stats
+user_detail_cache = Cache("user_detail")
+
+# Feed pages
+feed_cache = Cache("feed", ttl=CACHE_FEED_TTL_SECONDS)
+
+def get_cache_metrics() -> Dict[str, Any]:
+    """Get metrics for the backend and all caches."""
+    result = backend.metrics()
+    for cache in (event_detail_cache, user_detail_cache, feed_cache):
+        result[cache.name] = cache.metrics()
+    return result
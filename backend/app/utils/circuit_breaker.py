@@ -0,0 +1,122 @@
+import os
+import time
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Consecutive transport failures that open the breaker
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "3"))
+
+# Time an open breaker waits before probing the service again
+CIRCUIT_RESET_SECONDS = float(os.getenv("CIRCUIT_RESET_SECONDS", "30"))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Transitions kept for the metrics endpoint
+TRANSITIONS_KEPT = 20
+
+class CircuitBreaker:
+    """Stops calls to a failing service and probes it until it recovers.
+
+    closed: calls go through, consecutive failures are counted.
+    open: calls are refused right away until the reset timeout passes.
+    half_open: one caller runs the health probe, the others are refused;
+    the probe closes the breaker or opens it for another timeout.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        probe: Callable[[], Awaitable[bool]],
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_seconds: float = CIRCUIT_RESET_SECONDS
+    ):
+        self.name = name
+        self.probe = probe
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.refused = 0
+        self.probes = 0
+        self.transitions: List[Dict[str, Any]] = []
+        self.transitions_total: Dict[str, int] = {}
+        self._probe_lock = asyncio.Lock()
+
+    def _transition(self, state: str, reason: str):
+        if state == self.state:
+            return
+        key = f"{self.state}->{state}"
+        logger.warning(f"Circuit {self.name}: {key} ({reason})")
+        self.transitions_total[key] = self.transitions_total.get(key, 0) + 1
+        self.transitions.append({
+            "from": self.state,
+            "to": state,
+            "reason": reason,
+            "at": datetime.now(timezone.utc).isoformat()
+        })
+        del self.transitions[:-TRANSITIONS_KEPT]
+        self.state = state
+        if state == OPEN:
+            self.opened_at = time.monotonic()
+
+    async def allow(self) -> bool:
+        """Check whether a call may go to the service, probing it when the timeout passed."""
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and time.monotonic() - self.opened_at < self.reset_seconds:
+            self.refused += 1
+            return False
+        if self._probe_lock.locked():
+            # Another caller is probing
+            self.refused += 1
+            return False
+        async with self._probe_lock:
+            self._transition(HALF_OPEN, "reset timeout passed")
+            self.probes += 1
+            try:
+                healthy = await self.probe()
+            except Exception as e:
+                logger.warning(f"Circuit {self.name}: probe failed: {e}")
+                healthy = False
+            if healthy:
+                self.failures = 0
+                self._transition(CLOSED, "probe succeeded")
+                return True
+            self._transition(OPEN, "probe failed")
+            self.refused += 1
+            return False
+
+    def record_success(self):
+        """Count a call that reached the service."""
+        self.failures = 0
+        if self.state != CLOSED:
+            self._transition(CLOSED, "call succeeded")
+
+    def record_failure(self, reason: Optional[str] = None):
+        """Count a call that could not reach the service."""
+        self.failures += 1
+        if self.state == CLOSED and self.failures >= self.failure_threshold:
+            self._transition(OPEN, reason or f"{self.failures} consecutive failures")
+
+    def metrics(self) -> Dict[str, Any]:
+        """Get breaker state and transitions of this process."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "refused": self.refused,
+            "probes": self.probes,
+            "transitions_total": dict(self.transitions_total),
+            "recent_transitions": list(self.transitions)
+        }
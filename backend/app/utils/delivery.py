@@ -0,0 +1,229 @@
+import os
+import time
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Telegram allows about 30 messages per second per bot
+DELIVERY_RATE_PER_SECOND = float(os.getenv("DELIVERY_RATE_PER_SECOND", "30"))
+DELIVERY_BURST = int(os.getenv("DELIVERY_BURST", "30"))
+
+# And about one message per second to the same chat
+DELIVERY_CHAT_INTERVAL_SECONDS = float(os.getenv("DELIVERY_CHAT_INTERVAL_SECONDS", "1"))
+
+# Messages in flight at the same time
+DELIVERY_CONCURRENCY = int(os.getenv("DELIVERY_CONCURRENCY", "20"))
+
+# Attempts after a 429 before a message is given up
+DELIVERY_MAX_RETRIES = int(os.getenv("DELIVERY_MAX_RETRIES", "3"))
+
+# (chat_id, zero-argument coroutine function returning True when the message was sent)
+DeliveryJob = Tuple[Any, Callable[[], Awaitable[bool]]]
+
+# Chats that keep failing until the user links Telegram again
+BLOCKED = "blocked"
+CHAT_NOT_FOUND = "chat_not_found"
+
+def classify_failure(error: Optional[str], description: Optional[str] = None) -> Optional[str]:
+    """Classify a failed send by aiogram error class name and Telegram's description.
+
+    Returns BLOCKED (403) or CHAT_NOT_FOUND (400) for chats that will keep
+    failing, None for transient errors worth retrying later.
+    """
+    description = (description or "").lower()
+    if error == "TelegramForbiddenError" or "forbidden:" in description:
+        return BLOCKED
+    if error in (None, "TelegramBadRequest") and "chat not found" in description:
+        return CHAT_NOT_FOUND
+    return None
+
+class RetryAfter(Exception):
+    """Telegram answered 429, nothing may be sent for retry_after seconds."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Flood control exceeded, retry after {retry_after} s")
+        self.retry_after = retry_after
+
+class TokenBucket:
+    """Global send rate limit shared by every broadcast of the process."""
+
+    def __init__(self, rate: float = DELIVERY_RATE_PER_SECOND, capacity: int = DELIVERY_BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        """Wait for a token."""
+        while True:
+            now = time.monotonic()
+            if now < self.blocked_until:
+                await asyncio.sleep(self.blocked_until - now)
+                continue
+            self._refill(now)
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def pause(self, seconds: float):
+        """Stop handing out tokens for a while after a 429."""
+        now = time.monotonic()
+        self.blocked_until = max(self.blocked_until, now + seconds)
+        self.tokens = 0.0
+        self.updated = max(self.updated, self.blocked_until)
+
+class ChatLimiter:
+    """Spaces out messages to the same chat."""
+
+    def __init__(self, interval: float = DELIVERY_CHAT_INTERVAL_SECONDS):
+        self.interval = interval
+        self._next: Dict[Any, float] = {}
+
+    async def acquire(self, chat_id: Any):
+        """Wait for the chat's next free slot and reserve it."""
+        now = time.monotonic()
+        if len(self._next) > 10000:
+            self._next = {key: at for key, at in self._next.items() if at > now}
+        at = max(now, self._next.get(chat_id, 0.0))
+        self._next[chat_id] = at + self.interval
+        if at > now:
+            await asyncio.sleep(at - now)
+
+    def pause(self, chat_id: Any, seconds: float):
+        """Push the chat's next slot back after a 429."""
+        self._next[chat_id] = max(self._next.get(chat_id, 0.0), time.monotonic() + seconds)
+
+class DeliveryEngine:
+    """Sends messages concurrently under the global and per-chat Telegram limits."""
+
+    def __init__(self, concurrency: int = DELIVERY_CONCURRENCY, max_retries: int = DELIVERY_MAX_RETRIES):
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.bucket = TokenBucket()
+        self.chats = ChatLimiter()
+        self.in_flight = 0
+        self.sent = 0
+        self.failed = 0
+        self.rate_limited = 0
+        self.batched = 0
+        self.broadcasts = 0
+        self.last_broadcast: Dict[str, Any] = {}
+        self.unreachable: Dict[str, str] = {}
+        self.unreachable_total = 0
+
+    async def _attempt(self, chat_id: Any, send: Callable[[], Awaitable[bool]]) -> bool:
+        for _ in range(self.max_retries + 1):
+            await self.chats.acquire(chat_id)
+            await self.bucket.acquire()
+            self.in_flight += 1
+            try:
+                return await send()
+            except RetryAfter as e:
+                self.rate_limited += 1
+                logger.warning(f"Telegram rate limit hit for chat {chat_id}, retrying after {e.retry_after} s")
+                self.bucket.pause(e.retry_after)
+                self.chats.pause(chat_id, e.retry_after)
+            except Exception as e:
+                logger.error(f"Error delivering message to chat {chat_id}: {e}")
+                return False
+            finally:
+                self.in_flight -= 1
+        logger.error(f"Giving up on chat {chat_id} after {self.max_retries} retries")
+        return False
+
+    async def send(self, chat_id: Any, send: Callable[[], Awaitable[bool]]) -> bool:
+        """Send one message under the rate limits."""
+        if await self._attempt(chat_id, send):
+            self.sent += 1
+            return True
+        self.failed += 1
+        return False
+
+    async def deliver(self, jobs: Iterable[DeliveryJob], name: str = "broadcast") -> Dict[str, Any]:
+        """Run every job and return counts and throughput of the run."""
+        jobs = iter(jobs)
+        started = time.monotonic()
+        result = {"total": 0, "sent": 0, "failed": 0}
+
+        async def worker():
+            # Workers pull from the shared iterator, so a large broadcast never
+            # holds more than `concurrency` pending sends
+            for chat_id, send in jobs:
+                result["total"] += 1
+                if await self.send(chat_id, send):
+                    result["sent"] += 1
+                else:
+                    result["failed"] += 1
+
+        await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+        return self.report(name, result, started)
+
+    def mark_unreachable(self, chat_id: Any, reason: str):
+        """Remember a chat that refused delivery until it is saved, see take_unreachable()."""
+        if str(chat_id) not in self.unreachable:
+            self.unreachable_total += 1
+            logger.warning(f"Chat {chat_id} is unreachable: {reason}")
+        self.unreachable[str(chat_id)] = reason
+
+    def is_unreachable(self, chat_id: Any) -> bool:
+        """Check whether a chat refused delivery since the last save."""
+        return str(chat_id) in self.unreachable
+
+    def take_unreachable(self) -> Dict[str, str]:
+        """Get and forget unreachable chats found since the last call, by chat id."""
+        chats, self.unreachable = self.unreachable, {}
+        return chats
+
+    def record_batch(self, sent: int, failed: int):
+        """Count messages delivered by a batch sender that enforces the limits itself."""
+        self.batched += sent + failed
+        self.sent += sent
+        self.failed += failed
+
+    def report(self, name: str, result: Dict[str, Any], started: float) -> Dict[str, Any]:
+        """Add throughput to a broadcast result and remember it as the last broadcast."""
+        duration = time.monotonic() - started
+        result["duration_seconds"] = round(duration, 3)
+        result["per_second"] = round(result["sent"] / duration, 2) if duration > 0 else 0.0
+        self.broadcasts += 1
+        self.last_broadcast = {"name": name, **result}
+        logger.info(
+            f"{name}: delivered {result['sent']}/{result['total']} messages "
+            f"in {result['duration_seconds']} s ({result['per_second']} msg/s)"
+        )
+        return result
+
+    def metrics(self) -> Dict[str, Any]:
+        """Get delivery counters of this process."""
+        return {
+            "rate_per_second": self.bucket.rate,
+            "concurrency": self.concurrency,
+            "in_flight": self.in_flight,
+            "sent": self.sent,
+            "failed": self.failed,
+            "rate_limited": self.rate_limited,
+            "batched": self.batched,
+            "unreachable": self.unreachable_total,
+            "broadcasts": self.broadcasts,
+            "last_broadcast": self.last_broadcast
+        }
+
+# Shared by all notification paths so that concurrent broadcasts split one budget
+delivery_engine = DeliveryEngine()
+
+def get_delivery_metrics() -> Dict[str, Any]:
+    """Get metrics of the delivery engine."""
+    return delivery_engine.metrics()
@@ -0,0 +1,156 @@
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+BASE_URL = os.getenv("BASE_URL", "https://unl-events.duckdns.org")
+
+# Local development puts the event URL into the text instead of an inline button
+IS_LOCAL_DEV = "localhost" in BASE_URL or "127.0.0.1" in BASE_URL
+
+DATE_FORMAT = "%d.%m.%Y %H:%M"
+BUTTON_TEXT = "Открыть на сайте"
+
+# Telegram rejects longer message texts
+MESSAGE_MAX_LENGTH = 4096
+
+# Events per update digest message, each gets a button; longer digests are split
+DIGEST_MAX_EVENTS = int(os.getenv("DIGEST_MAX_EVENTS", "10"))
+
+# Message bodies, {link} is the URL line in local development and empty otherwise
+TEMPLATES = {
+    "invitation": (
+        "🎉 <b>Новое приглашение на мероприятие!</b>\n\n"
+        "<b>{title}</b>\n"
+        "📅 {date}\n"
+        "📍 {location}\n"
+        "👤 Организатор: {creator}\n\n"
+        "{link}"
+        "Посетите сайт, чтобы узнать подробности и подтвердить участие."
+    ),
+    "reminder": (
+        "⏰ <b>Напоминание о мероприятии!</b>\n\n"
+        "<b>{title}</b>\n"
+        "📅 {date} (через {hours} ч.)\n"
+        "📍 {location}\n\n"
+        "{link}"
+        "Не забудьте посетить мероприятие!"
+    ),
+    "event_created": (
+        "🔔 <b>Новое мероприятие от {creator}</b>\n\n"
+        "<b>{title}</b>\n"
+        "📅 {date}\n"
+        "📍 {location}\n\n"
+        "{link}"
+        "Пользователь, на которого вы подписаны, создал новое мероприятие. "
+        "Посетите сайт, чтобы узнать подробности и подтвердить участие."
+    ),
+    "event_updated": (
+        "🔄 <b>Обновление мероприятия от {creator}</b>\n\n"
+        "<b>{title}</b>\n"
+        "📅 {date}\n"
+        "📍 {location}\n\n"
+        "{link}"
+        "Пользователь, на которого вы подписаны, обновил информацию о мероприятии. "
+        "Посетите сайт, чтобы узнать актуальные подробности."
+    ),
+    "event_updates_digest": (
+        "🔄 <b>Обновления мероприятий{part}</b>\n\n"
+        "{events}"
+        "Пользователи, на которых вы подписаны, обновили информацию о мероприятиях. "
+        "Посетите сайт, чтобы узнать актуальные подробности."
+    ),
+    "digest_item": (
+        "<b>{title}</b>\n"
+        "📅 {date}\n"
+        "📍 {location}\n"
+        "👤 Организатор: {creator}\n\n"
+        "{link}"
+    ),
+}
+
+LINK_TEMPLATE = "Ссылка на мероприятие: {url}\n\n"
+
+# Templates of this deployment's variant, resolved once at import
+COMPILED_TEMPLATES = {
+    kind: body.replace("{link}", LINK_TEMPLATE if IS_LOCAL_DEV else "")
+    for kind, body in TEMPLATES.items()
+}
+
+class RenderedMessage:
+    """Message text with its keyboard in both aiogram and VPS API form, built once per broadcast."""
+
+    __slots__ = ("text", "parse_mode", "keyboard", "inline_keyboard")
+
+    def __init__(self, text: str, buttons: Optional[Sequence[Tuple[str, str]]] = None, parse_mode: Optional[str] = "HTML"):
+        self.text = text
+        self.parse_mode = parse_mode
+        self.keyboard: Optional[InlineKeyboardMarkup] = None
+        self.inline_keyboard: Optional[List[List[Dict[str, str]]]] = None
+        if buttons:
+            # One (text, url) button per row
+            self.keyboard = InlineKeyboardMarkup(inline_keyboard=[
+                [InlineKeyboardButton(text=label, url=url)] for label, url in buttons
+            ])
+            self.inline_keyboard = [[{"text": label, "url": url}] for label, url in buttons]
+
+    def payload(self, chat_id: Any) -> Dict[str, Any]:
+        """Get the VPS API payload for one chat."""
+        payload = {"chat_id": chat_id, "text": self.text}
+        if self.parse_mode:
+            payload["parse_mode"] = self.parse_mode
+        if self.inline_keyboard:
+            payload["inline_keyboard"] = self.inline_keyboard
+        return payload
+
+def render_event_message(kind: str, event, base_url: str, creator=None, hours_before: Optional[int] = None) -> RenderedMessage:
+    """Render a notification about an event from the template for kind."""
+    url = f"{base_url}/events/{event.id}"
+    text = COMPILED_TEMPLATES[kind].format(
+        title=event.title,
+        date=event.event_date.strftime(DATE_FORMAT),
+        location=event.location,
+        creator=creator.full_name if creator else "",
+        hours=hours_before,
+        url=url
+    )
+    return RenderedMessage(text, None if IS_LOCAL_DEV else [(BUTTON_TEXT, url)])
+
+def render_updates_digest(events: Sequence[Tuple[Any, Any]], base_url: str) -> List[RenderedMessage]:
+    """Render messages about several updated events, given as (event, creator) pairs.
+
+    Events are split over several numbered messages so that each stays within
+    DIGEST_MAX_EVENTS events and Telegram's text length limit.
+    """
+    template = COMPILED_TEMPLATES["event_updates_digest"]
+    # Room for the events next to the header and footer, with the longest part number
+    room = MESSAGE_MAX_LENGTH - len(template.format(events="", part=" (99/99)"))
+    
+    parts = [[]]
+    length = 0
+    for event, creator in events:
+        url = f"{base_url}/events/{event.id}"
+        item = COMPILED_TEMPLATES["digest_item"].format(
+            title=event.title,
+            date=event.event_date.strftime(DATE_FORMAT),
+            location=event.location,
+            creator=creator.full_name if creator else "",
+            url=url
+        )
+        if parts[-1] and (len(parts[-1]) >= DIGEST_MAX_EVENTS or length + len(item) > room):
+            parts.append([])
+            length = 0
+        parts[-1].append((item, (event.title, url)))
+        length += len(item)
+    
+    messages = []
+    for number, part in enumerate(parts, 1):
+        text = template.format(
+            events="".join(item for item, _ in part),
+            part=f" ({number}/{len(parts)})" if len(parts) > 1 else ""
+        )
+        messages.append(RenderedMessage(text, None if IS_LOCAL_DEV else [button for _, button in part]))
+    return messages
@@ -0,0 +1,62 @@
+import json
+import base64
+import binascii
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import desc, tuple_
+
+CursorKey = Tuple[datetime, int]
+
+def encode_cursor(created_at: datetime, item_id: int) -> str:
+    """Encode a (created_at, id) position as an opaque cursor."""
+    raw = json.dumps([created_at.isoformat(), item_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: Optional[str]) -> Optional[CursorKey]:
+    """Decode an opaque cursor. Empty cursor means the first page."""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, item_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(item_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Некорректный курсор"
+        )
+
+def paginate(
+    query,
+    model,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[CursorKey] = None,
+    rank: Any = None
+) -> List[Any]:
+    """Order by (created_at, id) newest first and apply keyset or offset pagination.
+    Offset pages are ordered by rank first when given; cursors only encode (created_at, id)."""
+    if cursor:
+        query = query.order_by(desc(model.created_at), desc(model.id))
+        query = query.filter(tuple_(model.created_at, model.id) < cursor)
+    else:
+        if rank is not None:
+            query = query.order_by(desc(rank))
+        query = query.order_by(desc(model.created_at), desc(model.id)).offset(skip)
+    return query.limit(limit).all()
+
+def get_next_cursor(items: List[Any], limit: int) -> Optional[str]:
+    """Get the cursor of the page after items, None on the last page."""
+    if not items or len(items) < limit:
+        return None
+    last = items[-1]
+    if isinstance(last, dict):
+        return encode_cursor(last["created_at"], last["id"])
+    return encode_cursor(last.created_at, last.id)
+
+def page_response(items: List[Any], limit: int, cursor: Optional[str]):
+    """Return a plain list for offset requests or an items/next_cursor page for cursor requests."""
+    if cursor is None:
+        return items
+    return {"items": items, "next_cursor": get_next_cursor(items, limit)}
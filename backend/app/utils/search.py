@@ -0,0 +1,28 @@
+import re
+from typing import Optional
+from sqlalchemy import func
+
+# Weighted document for events: title > location > description.
+# Russian config stems words, simple config keeps names and foreign words as is.
+EVENT_SEARCH_VECTOR = (
+    "setweight(to_tsvector('russian', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('russian', coalesce(location, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(location, '')), 'B') || "
+    "setweight(to_tsvector('russian', coalesce(description, '')), 'C')"
+)
+
+WORD_PATTERN = re.compile(r"\w+")
+
+def to_prefix_query(query: str) -> Optional[str]:
+    """Turn free text into a tsquery string matching every word by prefix."""
+    words = WORD_PATTERN.findall(query.lower())
+    if not words:
+        return None
+    return " & ".join(f"{word}:*" for word in words)
+
+def prefix_tsquery(prefix_query: str):
+    """Build a tsquery matching either the Russian stems or the raw words."""
+    return func.to_tsquery("russian", prefix_query).op("||")(
+        func.to_tsquery("simple", prefix_query)
+    )
@@ -0,0 +1,145 @@
+"""
+Background worker: Telegram bot, scheduled jobs and outbox delivery.
+
+Run with `python -m app.worker`. Any number of workers may run. All of them
+drain the notification outbox; the bot and the scheduler run only on the
+leader, elected through a PostgreSQL advisory lock.
+"""
+
+import os
+import signal
+import asyncio
+import logging
+from typing import Optional
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+from dotenv import load_dotenv
+
+from .config.database import async_engine
+from .controllers import (
+    start_bot, stop_bot, start_scheduler, stop_scheduler, start_http_client, stop_http_client,
+    start_outbox_dispatcher, stop_outbox_dispatcher
+)
+
+# Load environment variables
+load_dotenv()
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Advisory lock key held by the leader worker
+WORKER_LOCK_KEY = int(os.getenv("WORKER_LOCK_KEY", "7310001"))
+
+# How often a standby worker retries the lock and the leader checks it still holds it
+WORKER_LEADER_CHECK_SECONDS = float(os.getenv("WORKER_LEADER_CHECK_SECONDS", "10"))
+
+class LeaderLock:
+    """Session-level advisory lock on a dedicated connection.
+
+    PostgreSQL releases the lock when the connection dies, so a crashed
+    leader is replaced within one check interval.
+    """
+
+    def __init__(self, key: int = WORKER_LOCK_KEY):
+        self.key = key
+        self._connection: Optional[AsyncConnection] = None
+
+    async def try_acquire(self) -> bool:
+        """Try to take the lock without waiting."""
+        connection = await async_engine.connect()
+        try:
+            acquired = await connection.scalar(text("SELECT pg_try_advisory_lock(:key)"), {"key": self.key})
+            # Do not stay idle in transaction while holding the lock
+            await connection.commit()
+        except Exception:
+            await connection.close()
+            raise
+        if not acquired:
+            await connection.close()
+            return False
+        self._connection = connection
+        return True
+
+    async def is_held(self) -> bool:
+        """Check that the connection holding the lock is alive."""
+        if self._connection is None:
+            return False
+        try:
+            await self._connection.execute(text("SELECT 1"))
+            await self._connection.commit()
+            return True
+        except Exception as e:
+            logger.error(f"Leader lock connection lost: {e}")
+            return False
+
+    async def release(self):
+        """Release the lock and its connection."""
+        if self._connection is None:
+            return
+        try:
+            await self._connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": self.key})
+            await self._connection.commit()
+        except Exception as e:
+            logger.warning(f"Could not release leader lock: {e}")
+        finally:
+            # Invalidate so that a broken connection never returns to the pool
+            await self._connection.invalidate()
+            await self._connection.close()
+            self._connection = None
+
+async def _lead(lock: LeaderLock, stopping: asyncio.Event):
+    """Run the bot and the scheduler while holding the lock."""
+    logger.info("Became leader, starting bot and scheduler")
+    bot_task = asyncio.create_task(start_bot())
+    start_scheduler()
+    try:
+        while not stopping.is_set() and await lock.is_held():
+            try:
+                await asyncio.wait_for(stopping.wait(), WORKER_LEADER_CHECK_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        stop_scheduler()
+        await stop_bot()
+        bot_task.cancel()
+        await lock.release()
+        logger.info("Stepped down as leader")
+
+async def run_worker(stopping: asyncio.Event):
+    """Deliver outbox messages and campaign for leadership until stopping is set."""
+    await start_http_client()
+    start_outbox_dispatcher()
+    lock = LeaderLock()
+    try:
+        while not stopping.is_set():
+            try:
+                if await lock.try_acquire():
+                    await _lead(lock, stopping)
+                    continue
+            except Exception as e:
+                logger.error(f"Leader election error: {e}")
+            try:
+                await asyncio.wait_for(stopping.wait(), WORKER_LEADER_CHECK_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        await stop_outbox_dispatcher()
+        await stop_http_client()
+
+async def main():
+    """Run the worker until SIGINT or SIGTERM."""
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stopping.set)
+
+    logger.info("Worker started")
+    try:
+        await run_worker(stopping)
+    finally:
+        await async_engine.dispose()
+    logger.info("Worker stopped")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -25,6 +25,9 @@ fi
 # Дополнительная пауза для стабилизации соединения
 sleep 3
 
+echo "🔧 Применяем миграции..."
+alembic upgrade head
+
 echo "🔧 Запускаем инициализацию базы данных..."
 PYTHONPATH=/app python -m app.utils.init_db
 
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Benchmark hot queries with and without the hot-path indexes.
+Seeds a PostgreSQL database (optional) and prints EXPLAIN ANALYZE plans
+before (indexes dropped inside a rolled back transaction) and after.
+
+Usage: PYTHONPATH=. python misc/benchmark_indexes.py [--seed] [--users N] [--events N]
+"""
+
+import argparse
+import logging
+from sqlalchemy import text
+
+from app.config.database import engine, Base
+import app.models  # noqa: F401 - register models on Base.metadata
+
+# Configure logging
+logging.basicConfig(level=logging.INFO,
+                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Indexes added by migrations 3f2a9c1b7d4e and 8b1e4d2c6a90
+INDEXES = [
+    "ix_events_creator_id_created_at",
+    "ix_events_created_at_id",
+    "ix_events_event_date",
+    "ix_event_images_event_id",
+    "ix_event_participants_user_id",
+    "ix_invitations_user_id",
+    "ix_subscriptions_followed_id",
+    "ix_comments_event_id_created_at",
+    "ix_reviews_event_id_created_at",
+    "ix_users_telegram_chat_id",
+    "ix_events_search_vector",
+    "ix_users_username_trgm",
+    "ix_users_full_name_trgm",
+    "ix_users_phone_trgm",
+]
+CONSTRAINTS = [
+    ("event_participants", "uq_event_participants_event_user"),
+    ("invitations", "uq_invitations_event_user"),
+]
+
+# Hot queries from repositories, the Telegram controller and the scheduler
+QUERIES = {
+    "is_user_participant": (
+        "SELECT id FROM event_participants WHERE event_id = :event_id AND user_id = :user_id LIMIT 1"
+    ),
+    "is_user_invited": (
+        "SELECT id FROM invitations WHERE event_id = :event_id AND user_id = :user_id LIMIT 1"
+    ),
+    "user_feed": (
+        "SELECT * FROM events WHERE creator_id IN "
+        "(SELECT followed_id FROM subscriptions WHERE follower_id = :user_id) "
+        "ORDER BY created_at DESC, id DESC LIMIT 10"
+    ),
+    "followers": (
+        "SELECT * FROM subscriptions WHERE followed_id = :user_id "
+        "ORDER BY created_at DESC, id DESC LIMIT 100"
+    ),
+    "reminder_window": (
+        "SELECT * FROM events WHERE event_date > now() AND event_date <= now() + interval '1 hour'"
+    ),
+    "telegram_chat_lookup": (
+        "SELECT * FROM users WHERE telegram_chat_id = :chat_id LIMIT 1"
+    ),
+    "event_comments": (
+        "SELECT * FROM comments WHERE event_id = :event_id "
+        "ORDER BY created_at DESC, id DESC LIMIT 100"
+    ),
+    "event_search": (
+        "SELECT id FROM events WHERE search_vector @@ "
+        "(to_tsquery('russian', 'bench:* & 4242:*') || to_tsquery('simple', 'bench:* & 4242:*')) "
+        "ORDER BY ts_rank_cd(search_vector, to_tsquery('simple', 'bench:* & 4242:*')) DESC LIMIT 10"
+    ),
+    "user_search": (
+        "SELECT id FROM users WHERE username ILIKE '%ench_42%' OR phone ILIKE '%ench_42%' "
+        "OR full_name ILIKE '%ench_42%' LIMIT 10"
+    ),
+}
+
+def seed(connection, users: int, events: int):
+    """Fill the database with synthetic rows."""
+    logger.info(f"Seeding {users} users and {events} events")
+    connection.execute(text(
+        "INSERT INTO users (username, password, full_name, phone, is_active, telegram_chat_id, created_at, updated_at) "
+        "SELECT 'bench_' || g, 'x', 'Bench User ' || g, 'bench' || g, true, "
+        "CASE WHEN g % 3 = 0 THEN (100000 + g)::text END, now(), now() "
+        "FROM generate_series(1, :n) g"
+    ), {"n": users})
+    connection.execute(text(
+        "INSERT INTO subscriptions (follower_id, followed_id, created_at, updated_at) "
+        "SELECT DISTINCT u.id, (SELECT min(id) FROM users) + ((u.id * 7 + s) % :n), now(), now() "
+        "FROM users u, generate_series(1, 20) s "
+        "WHERE u.username LIKE 'bench_%' "
+        "ON CONFLICT DO NOTHING"
+    ), {"n": users})
+    connection.execute(text(
+        "INSERT INTO events (title, event_date, location, description, creator_id, created_at, updated_at) "
+        "SELECT 'Bench event ' || g, now() + (g % 720) * interval '1 hour', 'Location ' || g, 'Description', "
+        "(SELECT min(id) FROM users) + (g % :users), now() - g * interval '1 minute', now() "
+        "FROM generate_series(1, :n) g"
+    ), {"n": events, "users": users})
+    connection.execute(text(
+        "INSERT INTO event_participants (event_id, user_id, created_at, updated_at) "
+        "SELECT DISTINCT e.id, (SELECT min(id) FROM users) + ((e.id * 13 + s) % :users), now(), now() "
+        "FROM events e, generate_series(1, 10) s ON CONFLICT DO NOTHING"
+    ), {"users": users})
+    connection.execute(text(
+        "INSERT INTO invitations (event_id, user_id, created_at, updated_at) "
+        "SELECT DISTINCT e.id, (SELECT min(id) FROM users) + ((e.id * 17 + s) % :users), now(), now() "
+        "FROM events e, generate_series(1, 10) s ON CONFLICT DO NOTHING"
+    ), {"users": users})
+    connection.execute(text(
+        "INSERT INTO comments (text, user_id, event_id, created_at, updated_at) "
+        "SELECT 'Comment', (SELECT min(id) FROM users) + (e.id % :users), e.id, now(), now() "
+        "FROM events e, generate_series(1, 3) s"
+    ), {"users": users})
+    connection.execute(text("ANALYZE"))
+
+def sample_params(connection):
+    """Pick existing ids so that the plans hit real rows."""
+    row = connection.execute(text(
+        "SELECT event_id, user_id FROM event_participants ORDER BY id DESC LIMIT 1"
+    )).first()
+    chat_id = connection.execute(text(
+        "SELECT telegram_chat_id FROM users WHERE telegram_chat_id IS NOT NULL LIMIT 1"
+    )).scalar()
+    return {
+        "event_id": row.event_id if row else 1,
+        "user_id": row.user_id if row else 1,
+        "chat_id": chat_id or "0"
+    }
+
+def explain_all(connection, params):
+    """Print EXPLAIN ANALYZE for every hot query."""
+    for name, sql in QUERIES.items():
+        plan = connection.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {sql}"), params).scalars().all()
+        print(f"\n--- {name} ---")
+        print("\n".join(plan))
+
+def main():
+    parser = argparse.ArgumentParser(description="EXPLAIN hot queries before and after the hot-path indexes")
+    parser.add_argument("--seed", action="store_true", help="Insert synthetic data first")
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--events", type=int, default=100000)
+    args = parser.parse_args()
+
+    if engine.dialect.name != "postgresql":
+        logger.error("This benchmark needs PostgreSQL")
+        return
+
+    Base.metadata.create_all(bind=engine)
+
+    if args.seed:
+        with engine.begin() as connection:
+            seed(connection, args.users, args.events)
+
+    with engine.connect() as connection:
+        params = sample_params(connection)
+
+        # DDL is transactional in PostgreSQL: drop indexes, explain, roll back
+        print("\n========== BEFORE (no hot-path indexes) ==========")
+        with connection.begin() as transaction:
+            for table, name in CONSTRAINTS:
+                connection.execute(text(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {name}"))
+            for name in INDEXES:
+                connection.execute(text(f"DROP INDEX IF EXISTS {name}"))
+            explain_all(connection, params)
+            transaction.rollback()
+
+        print("\n========== AFTER (with hot-path indexes) ==========")
+        with connection.begin():
+            explain_all(connection, params)
+
+if __name__ == "__main__":
+    main()
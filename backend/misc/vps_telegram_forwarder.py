@@ -7,9 +7,12 @@ Run this on your VPS where Telegram connectivity works.
 
 import os
 import json
+import time
 import logging
 from quart import Quart, request, jsonify
 from aiogram import Bot
+from aiogram.exceptions import TelegramRetryAfter, TelegramAPIError
+from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 import asyncio
 from dotenv import load_dotenv
 
@@ -23,6 +26,16 @@ load_dotenv()
 BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 API_KEY = os.getenv("API_KEY", "your-secret-api-key")  # Use this to secure your API
 
+# Telegram allows about 30 messages per second per bot
+RATE_PER_SECOND = float(os.getenv("RATE_PER_SECOND", "30"))
+
+# Messages of one batch in flight at the same time
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "20"))
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", "500"))
+
+# Attempts after a 429 before a batch item is given up
+MAX_RETRIES = int(os.getenv("MAX_RETRIES", "3"))
+
 # Validate token
 if not BOT_TOKEN:
     logger.error("TELEGRAM_BOT_TOKEN not set in environment variables!")
@@ -33,6 +46,70 @@ app = Quart(__name__)
 # Initialize bot
 bot = Bot(token=BOT_TOKEN)
 
+class RateLimiter:
+    """Spaces out sends of the whole service to RATE_PER_SECOND."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self.next_slot = 0.0
+
+    async def acquire(self):
+        """Wait for the next free send slot and reserve it."""
+        now = time.monotonic()
+        slot = max(now, self.next_slot)
+        self.next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    def pause(self, seconds: float):
+        """Hold all sends after a 429."""
+        self.next_slot = max(self.next_slot, time.monotonic() + seconds)
+
+limiter = RateLimiter(RATE_PER_SECOND)
+
+def build_reply_markup(keyboard_data):
+    """Build an inline keyboard from [[{"text", "url"}, ...], ...]."""
+    if not keyboard_data:
+        return None
+    buttons = []
+    for row in keyboard_data:
+        button_row = []
+        for btn in row:
+            button_row.append(InlineKeyboardButton(
+                text=btn.get("text", "Button"),
+                url=btn.get("url", "")
+            ))
+        buttons.append(button_row)
+    return InlineKeyboardMarkup(inline_keyboard=buttons) if buttons else None
+
+async def deliver(item):
+    """Send one batch item, retrying after flood control. Returns its result."""
+    chat_id = item.get("chat_id")
+    if not chat_id or not item.get("text"):
+        return {"chat_id": chat_id, "status": "error", "message": "Missing chat_id or text"}
+    
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            await limiter.acquire()
+            message = await bot.send_message(
+                chat_id=chat_id,
+                text=item["text"],
+                parse_mode=item.get("parse_mode"),
+                reply_markup=build_reply_markup(item.get("inline_keyboard"))
+            )
+            return {"chat_id": chat_id, "status": "success", "message_id": message.message_id}
+        except TelegramRetryAfter as e:
+            logger.warning(f"Flood control, retry after {e.retry_after} s")
+            limiter.pause(e.retry_after)
+            if attempt == MAX_RETRIES:
+                return {"chat_id": chat_id, "status": "error", "message": str(e), "error": type(e).__name__}
+            await asyncio.sleep(e.retry_after)
+        except TelegramAPIError as e:
+            return {"chat_id": chat_id, "status": "error", "message": str(e), "error": type(e).__name__}
+        except Exception as e:
+            logger.error(f"Error sending message to {chat_id}: {e}")
+            return {"chat_id": chat_id, "status": "error", "message": str(e)}
+
 @app.route('/send_message', methods=['POST'])
 async def send_message():
     """API endpoint to send messages to Telegram"""
@@ -57,26 +134,11 @@ async def send_message():
     parse_mode = data.get("parse_mode")
     
     # Handle inline keyboard if provided
-    reply_markup = None
-    if "inline_keyboard" in data:
-        from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
-        keyboard_data = data.get("inline_keyboard", [])
-        buttons = []
-        
-        for row in keyboard_data:
-            button_row = []
-            for btn in row:
-                button_row.append(InlineKeyboardButton(
-                    text=btn.get("text", "Button"),
-                    url=btn.get("url", "")
-                ))
-            buttons.append(button_row)
-            
-        if buttons:
-            reply_markup = InlineKeyboardMarkup(inline_keyboard=buttons)
+    reply_markup = build_reply_markup(data.get("inline_keyboard"))
     
     # Send message
     try:
+        await limiter.acquire()
         message = await bot.send_message(
             chat_id=chat_id,
             text=text,
@@ -90,9 +152,48 @@ async def send_message():
             "message_id": message.message_id,
             "chat_id": message.chat.id
         })
+    except TelegramRetryAfter as e:
+        # Let the caller back off for as long as Telegram asks
+        logger.warning(f"Flood control, retry after {e.retry_after} s")
+        limiter.pause(e.retry_after)
+        return jsonify({"status": "error", "message": str(e), "retry_after": e.retry_after}), 429
     except Exception as e:
         logger.error(f"Error sending message: {e}")
-        return jsonify({"status": "error", "message": str(e)}), 500
+        return jsonify({"status": "error", "message": str(e), "error": type(e).__name__}), 500
+
+@app.route('/send_batch', methods=['POST'])
+async def send_batch():
+    """API endpoint to send many messages in one request.
+    
+    Accepts {"messages": [{chat_id, text, parse_mode, inline_keyboard}, ...]}
+    and returns one result per message in the same order.
+    """
+    # Check authorization
+    if request.headers.get('Authorization') != f"Bearer {API_KEY}":
+        return jsonify({"status": "error", "message": "Unauthorized"}), 401
+    
+    data = await request.get_json()
+    items = data.get("messages") if isinstance(data, dict) else None
+    
+    # Validate request data
+    if not isinstance(items, list) or not items:
+        return jsonify({"status": "error", "message": "No messages provided"}), 400
+    if len(items) > MAX_BATCH_SIZE:
+        return jsonify({"status": "error", "message": f"At most {MAX_BATCH_SIZE} messages per batch"}), 400
+    
+    # Send concurrently, the shared limiter keeps the bot under its rate limit
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+    
+    async def bounded(item):
+        async with semaphore:
+            return await deliver(item)
+    
+    started = time.monotonic()
+    results = await asyncio.gather(*(bounded(item) for item in items))
+    sent = sum(1 for result in results if result["status"] == "success")
+    logger.info(f"Batch: sent {sent}/{len(items)} messages in {time.monotonic() - started:.2f} s")
+    
+    return jsonify({"status": "success", "sent": sent, "results": results})
 
 # Simple health check endpoint
 @app.route('/health', methods=['GET'])
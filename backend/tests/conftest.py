@@ -0,0 +1,32 @@
+import os
+import pytest
+
+# Tests run against a scratch PostgreSQL database, never the development one
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+if TEST_DATABASE_URL:
+    # Must be set before app.config.database creates the engines
+    os.environ["DATABASE_URL"] = TEST_DATABASE_URL
+
+@pytest.fixture(scope="session")
+def engine():
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL not set")
+    from app.config.database import Base, engine
+    import app.models  # noqa: F401 - registers the tables
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+@pytest.fixture
+def db(engine):
+    """Session whose changes are rolled back after the test."""
+    from sqlalchemy.orm import Session
+    connection = engine.connect()
+    transaction = connection.begin()
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
+    try:
+        yield session
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
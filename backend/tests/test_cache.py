@@ -0,0 +1,56 @@
+from datetime import date, datetime, timezone
+
+import pytest
+from fakeredis import aioredis
+
+from app.utils import cache
+from app.utils.cache import Cache, RedisCacheBackend, MISSING, invalidate
+
+@pytest.fixture
+def redis_backend(monkeypatch):
+    """Redis backend over an in-memory fake server, used by every Cache."""
+    backend = RedisCacheBackend(client=aioredis.FakeRedis())
+    monkeypatch.setattr(cache, "backend", backend)
+    return backend
+
+@pytest.mark.asyncio
+async def test_values_round_trip_dates(redis_backend):
+    value = {
+        "created_at": datetime(2026, 10, 17, 12, 30, tzinfo=timezone.utc),
+        "event_date": datetime(2026, 11, 1, 19, 0),
+        "day": date(2026, 11, 1),
+        "images": [{"id": 1, "path": "a.jpg"}],
+    }
+    await redis_backend.set("value", value, ttl=60)
+
+    assert await redis_backend.get("value") == value
+    assert await redis_backend.get("absent") is MISSING
+
+@pytest.mark.asyncio
+async def test_invalidated_scope_changes_key(redis_backend):
+    detail = Cache("detail")
+    key = await detail.key(1, scopes=["event:1"])
+    await detail.set(key, {"title": "Old"})
+    assert await detail.get(key) == {"title": "Old"}
+
+    await invalidate("event:1")
+    new_key = await detail.key(1, scopes=["event:1"])
+
+    assert new_key != key
+    assert await detail.get(new_key) is MISSING
+    assert await detail.key(2, scopes=["event:2"]) == "detail:2:event:2@0"
+
+@pytest.mark.asyncio
+async def test_checked_value_misses_after_scope_change(redis_backend):
+    feed = Cache("feed")
+    key = await feed.key(7, scopes=["feed:7"])
+    versions = await feed.versions(["creator:1", "creator:2"])
+    await feed.set_checked(key, [{"id": 1, "created_at": datetime(2026, 10, 17)}], versions)
+    assert await feed.get_checked(key) == [{"id": 1, "created_at": datetime(2026, 10, 17)}]
+
+    await invalidate("creator:3")
+    assert await feed.get_checked(key) is not MISSING
+
+    await invalidate("creator:2")
+    assert await feed.get_checked(key) is MISSING
+    assert (feed.hits, feed.misses) == (2, 1)
@@ -0,0 +1,69 @@
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app.models import User, Event, EventImage
+from app.repositories import EventRepository
+
+EVENTS = 30
+IMAGES_PER_EVENT = 2
+
+@pytest.fixture
+def creator(db):
+    user = User(username="creator", password="x", full_name="Creator", phone="+70000000000")
+    db.add(user)
+    db.flush()
+    for number in range(EVENTS):
+        event_row = Event(
+            title=f"Event {number}",
+            location="Somewhere",
+            event_date=datetime.now() + timedelta(days=number + 1),
+            creator_id=user.id
+        )
+        event_row.images = [EventImage(image_path=f"/static/{number}_{i}.jpg") for i in range(IMAGES_PER_EVENT)]
+        db.add(event_row)
+    db.flush()
+    return user
+
+@contextmanager
+def count_statements(db):
+    """Count statements sent to the database inside the block."""
+    statements = []
+    
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    # Objects from earlier calls must be loaded again
+    db.expire_all()
+    connection = db.connection()
+    event.listen(connection, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(connection, "before_cursor_execute", before_cursor_execute)
+
+def listing_queries(db, listing, limit):
+    with count_statements(db) as statements:
+        events = listing(limit)
+        assert len(events) == limit
+        # Serializing reads the images of every event
+        for item in events:
+            images = item["images"] if isinstance(item, dict) else [image.image_path for image in item.images]
+            assert len(images) == IMAGES_PER_EVENT
+    return len(statements)
+
+@pytest.mark.parametrize("name", ["get_all", "get_events_by_creator", "get_upcoming_events_by_creator"])
+def test_listing_query_count_does_not_depend_on_page_size(db, creator, name):
+    creator_id = creator.id
+    listings = {
+        "get_all": lambda limit: EventRepository.get_all(db, limit=limit),
+        "get_events_by_creator": lambda limit: EventRepository.get_events_by_creator(db, creator_id, limit=limit),
+        "get_upcoming_events_by_creator": lambda limit: EventRepository.get_upcoming_events_by_creator(db, creator_id, limit=limit),
+    }
+    small = listing_queries(db, listings[name], 5)
+    large = listing_queries(db, listings[name], 25)
+    
+    # One query for the page and one for the images of all its events
+    assert small == large == 2
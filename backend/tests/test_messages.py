@@ -0,0 +1,39 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+from app.utils.messages import render_updates_digest, MESSAGE_MAX_LENGTH, DIGEST_MAX_EVENTS
+
+def updated_events(count, title_length=120, location_length=150):
+    creator = SimpleNamespace(full_name="Организатор мероприятий")
+    return [
+        (
+            SimpleNamespace(
+                id=number,
+                title=f"{number} " + "Т" * title_length,
+                location="М" * location_length,
+                event_date=datetime(2026, 11, 1, 19, 0)
+            ),
+            creator
+        )
+        for number in range(1, count + 1)
+    ]
+
+def test_short_digest_is_one_message():
+    messages = render_updates_digest(updated_events(3), "https://example.org")
+
+    assert len(messages) == 1
+    assert "(1/" not in messages[0].text
+    assert len(messages[0].inline_keyboard) == 3
+
+def test_long_digest_is_split_within_telegram_limits():
+    events = updated_events(40, title_length=400, location_length=400)
+    messages = render_updates_digest(events, "https://example.org")
+
+    assert len(messages) > 1
+    for number, message in enumerate(messages, 1):
+        assert len(message.text) <= MESSAGE_MAX_LENGTH
+        assert len(message.inline_keyboard) <= DIGEST_MAX_EVENTS
+        assert f"({number}/{len(messages)})" in message.text
+    # Every event is sent once, in order
+    urls = [row[0]["url"] for message in messages for row in message.inline_keyboard]
+    assert urls == [f"https://example.org/events/{number}" for number in range(1, 41)]
@@ -0,0 +1,52 @@
+import pytest
+from sqlalchemy import event
+
+from app.models import User
+from app.repositories import SubscriptionRepository
+
+@pytest.fixture
+def users(db):
+    first = User(username="first", password="x", full_name="First", phone="+70000000001")
+    second = User(username="second", password="x", full_name="Second", phone="+70000000002")
+    db.add_all([first, second])
+    db.flush()
+    return first.id, second.id
+
+def updated_user_ids(db, action):
+    """Run action and return the user ids of UPDATE users statements in order."""
+    user_ids = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("UPDATE users"):
+            user_ids.append(parameters["id_1"])
+
+    connection = db.connection()
+    event.listen(connection, "before_cursor_execute", before_cursor_execute)
+    try:
+        action()
+    finally:
+        event.remove(connection, "before_cursor_execute", before_cursor_execute)
+    return user_ids
+
+@pytest.mark.parametrize("reverse", [False, True])
+def test_counters_lock_users_in_id_order(db, users, reverse):
+    """Mutual follows must update user rows in the same order, or they can deadlock."""
+    follower_id, followed_id = reversed(users) if reverse else users
+
+    follow = updated_user_ids(db, lambda: SubscriptionRepository.follow_user(db, follower_id, followed_id))
+    unfollow = updated_user_ids(db, lambda: SubscriptionRepository.unfollow_user(db, follower_id, followed_id))
+
+    assert follow == sorted(users)
+    assert unfollow == sorted(users)
+
+def test_mutual_follow_counters(db, users):
+    first_id, second_id = users
+    SubscriptionRepository.follow_user(db, first_id, second_id)
+    SubscriptionRepository.follow_user(db, second_id, first_id)
+    SubscriptionRepository.unfollow_user(db, first_id, second_id)
+
+    first, second = db.get(User, first_id), db.get(User, second_id)
+    db.refresh(first)
+    db.refresh(second)
+    assert (first.followers_count, first.following_count) == (1, 0)
+    assert (second.followers_count, second.following_count) == (0, 1)